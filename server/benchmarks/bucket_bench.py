@@ -0,0 +1,122 @@
+"""
+Length bucketing benchmark for the DiT estimator.
+
+Runs CFM inference over a seeded spread of sequence lengths, once at each
+input's own length and once padded to length buckets, and reports the
+per-step (estimator call) latency, padding overhead and how many distinct
+shapes the estimator saw. ``--compile`` wraps the estimator in
+``torch.compile`` with static shapes, where every new length means a
+recompilation; that is where buckets matter most.
+
+Latency doesn't depend on the weights, so the estimator is built from the
+VC config with random weights; no checkpoint is needed.
+
+Run from the server directory:
+    python -m benchmarks.bucket_bench --device cpu --lengths 64 200
+"""
+
+import argparse
+import os
+import random
+import sys
+
+import torch
+import yaml
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "vc"))
+
+from benchmarks.harness import Timer, environment, make_report, print_metrics, summarize, write_report
+from modules.commons import build_model, recursive_munch
+from modules.flow_matching import bucket_length, make_length_buckets
+
+
+def build_cfm(config_path, device):
+    config = yaml.safe_load(open(config_path, "r"))
+    model_params = recursive_munch(config["model_params"])
+    model_params.dit_type = "DiT"
+    torch.manual_seed(0)
+    cfm = build_model(model_params, stage="DiT").cfm.eval().to(device)
+    cfm.estimator.setup_caches(max_batch_size=1, max_seq_length=8192)
+    sr = config["preprocess_params"]["sr"]
+    hop_length = config["preprocess_params"]["spect_params"]["hop_length"]
+    return cfm, model_params, sr // hop_length * 30
+
+
+def run(cfm, model_params, lengths, args, sync):
+    """Per-step latencies (ms) and the first call's latency for every new shape."""
+    n_mels = model_params.DiT.in_channels
+    content_dim = model_params.DiT.content_dim
+    style_dim = model_params.style_encoder.dim
+    device = next(cfm.parameters()).device
+    prompt = torch.randn(1, n_mels, args.prompt_frames, device=device)
+    style = torch.randn(1, style_dim, device=device)
+
+    steps, cold = [], []
+    seen = set()
+    for length in lengths:
+        total = args.prompt_frames + length
+        mu = torch.randn(1, total, content_dim, device=device)
+        x_lens = torch.LongTensor([total]).to(device)
+        shape = bucket_length(total, cfm.length_buckets) if cfm.length_buckets else total
+        with Timer(sync) as timer:
+            cfm.inference(mu, x_lens, prompt, style, None, args.steps, inference_cfg_rate=args.cfg_rate)
+        if shape in seen:
+            steps.append(timer.ms / args.steps)
+        else:
+            seen.add(shape)
+            cold.append(timer.ms)
+    return steps, cold, len(seen)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="vc/checkpoints/config_dit_mel_seed_uvit_whisper_small_wavenet.yml")
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--lengths", type=int, nargs=2, default=[64, 1200], metavar=("MIN", "MAX"),
+                        help="Range of source lengths in mel frames")
+    parser.add_argument("--samples", type=int, default=60, help="Number of lengths drawn from the range")
+    parser.add_argument("--prompt-frames", type=int, default=250, help="Reference prompt length in mel frames")
+    parser.add_argument("--steps", type=int, default=5, help="Diffusion steps per inference")
+    parser.add_argument("--cfg-rate", type=float, default=0.7)
+    parser.add_argument("--compile", action="store_true", help="Run the estimator through torch.compile")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the report here")
+    args = parser.parse_args()
+
+    device = torch.device(args.device)
+    sync = torch.cuda.synchronize if device.type == "cuda" else None
+    cfm, model_params, max_context = build_cfm(args.config, device)
+    if args.compile:
+        cfm.estimator = torch.compile(cfm.estimator, dynamic=False)
+
+    rng = random.Random(args.seed)
+    max_source = max_context - args.prompt_frames
+    lengths = [rng.randint(args.lengths[0], min(args.lengths[1], max_source)) for _ in range(args.samples)]
+    # Every length twice, so each shape has warm calls as well as its first one
+    lengths = lengths + rng.sample(lengths, len(lengths))
+    buckets = make_length_buckets(max_context)
+
+    metrics = {}
+    for mode, length_buckets in (("exact", None), ("bucketed", buckets)):
+        cfm.length_buckets = length_buckets
+        if device.type == "cuda":
+            torch.cuda.reset_peak_memory_stats()
+        steps, cold, shapes = run(cfm, model_params, lengths, args, sync)
+        metrics.update(summarize(steps, f"dit/{mode}/step", "_ms"))
+        metrics.update(summarize(cold, f"dit/{mode}/first_call", "_ms"))
+        metrics[f"dit/{mode}/shapes"] = shapes
+        if device.type == "cuda":
+            metrics[f"dit/{mode}/peak_allocated_mb"] = round(torch.cuda.max_memory_allocated() / 2 ** 20, 1)
+    totals = [args.prompt_frames + length for length in lengths]
+    padding = sum(bucket_length(total, buckets) - total for total in totals) / sum(totals)
+    metrics["dit/bucketed/padding_overhead"] = round(padding, 4)
+
+    print(f"{len(buckets)} buckets up to {max_context} frames: {list(buckets)}")
+    print_metrics(metrics)
+    if args.json:
+        config = {key: value for key, value in vars(args).items() if key != "json"}
+        write_report(make_report("bucket", environment(args.device), config, metrics), args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+"""
+Sinhala benchmark texts shared by performance.py and the benchmarks package.
+
+They are the server's warmup texts, so the benchmarks measure the inputs the
+workers are warmed up with.
+"""
+
+from warmup import WARMUP_TEXTS as TEST_TEXTS  # noqa: F401
@@ -0,0 +1,56 @@
+"""
+Text frontend throughput benchmark.
+
+Compares the fused TextFrontend against running short_convert, num_convert
+and convert_text as three separate whole-string passes over the TEST_TEXTS
+corpus.
+
+Run from the server directory:
+    python -m benchmarks.frontend_bench [--repeats 2000]
+"""
+
+import argparse
+import time
+
+from benchmarks.corpus import TEST_TEXTS
+from g2p import convert_text
+from num2sinhala import num_convert
+from short2sinhala import short_convert
+from text_frontend import TextFrontend
+
+
+def separate_stages(text):
+    return convert_text(num_convert(short_convert(text)))
+
+
+def measure(fn, texts, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text in texts:
+            fn(text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    frontend = TextFrontend()
+    texts = [text for category in TEST_TEXTS.values() for text in category]
+    chars = sum(len(text) for text in texts) * args.repeats
+
+    for text in texts:
+        assert frontend.process(text).phonemes == separate_stages(text)
+
+    print(f"{len(texts)} texts x {args.repeats} repeats")
+    print(f"{'pipeline':<20}{'texts/sec':>12}{'MB/sec':>10}{'speedup':>10}")
+    separate_time = measure(separate_stages, texts, args.repeats)
+    fused_time = measure(lambda text: frontend.process(text, with_ids=False), texts, args.repeats)
+    for label, elapsed in (("separate", separate_time), ("fused", fused_time)):
+        print(f"{label:<20}{len(texts) * args.repeats / elapsed:>12,.0f}"
+              f"{chars / elapsed / 1e6:>10.2f}{separate_time / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+G2P throughput benchmark.
+
+Reports words/sec for the reference convert_text, the compiled engine with
+an empty word cache, and the compiled engine with a warm cache, and checks
+that all three produce the same phonemes.
+
+Run from the server directory:
+    python -m benchmarks.g2p_bench [--corpus big.txt] [--words 200000]
+"""
+
+import argparse
+import random
+import time
+
+import g2p
+
+SAMPLE_TEXT = """මෛත‍්‍රී පාලනයක් හදන්න ඇවිල්ලා අද මේ අය ගෙන යන්නේ තුච්ඡ, නින්දිත පාලනයක්
+කාටවත් ලෙඩේ නම් හොඳ කරන්න බැරි වුණා. මං වතුපිටිවල ඉස්පිරිත‍ාලෙ ළඟ ආයතනයක වැඩ කරනවා පරිගණක නිලධාරිනියක් හැටියට.
+අප දැක්කා නේ ජාතික වශයෙන් ව‍ූ මේ විපතේදී ඒකාබද්ධ විපක්ෂය බොරදියේ මාළු බාපු ආකාරය.
+මම කම්පියුටර් භාවිතා කරනවා. අම්මා ගියා, තත්ත්‍රි ගුරුත්‍රාණය කියලා කියනවා. රත්මලානේ යුර්සිටි තුළ කාර්යය තියනවා.
+"ශ්‍රී ලංකා" කියන රටේ නාමය ලොව පුරා ප්‍රසිද්ධයි. අපේ ක්‍යාලේජ් ළමයි නින්දිත රැකියාවක් ගැන කතා කළා.
+කුමරු කාර්යං කරලා ගියේ නාගරික මණ්ඩපය. ශ්‍රී ලංකාව දකුණු ආසියාවේ පිහිටි සුන්දර දූපත් රටකි.
+කොළඹ වාණිජ අගනුවර වන අතර ශ්‍රී ජයවර්ධනපුර කෝට්ටේ නිල අගනුවරයි. රටේ ප්‍රධාන භාෂා වන්නේ සිංහල සහ දෙමළ ය.
+පරිගණකය සහ ඉන්ටර්නෙට් තාක්ෂණය දියුණු වීමත් සමඟ අපේ ජීවිතය බොහෝ සෙයින් පහසු වී තිබේ.
+ගම්බද ප්‍රදේශවල ජනතාවගේ ජීවන තත්ත්වය ඉහළ නැංවීම සඳහා රජය විවිධ වැඩසටහන් ක්‍රියාත්මක කරනවා."""
+
+
+def build_corpus(words, n_words, seed=0):
+    """Draw a Zipf-distributed corpus, like real Sinhala word frequencies."""
+    rng = random.Random(seed)
+    vocabulary = sorted(set(words))
+    rng.shuffle(vocabulary)
+    weights = [1.0 / rank for rank in range(1, len(vocabulary) + 1)]
+    lines = []
+    for start in range(0, n_words, 12):
+        lines.append(" ".join(rng.choices(vocabulary, weights, k=min(12, n_words - start))))
+    return lines
+
+
+def measure(fn, lines):
+    start = time.perf_counter()
+    outputs = [fn(line) for line in lines]
+    return outputs, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="UTF-8 text file; defaults to a Zipf sample of built-in sentences")
+    parser.add_argument("--words", type=int, default=200000, help="Words to sample when no corpus is given")
+    args = parser.parse_args()
+
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            lines = [line for line in f.read().splitlines() if line.strip()]
+    else:
+        lines = build_corpus(SAMPLE_TEXT.split(), args.words)
+    n_words = sum(len(line.split()) for line in lines)
+    print(f"Corpus: {len(lines)} lines, {n_words} words, {len(set(' '.join(lines).split()))} distinct")
+
+    reference, reference_time = measure(g2p.convert_text_reference, lines)
+    g2p.word_to_ipa.cache_clear()
+    cold, cold_time = measure(g2p.convert_text, lines)
+    warm, warm_time = measure(g2p.convert_text, lines)
+
+    # Compiled engine without the memo, to separate the two effects
+    uncached = lambda line: "".join(
+        tok if tok.isspace() else g2p.word_to_ipa.__wrapped__(tok)
+        for tok in g2p.TOKEN_PATTERN.findall(g2p.normalize_text(line))
+    )
+    compiled, compiled_time = measure(uncached, lines)
+
+    assert reference == cold == warm == compiled, "compiled G2P output differs from the reference"
+
+    print(f"{'implementation':<28}{'words/sec':>14}{'speedup':>10}")
+    for name, elapsed in [
+        ("reference", reference_time),
+        ("compiled, no memo", compiled_time),
+        ("compiled + memo (cold)", cold_time),
+        ("compiled + memo (warm)", warm_time),
+    ]:
+        print(f"{name:<28}{n_words / elapsed:>14,.0f}{reference_time / elapsed:>9.1f}x")
+    print(f"word cache: {g2p.word_to_ipa.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Measurement helpers shared by the performance.py suites.
+
+Everything here is plain Python so latency statistics, concurrency runs and
+baseline comparison can be used (and tested) without loading any model.
+"""
+
+import datetime
+import json
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(values, q):
+    """Return the ``q``-th percentile of ``values`` with linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(values, prefix, unit=""):
+    """
+    Flatten a list of samples into p50/p90/p99/mean metrics.
+
+    Example:
+        summarize([0.1, 0.2], "acoustic/short/latency", "_ms")
+        -> {"acoustic/short/latency_p50_ms": ..., ...}
+    """
+    metrics = {f"{prefix}_p{q}{unit}": round(percentile(values, q), 4) for q in PERCENTILES}
+    metrics[f"{prefix}_mean{unit}"] = round(sum(values) / len(values), 4) if values else 0.0
+    return metrics
+
+
+class Timer:
+    """
+    Context manager measuring wall time in milliseconds.
+
+    Pass ``sync`` (e.g. ``torch.cuda.synchronize``) so queued GPU work is
+    included in the measurement.
+    """
+
+    def __init__(self, sync=None):
+        self.sync = sync
+        self.ms = 0.0
+
+    def __enter__(self):
+        if self.sync:
+            self.sync()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.sync:
+            self.sync()
+        self.ms = (time.perf_counter() - self._start) * 1000
+
+
+def run_concurrent(fn, items, concurrency, repeats=1):
+    """
+    Call ``fn(item)`` from ``concurrency`` client threads.
+
+    Every item is sent ``repeats`` times. Exceptions are not swallowed: the
+    first one is re-raised after all clients finish.
+
+    Returns:
+        dict: ``latencies_ms`` (per call), ``wall_s`` and ``throughput_per_sec``
+    """
+    work = [item for _ in range(repeats) for item in items]
+    latencies = []
+    lock = threading.Lock()
+
+    def call(item):
+        start = time.perf_counter()
+        result = fn(item)
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+        return result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = [executor.submit(call, item) for item in work]
+        for future in futures:
+            future.result()
+    wall = time.perf_counter() - start
+    return {
+        "latencies_ms": latencies,
+        "wall_s": wall,
+        "throughput_per_sec": len(work) / wall if wall > 0 else 0.0,
+    }
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def environment(device, **extra):
+    """Describe the machine a report was produced on."""
+    info = {
+        "device": device,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        import torch
+        info["torch"] = torch.__version__
+        info["torch_threads"] = torch.get_num_threads()
+    except ImportError:
+        pass
+    info.update(extra)
+    return info
+
+
+def make_report(suite, env, config, metrics):
+    return {
+        "suite": suite,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "environment": env,
+        "config": config,
+        "metrics": metrics,
+    }
+
+
+def write_report(report, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def higher_is_better(name):
+    return name.endswith("_per_sec")
+
+
+def compare_reports(baseline, current, tolerance=0.10, ignore=()):
+    """
+    Compare the metrics of two reports.
+
+    A metric regresses when it moves the wrong way by more than
+    ``tolerance`` (relative). Throughput metrics (``*_per_sec``) should go up,
+    everything else (latency, RTF, memory) should go down. Metrics whose name
+    contains one of ``ignore`` are skipped.
+
+    Returns:
+        list: one dict per metric present in both reports with ``name``,
+        ``baseline``, ``current``, ``change`` (relative) and ``regressed``
+    """
+    rows = []
+    for name, base in sorted(baseline["metrics"].items()):
+        if name not in current["metrics"] or any(pattern in name for pattern in ignore):
+            continue
+        value = current["metrics"][name]
+        change = (value - base) / base if base else 0.0
+        worse = -change if higher_is_better(name) else change
+        rows.append({
+            "name": name,
+            "baseline": base,
+            "current": value,
+            "change": round(change, 4),
+            "regressed": worse > tolerance,
+        })
+    return rows
+
+
+def print_metrics(metrics):
+    width = max((len(name) for name in metrics), default=0) + 2
+    for name, value in metrics.items():
+        print(f"{name:<{width}}{value:>14,.3f}")
+
+
+def print_comparison(rows):
+    width = max((len(row["name"]) for row in rows), default=0) + 2
+    print(f"{'metric':<{width}}{'baseline':>14}{'current':>14}{'change':>10}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(f"{row['name']:<{width}}{row['baseline']:>14,.3f}{row['current']:>14,.3f}"
+              f"{row['change'] * 100:>9.1f}%{flag}")
@@ -0,0 +1,64 @@
+"""
+Model loading for benchmarks.
+
+When the trained checkpoints are not on disk (CI, fresh clones) the models
+are built from their configs with random weights. Timing then reflects the
+real architecture, but Tacotron2 never predicts a stop token, so its decoder
+is capped at ``max_decoder_steps``.
+"""
+
+import os
+import tempfile
+
+import torch
+from TTS.config import load_config
+from TTS.tts.models import setup_model as setup_tts_model
+from TTS.utils.synthesizer import Synthesizer
+from TTS.vocoder.models import setup_model as setup_vocoder_model
+
+RANDOM_INIT_DECODER_STEPS = 400
+
+
+def write_random_checkpoint(config_path, setup_fn, checkpoint_path, seed=0):
+    """Save a randomly initialized model built from ``config_path``."""
+    torch.manual_seed(seed)
+    model = setup_fn(load_config(config_path))
+    torch.save({"model": model.state_dict()}, checkpoint_path)
+    return checkpoint_path
+
+
+def load_synthesizer(tts_checkpoint, tts_config, vocoder_checkpoint, vocoder_config,
+                     use_cuda=False, max_decoder_steps=None, seed=0):
+    """
+    Load the Coqui synthesizer, falling back to random weights per missing checkpoint.
+
+    Returns:
+        tuple: (synthesizer, random_init) where ``random_init`` lists the models
+        that were randomly initialized
+    """
+    random_init = []
+    scratch = None
+    if not os.path.exists(tts_checkpoint) or not os.path.exists(vocoder_checkpoint):
+        scratch = tempfile.mkdtemp(prefix="tts-bench-")
+    if not os.path.exists(tts_checkpoint):
+        tts_checkpoint = write_random_checkpoint(
+            tts_config, setup_tts_model, os.path.join(scratch, "tts.pth"), seed)
+        random_init.append("tts")
+    if not os.path.exists(vocoder_checkpoint):
+        vocoder_checkpoint = write_random_checkpoint(
+            vocoder_config, setup_vocoder_model, os.path.join(scratch, "vocoder.pth"), seed)
+        random_init.append("vocoder")
+
+    synthesizer = Synthesizer(
+        tts_checkpoint=tts_checkpoint,
+        tts_config_path=tts_config,
+        vocoder_checkpoint=vocoder_checkpoint,
+        vocoder_config=vocoder_config,
+        use_cuda=use_cuda
+    )
+
+    if max_decoder_steps is None and "tts" in random_init:
+        max_decoder_steps = RANDOM_INIT_DECODER_STEPS
+    if max_decoder_steps:
+        synthesizer.tts_model.decoder.max_decoder_steps = max_decoder_steps
+    return synthesizer, random_init
@@ -0,0 +1,84 @@
+"""
+Text normalization throughput benchmark.
+
+Compares num_convert / short_convert against the previous implementations,
+which built a new converter (and recompiled their patterns) on every call,
+over the TEST_TEXTS corpus.
+
+Run from the server directory:
+    python -m benchmarks.normalize_bench [--repeats 2000]
+"""
+
+import argparse
+import re
+import time
+
+from benchmarks.corpus import TEST_TEXTS
+from num2sinhala import SinhalaNumberConverter, num_convert
+from short2sinhala import TIME_PATTERN, SinhalaAbbreviationConverter, short_convert
+
+
+def legacy_num_convert(text):
+    """num_convert as it was: a fresh converter and a char-by-char scan per call."""
+    converter = SinhalaNumberConverter()
+    result = []
+    current_number = ''
+    for char in text:
+        if char.isdigit():
+            current_number += char
+        else:
+            if current_number:
+                result.append(converter.convert(int(current_number)))
+                current_number = ''
+            result.append(char)
+    if current_number:
+        result.append(converter.convert(int(current_number)))
+    return ''.join(result)
+
+
+def legacy_short_convert(text):
+    """short_convert as it was: a fresh converter, re-sorted and recompiled per call."""
+    converter = SinhalaAbbreviationConverter()
+    result = re.sub(TIME_PATTERN, converter.replace_time, text)
+    for abbrev, full_form in sorted(converter.abbreviations.items(), key=lambda x: len(x[0]), reverse=True):
+        result = re.sub(re.escape(abbrev), full_form, result)
+    return result
+
+
+def measure(fn, texts, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text in texts:
+            fn(text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    texts = [text for category in TEST_TEXTS.values() for text in category]
+    chars = sum(len(text) for text in texts) * args.repeats
+
+    for text in texts:
+        assert num_convert(text) == legacy_num_convert(text)
+        assert short_convert(text) == legacy_short_convert(text)
+
+    print(f"{len(texts)} texts x {args.repeats} repeats")
+    print(f"{'function':<28}{'texts/sec':>12}{'MB/sec':>10}{'speedup':>10}")
+    pairs = [
+        ("num_convert", legacy_num_convert, num_convert),
+        ("short_convert", legacy_short_convert, short_convert),
+        ("short + num", lambda t: legacy_num_convert(legacy_short_convert(t)), lambda t: num_convert(short_convert(t))),
+    ]
+    for name, legacy, current in pairs:
+        legacy_time = measure(legacy, texts, args.repeats)
+        current_time = measure(current, texts, args.repeats)
+        for label, elapsed in (("legacy", legacy_time), ("current", current_time)):
+            print(f"{name + ' (' + label + ')':<28}{len(texts) * args.repeats / elapsed:>12,.0f}"
+                  f"{chars / elapsed / 1e6:>10.2f}{legacy_time / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
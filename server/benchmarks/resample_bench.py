@@ -0,0 +1,82 @@
+"""
+Resampling micro-benchmark.
+
+Compares the per-call torchaudio.functional.resample / librosa.load path the
+voice converter used to take against the cached kernels in vc/resample.py.
+
+Run from the server directory:
+    python -m benchmarks.resample_bench [--device cuda] [--seconds 5]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import librosa
+import numpy as np
+import soundfile as sf
+import torch
+import torchaudio
+
+from vc.resample import load_audio, resample
+
+RATE_PAIRS = [(22050, 16000), (24000, 22050), (44100, 22050), (48000, 16000)]
+
+
+def time_call(fn, repeats):
+    fn()  # warm-up
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        if torch.cuda.is_available():
+            torch.cuda.synchronize()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def bench_tensor_resample(device, seconds, repeats):
+    print(f"\nTensor resampling ({seconds}s of audio, device={device}, median of {repeats})")
+    print(f"{'rate pair':<16}{'functional':>14}{'cached':>14}{'speedup':>10}{'max diff':>12}")
+    for orig_sr, new_sr in RATE_PAIRS:
+        wave = torch.randn(1, orig_sr * seconds, device=device)
+        functional = time_call(lambda: torchaudio.functional.resample(wave, orig_sr, new_sr), repeats)
+        cached = time_call(lambda: resample(wave, orig_sr, new_sr), repeats)
+        diff = (torchaudio.functional.resample(wave, orig_sr, new_sr) - resample(wave, orig_sr, new_sr)).abs().max().item()
+        # Audio-seconds processed per wall-second
+        print(f"{orig_sr}->{new_sr:<9}{seconds / functional:>12.0f}x{seconds / cached:>13.0f}x"
+              f"{functional / cached:>9.2f}x{diff:>12.2e}")
+
+
+def bench_file_load(seconds, repeats):
+    print(f"\nFile load + resample to 22050 Hz ({seconds}s WAV, median of {repeats})")
+    print(f"{'file rate':<16}{'librosa.load':>14}{'load_audio':>14}{'speedup':>10}")
+    for orig_sr in (16000, 24000, 44100, 48000):
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+            path = f.name
+        try:
+            sf.write(path, np.random.uniform(-0.5, 0.5, orig_sr * seconds).astype(np.float32), orig_sr)
+            legacy = time_call(lambda: librosa.load(path, sr=22050), repeats)
+            cached = time_call(lambda: load_audio(path, 22050), repeats)
+            print(f"{orig_sr:<16}{legacy * 1000:>12.1f}ms{cached * 1000:>12.1f}ms{legacy / cached:>9.2f}x")
+        finally:
+            os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--seconds", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    bench_tensor_resample(args.device, args.seconds, args.repeats)
+    bench_file_load(args.seconds, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Per-step overhead of the DiT estimator with and without an estimator session.
+
+A session (``DiT.session``) computes the condition-only work of a solve
+once: the CFG-stacked inputs, the content projection, the prompt/style half
+of the input merge and the masks. The gain is largest for short utterances,
+where that work is a bigger share of each step. Both paths run on the same
+seeded inputs and their outputs are compared.
+
+Latency doesn't depend on the weights, so the estimator is built from the
+VC config with random weights; no checkpoint is needed.
+
+Run from the server directory:
+    python -m benchmarks.session_bench --device cpu --lengths 50 100 200 400
+"""
+
+import argparse
+
+import torch
+
+from benchmarks.bucket_bench import build_cfm
+from benchmarks.harness import Timer, environment, make_report, print_metrics, summarize, write_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="vc/checkpoints/config_dit_mel_seed_uvit_whisper_small_wavenet.yml")
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[50, 100, 200, 400],
+                        help="Source lengths in mel frames")
+    parser.add_argument("--prompt-frames", type=int, default=150, help="Reference prompt length in mel frames")
+    parser.add_argument("--steps", type=int, default=10, help="Diffusion steps per inference")
+    parser.add_argument("--cfg-rate", type=float, default=0.7)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the report here")
+    args = parser.parse_args()
+
+    device = torch.device(args.device)
+    sync = torch.cuda.synchronize if device.type == "cuda" else None
+    cfm, model_params, _ = build_cfm(args.config, device)
+    n_mels = model_params.DiT.in_channels
+
+    metrics = {}
+    for length in args.lengths:
+        generator = torch.Generator().manual_seed(args.seed)
+        total = args.prompt_frames + length
+        mu = torch.randn(1, total, model_params.DiT.content_dim, generator=generator).to(device)
+        prompt = torch.randn(1, n_mels, args.prompt_frames, generator=generator).to(device)
+        style = torch.randn(1, model_params.style_encoder.dim, generator=generator).to(device)
+        x_lens = torch.LongTensor([total]).to(device)
+
+        outputs = {}
+        for mode, use_session in (("per_call", False), ("session", True)):
+            cfm.use_estimator_session = use_session
+            samples = []
+            for repeat in range(args.repeats + 1):
+                torch.manual_seed(args.seed)
+                with Timer(sync) as timer:
+                    outputs[mode] = cfm.inference(mu, x_lens, prompt, style, None, args.steps,
+                                                  inference_cfg_rate=args.cfg_rate)
+                if repeat:  # the first run warms up
+                    samples.append(timer.ms / args.steps)
+            metrics.update(summarize(samples, f"dit/{length}/{mode}/step", "_ms"))
+        error = (outputs["session"] - outputs["per_call"]).abs().max().item()
+        metrics[f"dit/{length}/max_abs_diff"] = round(error, 6)
+    cfm.use_estimator_session = True
+
+    print_metrics(metrics)
+    if args.json:
+        config = {key: value for key, value in vars(args).items() if key != "json"}
+        write_report(make_report("session", environment(args.device), config, metrics), args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+ODE solver benchmark for voice conversion.
+
+Converts one source utterance with every solver / step count / timestep
+schedule combination and reports estimator evaluations (NFE), wall time and
+the mel-spectrogram L1 distance to a 50-step Euler reference. The diffusion
+noise is seeded identically for every run so only the solver differs.
+
+Run from the server directory:
+    python -m benchmarks.solver_bench --source voices/test_default.mp3 --reference voices/jerry.mp3
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import torch
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "vc"))
+
+from vc.modules.flow_matching import SOLVERS, T_SCHEDULES
+from vc.voice_converter import VoiceConverter
+
+DEFAULT_STEPS = [2, 3, 4, 5, 8, 10]
+
+
+def convert(converter, args, solver, steps, schedule):
+    cfm = converter.model.cfm
+    torch.manual_seed(args.seed)
+    nfe_before = cfm.nfe
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    start = time.perf_counter()
+    _, wave = converter.convert_voice(
+        args.source, args.reference,
+        diffusion_steps=steps,
+        inference_cfg_rate=args.cfg_rate,
+        solver=solver,
+        t_schedule=schedule,
+    )
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    return wave, cfm.nfe - nfe_before, time.perf_counter() - start
+
+
+def mel_l1(converter, wave, reference_mel):
+    mel = converter.to_mel(torch.from_numpy(wave).float().unsqueeze(0).to(converter.device))
+    frames = min(mel.size(-1), reference_mel.size(-1))
+    return (mel[..., :frames] - reference_mel[..., :frames]).abs().mean().item()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", required=True, help="Source speech (e.g. a TTS output)")
+    parser.add_argument("--reference", required=True, help="Target voice reference audio")
+    parser.add_argument("--checkpoint", default="vc/checkpoints/Indic-seed-uvit-whisper-small-wavenet.pth")
+    parser.add_argument("--config", default="vc/checkpoints/config_dit_mel_seed_uvit_whisper_small_wavenet.yml")
+    parser.add_argument("--solvers", nargs="+", default=list(SOLVERS), choices=SOLVERS)
+    parser.add_argument("--schedules", nargs="+", default=list(T_SCHEDULES), choices=T_SCHEDULES)
+    parser.add_argument("--steps", nargs="+", type=int, default=DEFAULT_STEPS)
+    parser.add_argument("--reference-steps", type=int, default=50)
+    parser.add_argument("--cfg-rate", type=float, default=0.7)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    converter = VoiceConverter(args.checkpoint, args.config)
+    # Warm up kernels and the reference-feature cache
+    convert(converter, args, "euler", 2, "uniform")
+
+    print(f"Reference: {args.reference_steps}-step Euler, uniform schedule")
+    reference_wave, _, reference_time = convert(converter, args, "euler", args.reference_steps, "uniform")
+    reference_mel = converter.to_mel(torch.from_numpy(reference_wave).float().unsqueeze(0).to(converter.device))
+    print(f"  wall time {reference_time * 1000:.0f} ms\n")
+
+    results = []
+    print(f"{'solver':<15}{'schedule':<10}{'steps':>6}{'NFE':>6}{'wall ms':>10}{'mel L1':>10}")
+    for solver in args.solvers:
+        for schedule in args.schedules:
+            for steps in args.steps:
+                wave, nfe, wall = convert(converter, args, solver, steps, schedule)
+                distance = mel_l1(converter, wave, reference_mel)
+                results.append({
+                    "solver": solver, "schedule": schedule, "steps": steps,
+                    "nfe": nfe, "wall_ms": round(wall * 1000, 1), "mel_l1": round(distance, 5),
+                })
+                print(f"{solver:<15}{schedule:<10}{steps:>6}{nfe:>6}{wall * 1000:>10.0f}{distance:>10.4f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"reference_wall_ms": round(reference_time * 1000, 1), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
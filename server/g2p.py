@@ -1,5 +1,7 @@
+import os
 import re
 import unicodedata
+from functools import lru_cache
 from typing import List
 
 
@@ -420,9 +422,142 @@ def sinhala_to_ipa(word: str) -> str:
         print(f"Error processing word '{word}': {e}")
         return word
 
+# ---------------------------------------------------------------------------
+# Compiled G2P
+#
+# The functions above are the reference implementation. The engine below
+# produces identical output (checked by tests/test_g2p.py) but does the
+# character walk as one regex pass with a unit lookup table, runs the
+# rewrite rules as compiled regex substitutions over the phoneme string,
+# and memoizes whole words.
+# ---------------------------------------------------------------------------
+
+# The rules run over single characters of the phoneme string, so only the
+# single-character consonant tokens count as consonants there
+_C = "[" + "".join(sorted(re.escape(t) for t in CONSONANT_TOKENS if len(t) == 1)) + "]"
+_CONS = "[" + "".join(CONS_MAP) + "]"
+_VS = "[" + "".join(VOWEL_SIGNS) + "]"
+
+# One alternative per branch of word_to_initial_phonemes, tried in the same order
+UNIT_PATTERN = re.compile(
+    rf"ර{VIRAMA}({_CONS})({_VS}*)({VIRAMA})?"                 # repaya
+    rf"|({_CONS}){ZWJ}?{VIRAMA}{ZWJ}([රය])({_VS})?"            # rakaransaya / yansaya
+    rf"|({_CONS}){ZWJ}?({_VS}*)({VIRAMA})?"                    # consonant + vowel signs
+    rf"|(.)",
+    re.S,
+)
+# Same alternatives without groups, for splitting a word into units
+UNIT_SPLIT_PATTERN = re.compile(re.sub(r"\((?!\?)", "(?:", UNIT_PATTERN.pattern), re.S)
+SINGLE_CHAR_MAP = {**INDEP_VOWELS, **SPECIAL_SIGNS, **VOWEL_SIGNS, VIRAMA: ""}
+
+RULE2_PATTERN = re.compile(rf"({_C})r([əa])({_C})")
+RULE2_SWAP = {"ə": "a", "a": "ə"}
+RULE3_PATTERN = re.compile(r"([aeæoə])əh")
+RULE4_PATTERN = re.compile(rf"ə({_C}{_C})")
+RULE7_PATTERN = re.compile(r"kə([rl])u")
+# Cheap pre-check: if none of the looping rules can fire, the loop is done
+LOOP_RULES_PATTERN = re.compile("|".join(
+    p.pattern for p in (RULE2_PATTERN, RULE3_PATTERN, RULE4_PATTERN, RULE7_PATTERN)
+))
+FIRST_VOWEL_PATTERN = re.compile("[" + "".join(t for t in VOWEL_TOKENS if len(t) == 1) + "]")
+RULE5_EXCEPTIONS = {"r", "b", "ɖ", "ʈ"}
+SINGLE_CHAR_CONSONANTS = {t for t in CONSONANT_TOKENS if len(t) == 1}
+
+WORD_CACHE_SIZE = int(os.getenv("G2P_WORD_CACHE_SIZE", "50000"))
+
+
+def _unit_to_phonemes(m) -> str:
+    if m.group(1) is not None:
+        vowel = "" if m.group(3) else (VOWEL_SIGNS[m.group(2)[-1]] if m.group(2) else "ə")
+        return "r" + CONS_MAP[m.group(1)] + vowel
+    if m.group(4) is not None:
+        medial = "r" if m.group(5) == "ර" else "j"
+        return CONS_MAP[m.group(4)] + medial + (VOWEL_SIGNS[m.group(6)] if m.group(6) else "")
+    if m.group(7) is not None:
+        vowel = "" if m.group(9) else (VOWEL_SIGNS[m.group(8)[-1]] if m.group(8) else "ə")
+        return CONS_MAP[m.group(7)] + vowel
+    ch = m.group(10)
+    return SINGLE_CHAR_MAP.get(ch, ch)
+
+
+class _UnitTable(dict):
+    """Grapheme unit -> phonemes, filled on first use of each unit."""
+
+    def __missing__(self, unit):
+        phonemes = self[unit] = _unit_to_phonemes(UNIT_PATTERN.fullmatch(unit))
+        return phonemes
+
+
+UNIT_TABLE = _UnitTable()
+
+
+def compiled_initial_phonemes(word: str) -> str:
+    """Single-pass equivalent of word_to_initial_phonemes."""
+    return "".join([UNIT_TABLE[unit] for unit in UNIT_SPLIT_PATTERN.findall(word)])
+
+
+def compiled_apply_rules(s: str) -> str:
+    """String equivalent of apply_all_rules over a phoneme string."""
+    # Rule #1
+    m = FIRST_VOWEL_PATTERN.search(s)
+    if m and m.group() == "ə":
+        exception = (
+            (len(s) == 2 and s[0] in SINGLE_CHAR_CONSONANTS and s[1] == "ə")
+            or s.startswith("sʋ")
+            or s.startswith("kər")
+        )
+        if not exception:
+            s = s[:m.start()] + "a" + s[m.end():]
+
+    # Rules #2, #3, #4, #7 until stable. Each regex scans left to right without
+    # overlapping matches, exactly like the reference loops.
+    for _ in range(10):
+        if not LOOP_RULES_PATTERN.search(s):
+            break
+        s, n2 = RULE2_PATTERN.subn(lambda m: m.group(1) + "r" + RULE2_SWAP[m.group(2)] + m.group(3), s)
+        s, n3 = RULE3_PATTERN.subn(r"\1ah", s)
+        s, n4 = RULE4_PATTERN.subn(r"a\1", s)
+        s, n7 = RULE7_PATTERN.subn(r"ka\1u", s)
+        if not (n2 or n3 or n4 or n7):
+            break
+
+    # Rule #5
+    if len(s) >= 2 and s[-2] == "ə" and s[-1] in SINGLE_CHAR_CONSONANTS and s[-1] not in RULE5_EXCEPTIONS:
+        s = s[:-2] + "a" + s[-1]
+    # Rule #6
+    if s.endswith("əji"):
+        s = s[:-3] + "aji"
+    # Rule #8 (the long-vowel branch of the reference never matches single characters)
+    if s.startswith("kal"):
+        s = "kə" + s[2:]
+    return s
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def word_to_ipa(word: str) -> str:
+    """Memoized, compiled equivalent of sinhala_to_ipa for an NFC-normalized word."""
+    try:
+        return compiled_apply_rules(compiled_initial_phonemes(word))
+    except Exception as e:
+        print(f"Error processing word '{word}': {e}")
+        return word
+
+
+TOKEN_PATTERN = re.compile(r"\S+|\s+")
+
+
 def convert_text(text: str) -> str:
     text = normalize_text(text)
     # Convert token-by-token (preserve punctuation & whitespace)
+    return "".join(
+        tok if tok.isspace() else word_to_ipa(tok)
+        for tok in TOKEN_PATTERN.findall(text)
+    )
+
+
+def convert_text_reference(text: str) -> str:
+    """Uncompiled, uncached convert_text, kept for parity tests and benchmarks."""
+    text = normalize_text(text)
     tokens = re.findall(r"\S+|\s+", text)
     out = []
     for tok in tokens:
@@ -0,0 +1,72 @@
+"""
+Admission control for synthesis requests.
+
+Requests await the TTS and VC batch schedulers from the event loop, so no
+thread is held per request and everything in flight can share a batch. What
+still needs a bound is how many requests are in flight at once: past
+``max_in_flight``, new ones are rejected with ServerBusy so the API can
+answer 503 instead of piling them up in front of the schedulers.
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class ServerBusy(Exception):
+    """Raised when ``max_in_flight`` requests are already being served."""
+
+    def __init__(self, retry_after):
+        super().__init__("Too many requests in flight")
+        self.retry_after = retry_after
+
+
+class InFlightLimiter:
+    """
+    Counts requests in flight and rejects new ones past a limit.
+
+    Args:
+        max_in_flight (int): Requests served at once.
+        retry_after (int): Seconds suggested to clients when saturated.
+    """
+
+    def __init__(self, max_in_flight=10, retry_after=2):
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def acquire(self):
+        """Admit one request or raise ServerBusy; give the slot back with ``release()``."""
+        with self._lock:
+            if self.in_flight >= self.max_in_flight:
+                self.rejected += 1
+                raise ServerBusy(self.retry_after)
+            self.in_flight += 1
+            self.admitted += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    @contextmanager
+    def slot(self):
+        """``with limiter.slot():`` holds a slot for the block."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+            }
@@ -1,22 +1,35 @@
 import os
 import sys
-from TTS.utils.synthesizer import Synthesizer
 from fastapi import FastAPI, Response,UploadFile,Form,Query, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 import torch
-from g2p import convert_text
-from short2sinhala import short_convert
+from text_frontend import TextFrontend
 from supabase import  create_client,Client
 from fastapi import HTTPException, Request
 import uuid
 from mutagen.mp3 import MP3
 from mutagen.wave import WAVE
 import datetime
-from num2sinhala import num_convert
 from fastapi import BackgroundTasks
 import soundfile as sf
+import io
+import time
+import wave
+from tts_batching import BatchScheduler, synthesize_batch
+from inflight_limiter import InFlightLimiter, ServerBusy
+from streaming import ClosingStreamingResponse, split_sentences, wav_stream_header, to_pcm16
+from model_loader import ParallelLoader, WeightStore, load_synthesizer
+from model_registry import ModelRegistry, ModelUnavailable, resolve
+from result_cache import ResultCache, model_fingerprint
+import tracing
+from warmup import WARMUP_TEXTS, Warmup
+from voice_store import TTLCache, VoiceStore
+from voice_jobs import FeatureJobs
+from contextlib import asynccontextmanager
+import asyncio
 
 # Add the vc directory to Python path for proper imports
 sys.path.append(os.path.join(os.path.dirname(__file__), 'vc'))
@@ -38,6 +51,36 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+@app.exception_handler(ServerBusy)
+async def server_busy_handler(request: Request, exc: ServerBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+# Opt-in: exposes per-stage timings to clients (browser devtools show them)
+SERVER_TIMING = os.getenv("SERVER_TIMING", "0") == "1"
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Attach a trace to every request and record its latency"""
+    trace = tracing.start_trace()
+    start = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - start
+
+    route = request.scope.get("route")
+    tracing.REQUEST_SECONDS.observe(
+        elapsed,
+        route=getattr(route, "path", "unmatched"),
+        method=request.method,
+        status=response.status_code
+    )
+    if SERVER_TIMING and trace.spans:
+        response.headers["Server-Timing"] = f"{trace.server_timing()}, total;dur={elapsed * 1000:.1f}"
+    return response
+
 @app.get("/")
 def read_root():
     return {"message": "Hello, Supabase with FastAPI is working!"}
@@ -54,26 +97,175 @@ vocoder_config_path = "models/dinithi_vocoder.json"
 use_cuda = torch.cuda.is_available()
 print(f"CUDA available: {use_cuda}, device_count: {torch.cuda.device_count()}")
 
-synthesizer = Synthesizer(
-    tts_checkpoint=tts_path,
-    tts_config_path=tts_config_path,
-    vocoder_checkpoint=vocoder_path,
-    vocoder_config=vocoder_config_path,
-    use_cuda=use_cuda
+# Checkpoints are converted once to memory-mapped weight files
+weight_store = WeightStore(os.getenv("WEIGHT_CACHE_DIR", "cache/weights")) \
+    if os.getenv("MAPPED_WEIGHTS", "1") == "1" else None
+
+# Models load on first use and are shared by all requests; heavy ones are
+# unloaded again after sitting idle (see /admin/models)
+model_registry = ModelRegistry()
+cuda_sync = torch.cuda.synchronize if use_cuda else None
+
+def load_tts():
+    synthesizer = load_synthesizer(tts_path, tts_config_path, vocoder_path, vocoder_config_path,
+                                   use_cuda, weight_store)
+    # Time the acoustic model and vocoder wherever they are called from
+    tracing.instrument(synthesizer.tts_model, "inference", "tacotron", cuda_sync)
+    tracing.instrument(synthesizer.vocoder_model, "inference", "hifigan", cuda_sync)
+    return synthesizer
+
+# The default voice is always needed, so the TTS model stays loaded unless a TTL is set
+model_registry.register("tts", load_tts, idle_ttl=float(os.getenv("TTS_IDLE_TTL", "0")))
+synthesizer = model_registry.proxy("tts")
+
+# Requests arriving within a short window share one vocoder pass
+tts_scheduler = BatchScheduler(
+    lambda texts: synthesize_batch(synthesizer, texts),
+    max_batch_size=int(os.getenv("TTS_BATCH_MAX_SIZE", "4")),
+    max_wait_ms=float(os.getenv("TTS_BATCH_WINDOW_MS", "15")),
+    name="tts"
+)
+
+# Abbreviations -> numbers -> phonemes in one pass
+text_frontend = TextFrontend()
+
+# Finished audio for repeated prompts is served from here
+result_cache = ResultCache(
+    max_items=int(os.getenv("RESULT_CACHE_ITEMS", "128")),
+    cache_dir=os.getenv("RESULT_CACHE_DIR", "cache/results") or None,
+    max_disk_bytes=int(os.getenv("RESULT_CACHE_DISK_MB", "512")) * 1024 * 1024
+)
+
+# Custom voice reference files, downloaded once and kept on disk
+voice_store = VoiceStore(
+    cache_dir=os.getenv("VOICE_CACHE_DIR", "cache/voices"),
+    max_bytes=int(os.getenv("VOICE_CACHE_MB", "256")) * 1024 * 1024,
+    timeout=float(os.getenv("VOICE_DOWNLOAD_TIMEOUT", "30"))
+)
+# user_voices rows, keyed by (voice_id, user_id)
+voice_metadata = TTLCache(ttl=float(os.getenv("VOICE_METADATA_TTL", "300")))
+# Background feature extraction for uploaded voices
+feature_jobs = FeatureJobs()
+
+@app.on_event("shutdown")
+async def close_voice_store():
+    await voice_store.close()
+
+# Synthesis requests await the TTS/VC schedulers, so any of them can share a
+# batch; past this many in flight, new ones get a 503
+inference_limiter = InFlightLimiter(
+    max_in_flight=int(os.getenv("INFERENCE_MAX_IN_FLIGHT", "10")),
+    retry_after=int(os.getenv("INFERENCE_RETRY_AFTER", "2"))
 )
 
 # Initialize voice converter with error handling
-voice_converter = None
-try:
+# Diffusion settings for voice conversion; higher-order solvers reach the
+# same quality in fewer steps (see benchmarks/solver_bench.py)
+VC_DIFFUSION_STEPS = int(os.getenv("VC_DIFFUSION_STEPS", "5"))
+VC_SOLVER = os.getenv("VC_SOLVER", "euler")
+VC_T_SCHEDULE = os.getenv("VC_T_SCHEDULE", "uniform")
+VC_CFG_RATE = float(os.getenv("VC_CFG_RATE", "0.7"))
+# "eager", or "torchscript" / "onnx" graphs written by `python -m vc.export`
+VC_BACKEND = os.getenv("VC_BACKEND", "eager")
+# fp32, fp16, bf16 or int8-dynamic (CPU); empty picks fp16 on GPU and fp32 on CPU
+VC_PRECISION = os.getenv("VC_PRECISION") or None
+# Pad estimator inputs to fixed lengths: "auto", a comma list of frame counts,
+# or empty for none. Static shapes mostly pay off with the exported backends.
+VC_LENGTH_BUCKETS = os.getenv("VC_LENGTH_BUCKETS", "auto" if VC_BACKEND != "eager" else "")
+# Source mel frames per streamed conversion chunk (~3 s); 0 converts whole sentences
+VC_STREAM_CHUNK_FRAMES = int(os.getenv("VC_STREAM_CHUNK_FRAMES", "256"))
+
+VC_CHECKPOINT_PATH = "vc/checkpoints/Indic-seed-uvit-whisper-small-wavenet.pth"
+VC_CONFIG_PATH = "vc/checkpoints/config_dit_mel_seed_uvit_whisper_small_wavenet.yml"
+
+def load_voice_converter():
     from vc.voice_converter import VoiceConverter
-    voice_converter = VoiceConverter(
-        checkpoint_path="vc/checkpoints/Indic-seed-uvit-whisper-small-wavenet.pth",
-        config_path="vc/checkpoints/config_dit_mel_seed_uvit_whisper_small_wavenet.yml"
+    converter = VoiceConverter(
+        checkpoint_path=VC_CHECKPOINT_PATH,
+        config_path=VC_CONFIG_PATH,
+        ref_cache_size=int(os.getenv("VC_REF_CACHE_SIZE", "16")),
+        # Persisted so features extracted at upload time survive restarts
+        ref_cache_dir=os.getenv("VC_REF_CACHE_DIR", "cache/voice_features") or None,
+        backend=VC_BACKEND,
+        export_dir=os.getenv("VC_EXPORT_DIR", "vc/exported"),
+        backend_threads=int(os.getenv("VC_BACKEND_THREADS", "0")) or None,
+        precision=VC_PRECISION,
+        weight_store=weight_store,
+        length_buckets=VC_LENGTH_BUCKETS if VC_LENGTH_BUCKETS in ("", "auto")
+        else [int(length) for length in VC_LENGTH_BUCKETS.split(",")]
     )
-    print("Voice converter initialized successfully")
-except Exception as e:
-    print(f"Warning: Voice converter initialization failed: {e}")
-    print("Voice conversion features will be disabled. Only default Dinithi voice will be available.")
+    vc_sync = torch.cuda.synchronize if converter.device.type == "cuda" else None
+    tracing.instrument(converter, "semantic_fn", "whisper", vc_sync)
+    tracing.instrument(converter, "campplus_model", "campplus", vc_sync)
+    tracing.instrument(converter.model.cfm, "inference", "dit", vc_sync)
+    tracing.instrument(converter, "vocoder_fn", "bigvgan", vc_sync)
+    return converter
+
+# The whole VC stack (Whisper, CAMPPlus, DiT, BigVGAN) is unloaded after
+# VC_IDLE_TTL seconds without a conversion; 0 keeps it loaded
+model_registry.register(
+    "vc", load_voice_converter,
+    idle_ttl=float(os.getenv("VC_IDLE_TTL", "900")),
+    available=lambda: os.path.exists(VC_CHECKPOINT_PATH) and os.path.exists(VC_CONFIG_PATH)
+)
+voice_converter = model_registry.proxy("vc")
+
+def vc_available() -> bool:
+    """Whether converted voices can be served (the VC stack is loaded or expected to load)"""
+    return model_registry.available("vc")
+
+def preload_models(names):
+    """
+    Load models up front on parallel threads instead of on first use.
+
+    Returns:
+        dict: the startup report from ``ParallelLoader.finish``
+    """
+    loader = ParallelLoader()
+    for name in names:
+        loader.submit(name, model_registry.get, name)
+    for name in names:
+        try:
+            model = loader.result(name)
+        except Exception as e:
+            print(f"Warning: Preloading {name} failed: {e}")
+            continue
+        for part, seconds in getattr(model, "load_times", {}).items():
+            loader.record(f"{name}/{part}", seconds)
+    return loader.finish()
+
+# Comma-separated models (tts, vc) to load at startup rather than on the first request
+PRELOAD_MODELS = [name.strip() for name in os.getenv("PRELOAD_MODELS", "").split(",") if name.strip()]
+startup_report = preload_models(PRELOAD_MODELS) if PRELOAD_MODELS else None
+model_registry.start_reaper(interval=float(os.getenv("MODEL_REAP_INTERVAL", "60")))
+
+@app.on_event("shutdown")
+async def stop_model_reaper():
+    model_registry.stop()
+
+# Concurrent conversions share estimator and vocoder passes. The scheduler's
+# single worker thread is also what keeps the shared converter single-threaded.
+vc_scheduler = BatchScheduler(
+    lambda items: voice_converter.convert_voice_batch(
+        items,
+        diffusion_steps=VC_DIFFUSION_STEPS,
+        length_adjust=1.0,
+        inference_cfg_rate=VC_CFG_RATE,
+        solver=VC_SOLVER,
+        t_schedule=VC_T_SCHEDULE
+    ),
+    max_batch_size=int(os.getenv("VC_BATCH_MAX_SIZE", "4")),
+    max_wait_ms=float(os.getenv("VC_BATCH_WINDOW_MS", "10")),
+    name="vc"
+)
+
+# Cached results are only valid for the models (and VC settings) that produced them
+MODEL_VERSION = model_fingerprint(
+    [tts_path, tts_config_path, vocoder_path, vocoder_config_path, VC_CHECKPOINT_PATH, VC_CONFIG_PATH],
+    extra=f"vc={vc_available()};steps={VC_DIFFUSION_STEPS};solver={VC_SOLVER};"
+          f"schedule={VC_T_SCHEDULE};cfg={VC_CFG_RATE};backend={VC_BACKEND};"
+          f"precision={VC_PRECISION or 'auto'}"
+)
 
 # Voice options mapping
 VOICE_OPTIONS = {
@@ -94,6 +286,60 @@ VOICE_OPTIONS = {
     }
 }
 
+# Before reporting ready, each worker pushes one text per length bucket
+# through the frontend, TTS and every built-in voice's conversion, so the
+# first real requests don't pay for model loading and kernel autotuning
+WARMUP = os.getenv("WARMUP", "1") == "1"
+WARMUP_BUCKETS = [bucket.strip() for bucket in os.getenv("WARMUP_BUCKETS", "short,medium,long").split(",")
+                  if bucket.strip()]
+warmup = Warmup()
+warmup_audio = {}  # bucket -> synthesized waveform
+
+def warm_frontend_and_tts(bucket: str):
+    ph = text_frontend.process(WARMUP_TEXTS[bucket][0], with_ids=False).phonemes
+    warmup_audio[bucket] = tts_scheduler.run_sync(ph)
+
+def warm_conversion(bucket: str, reference_audio: str):
+    if not vc_available():
+        return
+    vc_scheduler.run_sync((warmup_audio[bucket], synthesizer.output_sample_rate, reference_audio))
+
+def warm_conversion_stream(bucket: str, reference_audio: str):
+    if not vc_available():
+        return
+
+    def convert():
+        for _ in voice_converter.convert_voice_stream(
+            warmup_audio[bucket], synthesizer.output_sample_rate, reference_audio,
+            diffusion_steps=VC_DIFFUSION_STEPS,
+            length_adjust=1.0,
+            inference_cfg_rate=VC_CFG_RATE,
+            solver=VC_SOLVER,
+            t_schedule=VC_T_SCHEDULE,
+            chunk_frames=VC_STREAM_CHUNK_FRAMES
+        ):
+            pass
+
+    vc_scheduler.call(convert).result()
+
+for bucket in WARMUP_BUCKETS:
+    warmup.add(f"tts/{bucket}", warm_frontend_and_tts, bucket)
+    for voice, voice_data in VOICE_OPTIONS.items():
+        if voice_data["requires_conversion"]:
+            warmup.add(f"{voice}/{bucket}", warm_conversion, bucket, voice_data["reference_audio"])
+# Streamed conversion runs the models on fixed-size chunks; one long text covers its shapes
+stream_voices = [voice for voice, voice_data in VOICE_OPTIONS.items() if voice_data["requires_conversion"]]
+if WARMUP_BUCKETS and stream_voices and VC_STREAM_CHUNK_FRAMES > 0:
+    warmup.add(f"{stream_voices[0]}/{WARMUP_BUCKETS[-1]}/stream", warm_conversion_stream,
+               WARMUP_BUCKETS[-1], VOICE_OPTIONS[stream_voices[0]]["reference_audio"])
+
+@app.on_event("startup")
+async def start_warmup():
+    if WARMUP:
+        warmup.start()
+    else:
+        warmup.skip()
+
 class SignupRequest(BaseModel):
     email: str
     password: str
@@ -306,8 +552,9 @@ async def upload_user_voice(
         
         # Save temporarily
         temp_path = f"./{filename}"
+        content = await file.read()
         with open(temp_path, "wb") as buffer:
-            buffer.write(await file.read())
+            buffer.write(content)
         
         # Get file size and duration
         size = round(os.path.getsize(temp_path) / 1024)
@@ -335,6 +582,12 @@ async def upload_user_voice(
         
         # Clean up temp file
         os.remove(temp_path)
+
+        # Any cached rows for this user may now be stale
+        voice_metadata.invalidate(lambda key: key[1] == user_id)
+
+        # Keep the file locally and extract its features before first use
+        features_status = await asyncio.to_thread(schedule_feature_extraction, voice_id, public_url, content)
         
         return {
             "voice_id": voice_id,
@@ -342,7 +595,8 @@ async def upload_user_voice(
             "url": public_url,
             "size": size,
             "duration": duration,
-            "created_at": created_at
+            "created_at": created_at,
+            "features_status": features_status
         }
         
     except HTTPException:
@@ -353,6 +607,59 @@ async def upload_user_voice(
             os.remove(temp_path)
         raise HTTPException(status_code=500, detail=f"Failed to upload voice: {str(e)}")
 
+def extract_voice_features(voice_id: str, reference_path: str):
+    """Compute and persist a custom voice's conditioning features (runs on the VC worker thread)"""
+    feature_jobs.mark_running(voice_id)
+    with tracing.span("extract_features"):
+        voice_converter.get_reference_features(reference_path)
+
+def schedule_feature_extraction(voice_id: str, url: str, content: bytes):
+    """
+    Store an uploaded voice locally and queue its feature extraction.
+
+    Returns:
+        str: job status, or "unavailable" without a voice converter
+    """
+    try:
+        path = voice_store.put(url, content)
+    except Exception as e:
+        print(f"Error storing uploaded voice {voice_id}: {e}")
+        return "unavailable"
+    if not vc_available():
+        voice_store.release(path)
+        return "unavailable"
+
+    future = feature_jobs.start(voice_id, lambda: vc_scheduler.call(extract_voice_features, voice_id, path))
+    future.add_done_callback(lambda _: voice_store.release(path))
+    return feature_jobs.status(voice_id)["status"]
+
+@app.get("/user-voices/{voice_id}/status")
+async def get_user_voice_status(voice_id: str, user_id: str = Query(...)):
+    """Report whether a custom voice's features are extracted and it is ready to use"""
+    try:
+        voice_record = get_custom_voice(voice_id, user_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load custom voice: {str(e)}")
+    if voice_record is None:
+        raise HTTPException(status_code=404, detail="Voice not found")
+
+    job = feature_jobs.status(voice_id)
+    if job is not None:
+        return job
+    if not vc_available():
+        return {"voice_id": voice_id, "status": "unavailable"}
+
+    # No job in this process (e.g. after a restart); check the feature cache.
+    # A status poll must not load the VC stack or keep it from idling out, so
+    # while it isn't loaded the answer is "pending"
+    path = voice_store.peek(voice_record["url"])
+    converter = model_registry.peek("vc")
+    if path and converter is not None:
+        # Hashes the reference file and may stat the feature cache on disk
+        if await asyncio.to_thread(converter.has_reference_features, path):
+            return {"voice_id": voice_id, "status": "ready"}
+    return {"voice_id": voice_id, "status": "pending"}
+
 @app.get("/user-voices/{user_id}")
 async def get_user_voices(user_id: str):
     """Get all custom voices for a user"""
@@ -368,7 +675,7 @@ async def delete_user_voice(voice_id: str, user_id: str = Query(...)):
     """Delete a user's custom voice"""
     try:
         # Verify the voice belongs to the user
-        response = supabase.table("user_voices").select("filename").eq("id", voice_id).eq("user_id", user_id).execute()
+        response = supabase.table("user_voices").select("filename, url").eq("id", voice_id).eq("user_id", user_id).execute()
         if not response.data:
             raise HTTPException(status_code=404, detail="Voice not found")
         
@@ -379,6 +686,12 @@ async def delete_user_voice(voice_id: str, user_id: str = Query(...)):
         
         # Delete from database
         supabase.table("user_voices").delete().eq("id", voice_id).eq("user_id", user_id).execute()
+
+        # Stop serving the deleted voice from the local caches
+        voice_metadata.invalidate(lambda key: key[0] == voice_id)
+        feature_jobs.forget(voice_id)
+        if response.data[0].get("url"):
+            voice_store.discard(response.data[0]["url"])
         
         return {"message": "Voice deleted successfully"}
     except HTTPException:
@@ -392,6 +705,76 @@ class TextRequest(BaseModel):
     user_id: str | None = None  # Make user_id optional
     voice: str = "dinithi"  # Default voice
 
+@app.get("/stats")
+async def get_stats():
+    """Runtime metrics for tuning batching against latency"""
+    return {
+        "tts_batching": tts_scheduler.stats(),
+        "vc_batching": vc_scheduler.stats(),
+        "inference_limiter": inference_limiter.stats(),
+        "result_cache": result_cache.stats(),
+        "voice_store": voice_store.stats(),
+        "voice_metadata": voice_metadata.stats()
+    }
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving HTTP"""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: warmup has finished and the TTS model is usable"""
+    ready = warmup.ready and model_registry.available("tts")
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "warmup": warmup.status()}
+    )
+
+@app.get("/metrics")
+async def get_metrics():
+    """Per-stage latency histograms and fallback counters in Prometheus format"""
+    return Response(content=tracing.registry.render(), media_type="text/plain; version=0.0.4")
+
+# Optional shared secret for the admin endpoints, sent as X-Admin-Token
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+def check_admin(request: Request):
+    if ADMIN_TOKEN and request.headers.get("x-admin-token") != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.get("/admin/models")
+async def get_models(request: Request):
+    """Loaded models, their memory use and how long they have been idle"""
+    check_admin(request)
+    return {"models": model_registry.status(), "startup": startup_report}
+
+@app.post("/admin/models/{name}/load")
+async def load_model(name: str, request: Request):
+    """Load a model now instead of on its first request"""
+    check_admin(request)
+    try:
+        await model_registry.get_async(name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown model '{name}'")
+    except ModelUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {"models": model_registry.status()}
+
+@app.post("/admin/models/{name}/unload")
+async def unload_model(name: str, request: Request):
+    """Unload a model (also clears a failed load so the next use retries it)"""
+    check_admin(request)
+    try:
+        await asyncio.to_thread(model_registry.unload, name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown model '{name}'")
+    return {"models": model_registry.status()}
+
+def voice_label(voice: str) -> str:
+    """Metric label for a voice; custom voices share one label to bound cardinality"""
+    return "custom" if voice.startswith("custom_") else voice
+
 @app.get("/voices")
 async def get_available_voices(user_id: str = Query(None)):
     """Get available voices for TTS generation"""
@@ -399,7 +782,7 @@ async def get_available_voices(user_id: str = Query(None)):
     
     for voice_id, voice_data in VOICE_OPTIONS.items():
         # Include voice if it doesn't require conversion or if voice converter is available
-        if not voice_data["requires_conversion"] or voice_converter is not None:
+        if not voice_data["requires_conversion"] or vc_available():
             available_voices.append({"id": voice_id, "name": voice_data["name"]})
     
     # Add user's custom voice if available and user_id is provided
@@ -419,50 +802,121 @@ async def get_available_voices(user_id: str = Query(None)):
     return {"voices": available_voices}
 
 
-async def upload_to_supabase_background(temp_path: str, filename: str, audio_id: str, user_id: str, text: str, voice: str):
+async def upload_to_supabase_background(audio_bytes: bytes, filename: str, audio_id: str, user_id: str, text: str, voice: str):
     """Background task to upload audio to Supabase"""
     try:
         # Upload to Supabase Storage
-        with open(temp_path, "rb") as f:
-            supabase.storage.from_(BUCKET_NAME).upload(filename, f)
+        with tracing.span("upload"):
+            supabase.storage.from_(BUCKET_NAME).upload(filename, audio_bytes, {"content-type": "audio/wav"})
 
         # Get public URL
         public_url = supabase.storage.from_(BUCKET_NAME).get_public_url(filename)
 
         # Collect metadata
-        size_kb = round(os.path.getsize(temp_path) / 1024, 2)
-        duration = get_audio_duration(temp_path)
+        size_kb = round(len(audio_bytes) / 1024, 2)
+        duration = get_wav_bytes_duration(audio_bytes)
         created_at = datetime.datetime.utcnow().isoformat()
 
         # Insert record into Supabase table
-        supabase.table("audio").insert({
-            "id": audio_id,
-            "user_id": str(user_id),
-            "created_at": created_at,
-            "size": size_kb,
-            "duration": duration,
-            "url": public_url,
-            "text": text,
-            "voice": voice
-        }).execute()
+        with tracing.span("db_insert"):
+            supabase.table("audio").insert({
+                "id": audio_id,
+                "user_id": str(user_id),
+                "created_at": created_at,
+                "size": size_kb,
+                "duration": duration,
+                "url": public_url,
+                "text": text,
+                "voice": voice
+            }).execute()
         
         print(f"Successfully uploaded audio {audio_id} to Supabase")
     except Exception as e:
         print(f"Error uploading to Supabase: {e}")
-    finally:
-        # Clean up temp file
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
 
-@app.post("/synthesize")
-async def synthesize(request: TextRequest, background_tasks: BackgroundTasks):
+def encode_wav(wav, sample_rate: int) -> bytes:
+    """Encode a float waveform as a 16-bit PCM WAV in memory"""
+    buffer = io.BytesIO()
+    sf.write(buffer, wav, sample_rate, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
+
+def get_wav_bytes_duration(audio_bytes: bytes):
+    """Get the duration of an in-memory WAV in seconds from its sample count"""
+    with wave.open(io.BytesIO(audio_bytes)) as wav_file:
+        return round(wav_file.getnframes() / wav_file.getframerate(), 2)
+
+def save_wav_bytes(wav) -> bytes:
+    """Encode the synthesizer's output as WAV bytes"""
+    buffer = io.BytesIO()
+    synthesizer.save_wav(wav, buffer)
+    return buffer.getvalue()
+
+async def render_audio(ph: str, audio_id: str, voice: str, voice_config: dict):
+    """
+    Synthesize phonemes and apply voice conversion.
+
+    The models run on the TTS and VC schedulers' threads and are awaited
+    here, so every request in flight can join a batch; only the encoding
+    runs on a worker thread. Audio stays in memory from the vocoder to the
+    encoded WAV.
+
+    Returns:
+        tuple: (audio_bytes, final_filename)
+    """
+    # Generate base audio using Dinithi model
+    wav = await tts_scheduler.run(ph)
+
+    # Apply voice conversion if needed
+    if voice_config["requires_conversion"]:
+        if not vc_available():
+            print(f"Voice conversion requested for {voice} but voice converter not available. Using default voice.")
+            tracing.FALLBACKS.inc(voice=voice_label(voice), reason="converter_unavailable")
+        else:
+            print(f"Applying voice conversion to {voice}")
+            try:
+                # Perform voice conversion
+                sr, converted_audio = await vc_scheduler.run(
+                    (wav, synthesizer.output_sample_rate, voice_config["reference_audio"])
+                )
+                with tracing.span("encode"):
+                    return await asyncio.to_thread(encode_wav, converted_audio, sr), f"{audio_id}_{voice}_tts.wav"
+            except Exception as e:
+                print(f"Voice conversion failed: {e}")
+                tracing.FALLBACKS.inc(voice=voice_label(voice), reason="conversion_failed")
+
+        # Fallback to original audio
+        final_filename = f"{audio_id}_dinithi_fallback.wav"
+    else:
+        # Use original Dinithi audio
+        final_filename = f"{audio_id}_dinithi_tts.wav"
+
+    with tracing.span("encode"):
+        return await asyncio.to_thread(save_wav_bytes, wav), final_filename
+
+def get_custom_voice(voice_id: str, user_id: str):
+    """Fetch a ``user_voices`` row, served from the metadata cache while fresh"""
+    key = (voice_id, user_id)
+    voice_record = voice_metadata.get(key)
+    if voice_record is None:
+        response = supabase.table("user_voices").select("*").eq("id", voice_id).eq("user_id", user_id).execute()
+        if not response.data:
+            return None
+        voice_record = response.data[0]
+        voice_metadata.put(key, voice_record)
+    return voice_record
+
+async def resolve_voice(request: TextRequest):
+    """
+    Look up the voice config for a request.
+
+    Custom voices get their reference file's URL in ``reference_url``; the
+    file itself comes from ``voice_store.reference(url)`` when it is needed.
+
+    Returns:
+        dict: voice config
+    """
     # Check if it's a custom voice
-    is_custom_voice = request.voice.startswith("custom_")
-    voice_config = None
-    custom_voice_path = None
-    
-    if is_custom_voice:
-        # Extract voice ID and get voice file path
+    if request.voice.startswith("custom_"):
         voice_id = request.voice.replace("custom_", "")
         user_id = request.user_id
         
@@ -471,51 +925,49 @@ async def synthesize(request: TextRequest, background_tasks: BackgroundTasks):
         
         # Get custom voice info from database
         try:
-            response = supabase.table("user_voices").select("*").eq("id", voice_id).eq("user_id", user_id).execute()
-            if not response.data:
-                raise HTTPException(status_code=404, detail="Custom voice not found")
-            
-            voice_record = response.data[0]
-            
-            # Download the voice file temporarily for voice conversion
-            voice_url = voice_record["url"]
-            custom_voice_path = f"./temp_custom_voice_{voice_id}.wav"
-            
-            # Download the custom voice file
-            import requests
-            response = requests.get(voice_url)
-            with open(custom_voice_path, "wb") as f:
-                f.write(response.content)
-            
-            # Set up voice config for custom voice
-            voice_config = {
-                "name": voice_record["name"],
-                "requires_conversion": True,
-                "reference_audio": custom_voice_path
-            }
+            voice_record = get_custom_voice(voice_id, user_id)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to load custom voice: {str(e)}")
-    else:
-        # Validate standard voice selection
-        if request.voice not in VOICE_OPTIONS:
-            raise HTTPException(status_code=400, detail=f"Invalid voice '{request.voice}'. Available voices: {list(VOICE_OPTIONS.keys())}")
-        
-        voice_config = VOICE_OPTIONS[request.voice]
+        if voice_record is None:
+            raise HTTPException(status_code=404, detail="Custom voice not found")
 
-    # Convert short forms in the text
-    text = short_convert(request.text)
-    print(f"Converted text: {text}")
-    
-    # Convert numbers to Sinhala
-    text_with_numbers_converted = num_convert(text)
-    print(f"Text after number conversion: {text_with_numbers_converted}")
-    
-    # Convert to phonemes
-    ph = convert_text(text_with_numbers_converted)
-    print(f"Phonemized text: {ph}")
+        return {
+            "name": voice_record["name"],
+            "requires_conversion": True,
+            "reference_audio": None,
+            "reference_url": voice_record["url"]
+        }
 
-    # Generate base audio using Dinithi model
-    wav = synthesizer.tts(ph)
+    # Validate standard voice selection
+    if request.voice not in VOICE_OPTIONS:
+        raise HTTPException(status_code=400, detail=f"Invalid voice '{request.voice}'. Available voices: {list(VOICE_OPTIONS.keys())}")
+    return VOICE_OPTIONS[request.voice]
+
+@asynccontextmanager
+async def voice_reference(voice_config: dict):
+    """Yield the voice config with ``reference_audio`` pointing at a local file for the block"""
+    if not voice_config.get("reference_url"):
+        yield voice_config
+        return
+    with tracing.span("download_reference"):
+        path = await voice_store.acquire(voice_config["reference_url"])
+    try:
+        yield {**voice_config, "reference_audio": path}
+    finally:
+        voice_store.release(path)
+
+@app.post("/synthesize")
+async def synthesize(request: TextRequest, background_tasks: BackgroundTasks):
+    tracing.set_voice(voice_label(request.voice))
+    with tracing.span("resolve_voice"):
+        voice_config = await resolve_voice(request)
+
+    # Expand short forms and numbers, then convert to phonemes
+    with tracing.span("frontend"):
+        frontend_output = text_frontend.process(request.text, with_ids=False)
+    print(f"Normalized text: {frontend_output.normalized}")
+    ph = frontend_output.phonemes
+    print(f"Phonemized text: {ph}")
 
     # Log the user ID and voice
     user_id = request.user_id
@@ -523,85 +975,46 @@ async def synthesize(request: TextRequest, background_tasks: BackgroundTasks):
 
     # Generate unique filename
     audio_id = str(uuid.uuid4())
-    
-    # Step 1: Save base audio
-    base_filename = f"{audio_id}_base_dinithi.wav"
-    base_temp_path = f"./{base_filename}"
-    synthesizer.save_wav(wav, base_temp_path)
 
-    # Step 2: Apply voice conversion if needed
+    computed = False
+    # Cached results are never fallbacks, so a hit is named like a successful render
     if voice_config["requires_conversion"]:
-        if voice_converter is None:
-            print(f"Voice conversion requested for {request.voice} but voice converter not available. Using default voice.")
-            # Fallback to original audio
-            final_filename = f"{audio_id}_dinithi_fallback.wav"
-            final_temp_path = base_temp_path
-        else:
-            print(f"Applying voice conversion to {request.voice}")
-            try:
-                # Perform voice conversion
-                sr, converted_audio = voice_converter.convert_voice(
-                    source_audio_path=base_temp_path,
-                    target_audio_path=voice_config["reference_audio"],
-                    diffusion_steps=5,  # Balance between quality and speed
-                    length_adjust=1.0,
-                    inference_cfg_rate=0.7
-                )
-                
-                # Save converted audio
-                final_filename = f"{audio_id}_{request.voice}_tts.wav"
-                final_temp_path = f"./{final_filename}"
-                sf.write(final_temp_path, converted_audio, sr)
-                
-                # Clean up base audio
-                if os.path.exists(base_temp_path):
-                    os.remove(base_temp_path)
-                    
-            except Exception as e:
-                print(f"Voice conversion failed: {e}")
-                # Fallback to original audio
-                final_filename = f"{audio_id}_dinithi_fallback.wav"
-                final_temp_path = base_temp_path
-            
+        final_filename = f"{audio_id}_{request.voice}_tts.wav"
     else:
-        # Use original Dinithi audio
         final_filename = f"{audio_id}_dinithi_tts.wav"
-        final_temp_path = base_temp_path
 
-    # Read final audio bytes to return immediately
-    with open(final_temp_path, "rb") as f:
-        audio_bytes = f.read()
+    async def compute():
+        nonlocal computed, final_filename
+        computed = True
+        # Too many requests in flight answers 503 before any work starts
+        with inference_limiter.slot():
+            async with voice_reference(voice_config) as config:
+                audio_bytes, final_filename = await render_audio(ph, audio_id, request.voice, config)
+        # Don't pin a fallback result in the cache
+        return audio_bytes, not final_filename.endswith("_fallback.wav")
+
+    cache_key = ResultCache.make_key(ph, request.voice, MODEL_VERSION)
+    audio_bytes = await result_cache.get_or_compute(cache_key, compute)
+    tracing.RESULT_CACHE.inc(result="miss" if computed else "hit")
+
+    headers = {
+        "Content-Disposition": f"inline; filename=synthesized_{request.voice}.wav",
+        "x-voice": request.voice
+    }
 
     # Only store in database if user is logged in and user_id is not null
     if user_id and user_id != "null":
-        # Add background task for upload
+        # Add background task for upload, reusing the encoded response bytes
         background_tasks.add_task(
             upload_to_supabase_background, 
-            final_temp_path, 
+            audio_bytes, 
             final_filename, 
             audio_id, 
             user_id, 
             request.text,
             voice_config["name"]
         )
-        
-        # Return with headers for logged-in users
-        headers = {
-            "Content-Disposition": f"inline; filename=synthesized_{request.voice}.wav",
-            "x-audio-id": audio_id,
-            "x-voice": request.voice
-        }
-    else:
-        # For non-logged-in users, delete temp file immediately
-        os.remove(final_temp_path)
-        headers = {
-            "Content-Disposition": f"inline; filename=synthesized_{request.voice}.wav",
-            "x-voice": request.voice
-        }
-
-    # Clean up custom voice file if it was used
-    if custom_voice_path and os.path.exists(custom_voice_path):
-        os.remove(custom_voice_path)
+        headers["x-audio-id"] = audio_id
 
     # Return audio to frontend immediately
     return Response(
@@ -610,6 +1023,153 @@ async def synthesize(request: TextRequest, background_tasks: BackgroundTasks):
         headers=headers,
     )
 
+async def render_pcm(ph: str, voice: str, voice_config: dict, sample_rate: int) -> bytes:
+    """Synthesize one sentence to raw 16-bit PCM, awaiting the TTS and VC schedulers."""
+    wav = await tts_scheduler.run(ph)
+    if not voice_config["requires_conversion"]:
+        return to_pcm16(wav)
+    if not vc_available():
+        tracing.FALLBACKS.inc(voice=voice_label(voice), reason="converter_unavailable")
+        return to_pcm16(wav)
+
+    try:
+        sr, converted_audio = await vc_scheduler.run(
+            (wav, synthesizer.output_sample_rate, voice_config["reference_audio"])
+        )
+        return to_pcm16(converted_audio)
+    except Exception as e:
+        print(f"Voice conversion failed for {voice}: {e}")
+        if synthesizer.output_sample_rate != sample_rate:
+            raise
+        tracing.FALLBACKS.inc(voice=voice_label(voice), reason="conversion_failed")
+        return to_pcm16(wav)
+
+async def convert_pcm_stream(wav, voice: str, voice_config: dict, sample_rate: int):
+    """
+    Convert one synthesized sentence chunk by chunk, yielding 16-bit PCM as
+    soon as each chunk is vocoded.
+
+    Every step of ``convert_voice_stream`` runs on the VC scheduler's worker
+    thread, so other requests' conversions interleave between chunks.
+    """
+    chunks = voice_converter.convert_voice_stream(
+        wav, synthesizer.output_sample_rate, voice_config["reference_audio"],
+        diffusion_steps=VC_DIFFUSION_STEPS,
+        length_adjust=1.0,
+        inference_cfg_rate=VC_CFG_RATE,
+        solver=VC_SOLVER,
+        t_schedule=VC_T_SCHEDULE,
+        chunk_frames=VC_STREAM_CHUNK_FRAMES
+    )
+    first = True
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wrap_future(vc_scheduler.call(next, chunks, None))
+            except Exception as e:
+                print(f"Voice conversion failed for {voice}: {e}")
+                # Unconverted audio can only replace a sentence that hasn't started
+                if not first or synthesizer.output_sample_rate != sample_rate:
+                    raise
+                tracing.FALLBACKS.inc(voice=voice_label(voice), reason="conversion_failed")
+                yield to_pcm16(wav)
+                return
+            if chunk is None:
+                return
+            first = False
+            yield to_pcm16(chunk)
+    finally:
+        vc_scheduler.call(chunks.close)
+
+@app.post("/synthesize/stream")
+async def synthesize_stream(request: TextRequest):
+    """
+    Stream synthesized audio as a WAV whose sentences arrive as soon as they
+    are ready, so time-to-first-audio depends on the first sentence only.
+    Converted voices are additionally streamed in chunks of
+    ``VC_STREAM_CHUNK_FRAMES`` within each sentence.
+    """
+    tracing.set_voice(voice_label(request.voice))
+    with tracing.span("resolve_voice"):
+        voice_config = await resolve_voice(request)
+
+    with tracing.span("frontend"):
+        text = text_frontend.normalize(request.text)
+    sentences = split_sentences(text)
+    if not sentences:
+        raise HTTPException(status_code=400, detail="Text is empty after normalization")
+
+    # Load the models off the event loop if this is their first use
+    sample_rate = (await resolve(synthesizer)).output_sample_rate
+    if voice_config["requires_conversion"] and vc_available():
+        try:
+            sample_rate = (await resolve(voice_converter)).sr
+        except ModelUnavailable as e:
+            print(f"Warning: {e}")
+
+    # Pin the custom voice's reference file until the stream ends
+    reference_path = None
+    if voice_config.get("reference_url"):
+        with tracing.span("download_reference"):
+            reference_path = await voice_store.acquire(voice_config["reference_url"])
+        voice_config = {**voice_config, "reference_audio": reference_path}
+
+    def release_reference():
+        if reference_path:
+            voice_store.release(reference_path)
+
+    # Converted voices stream each sentence chunk by chunk; only TTS runs ahead
+    stream_conversion = (
+        voice_config["requires_conversion"] and vc_available() and VC_STREAM_CHUNK_FRAMES > 0
+    )
+
+    def submit(sentence):
+        with tracing.span("frontend"):
+            ph = text_frontend.phonemize(sentence)
+        if stream_conversion:
+            return asyncio.ensure_future(tts_scheduler.run(ph))
+        return asyncio.ensure_future(render_pcm(ph, request.voice, voice_config, sample_rate))
+
+    # The stream holds one slot until the response ends, so a full server still answers 503
+    try:
+        inference_limiter.acquire()
+    except Exception:
+        release_reference()
+        raise
+
+    def close():
+        inference_limiter.release()
+        release_reference()
+
+    async def audio_chunks():
+        pending = None
+        try:
+            yield wav_stream_header(sample_rate)
+            pending = submit(sentences[0])
+            for index in range(len(sentences)):
+                result = await pending
+                # Keep one sentence in flight while the previous one is sent
+                pending = submit(sentences[index + 1]) if index + 1 < len(sentences) else None
+                if stream_conversion:
+                    async for pcm in convert_pcm_stream(result, request.voice, voice_config, sample_rate):
+                        yield pcm
+                else:
+                    yield result
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    # Releases run when the response ends, even if the generator never started
+    return ClosingStreamingResponse(
+        audio_chunks(),
+        close,
+        media_type="audio/wav",
+        headers={
+            "Content-Disposition": f"inline; filename=synthesized_{request.voice}.wav",
+            "x-voice": request.voice
+        },
+    )
+
 @app.delete("/audio/{audio_id}")
 async def delete_audio(audio_id: str, user_id: str = Query(...)):
     """Delete an audio file"""
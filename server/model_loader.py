@@ -0,0 +1,277 @@
+"""
+Startup model loading.
+
+Training checkpoints are pickles that ``torch.load`` reads whole, optimizer
+state included, before the weights are copied into the model, so cold start
+is slow and peak RSS is about twice the model size. ``WeightStore`` converts
+each checkpoint once into a safetensors file holding only the model weights
+(under ``cache/weights``, keyed by the source file's path, size and mtime and
+by which weights are kept). Later starts memory-map that file and copy each
+tensor straight into a module that already sits on its target device and
+dtype. Without safetensors
+installed the converted file is a plain state dict read with
+``torch.load(mmap=True)``.
+
+``ParallelLoader`` runs independent loads (the TTS synthesizer, the voice
+converter) on threads and prints a per-model startup report.
+"""
+
+import hashlib
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+
+try:
+    import safetensors  # noqa: F401
+    HAS_SAFETENSORS = True
+except ImportError:
+    HAS_SAFETENSORS = False
+
+
+def model_weights(state):
+    """
+    Weights of a plain state dict or a Coqui checkpoint (``{"model": ...}``).
+
+    Returns:
+        tuple: (tensors, metadata) where metadata keeps Tacotron's reduction factor ``r``
+    """
+    if "model" not in state:
+        return state, {}
+    metadata = {}
+    if "r" in state:
+        metadata["r"] = str(state["r"])
+    elif isinstance(state.get("config"), dict) and "r" in state["config"]:
+        metadata["r"] = str(state["config"]["r"])
+    return state["model"], metadata
+
+
+def generator_weights(state):
+    """
+    Generator weights of a Coqui GAN vocoder checkpoint, as ``GAN.load_checkpoint(eval=True)`` keeps them.
+
+    Checkpoints older than Coqui v0.0.15 hold the generator alone under
+    ``model`` (and the discriminator under ``model_disc``).
+    """
+    tensors, metadata = model_weights(state)
+    if "model_disc" in state:
+        return {f"model_g.{name}": tensor for name, tensor in tensors.items()}, metadata
+    return {name: tensor for name, tensor in tensors.items() if name.startswith("model_g.")}, metadata
+
+
+class WeightStore:
+    """
+    Converted, memory-mappable copies of model checkpoints.
+
+    Args:
+        cache_dir (str): Directory for the converted files.
+    """
+
+    def __init__(self, cache_dir="cache/weights"):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def converted_path(self, path, extract=model_weights):
+        stat = os.stat(path)
+        source = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}:{extract.__name__}"
+        key = hashlib.sha1(source.encode()).hexdigest()[:16]
+        name = os.path.splitext(os.path.basename(path))[0]
+        extension = ".safetensors" if HAS_SAFETENSORS else ".pt"
+        return os.path.join(self.cache_dir, f"{name}.{key}{extension}")
+
+    def convert(self, path, extract=model_weights):
+        """
+        Return the converted file for checkpoint ``path``, converting it on first use.
+
+        Args:
+            extract: ``state -> (tensors, metadata)`` picking the weights out
+                of the loaded checkpoint; metadata values must be strings.
+        """
+        target = self.converted_path(path, extract)
+        if os.path.exists(target):
+            return target
+
+        with self._lock:
+            if os.path.exists(target):
+                return target
+            start = time.perf_counter()
+            # Local training checkpoints also pickle their configs
+            state = torch.load(path, map_location="cpu", weights_only=False)
+            tensors, metadata = extract(state)
+
+            # safetensors refuses tensors sharing storage (tied weights)
+            seen = set()
+            flat = {}
+            for name, tensor in tensors.items():
+                tensor = tensor.detach().contiguous()
+                if tensor.numel() and tensor.data_ptr() in seen:
+                    tensor = tensor.clone()
+                seen.add(tensor.data_ptr())
+                flat[name] = tensor
+
+            tmp_path = f"{target}.{uuid.uuid4().hex}.tmp"
+            if HAS_SAFETENSORS:
+                from safetensors.torch import save_file
+                save_file(flat, tmp_path, metadata=metadata)
+            else:
+                torch.save({"tensors": flat, "metadata": metadata}, tmp_path)
+            os.replace(tmp_path, target)
+            print(f"Converted {path} -> {target} in {time.perf_counter() - start:.1f}s")
+        return target
+
+    @staticmethod
+    def load(path):
+        """
+        Memory-map a converted file.
+
+        Returns:
+            tuple: (tensors, metadata) with tensors on the CPU, backed by the file
+        """
+        if path.endswith(".safetensors"):
+            from safetensors import safe_open
+            with safe_open(path, framework="pt", device="cpu") as f:
+                return {name: f.get_tensor(name) for name in f.keys()}, f.metadata() or {}
+        try:
+            state = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+        except TypeError:
+            # torch < 2.1 has no mmap loading
+            state = torch.load(path, map_location="cpu")
+        return state["tensors"], state["metadata"]
+
+    def load_state(self, path, extract=model_weights):
+        """Convert ``path`` if needed and return its memory-mapped (tensors, metadata)."""
+        return self.load(self.convert(path, extract))
+
+
+def load_synthesizer(tts_checkpoint, tts_config, vocoder_checkpoint, vocoder_config,
+                     use_cuda=False, weight_store=None):
+    """
+    Build the Coqui Synthesizer, reading weights through ``weight_store`` when given.
+
+    Without a store (``MAPPED_WEIGHTS=0``) Coqui loads the original checkpoints.
+    Errors in the mapped path are raised rather than hidden behind that slower path.
+    """
+    from TTS.utils.synthesizer import Synthesizer
+
+    if weight_store is None or not (os.path.exists(tts_checkpoint) and os.path.exists(vocoder_checkpoint)):
+        return Synthesizer(
+            tts_checkpoint=tts_checkpoint,
+            tts_config_path=tts_config,
+            vocoder_checkpoint=vocoder_checkpoint,
+            vocoder_config=vocoder_config,
+            use_cuda=use_cuda
+        )
+    return _mapped_synthesizer(Synthesizer, tts_checkpoint, tts_config, vocoder_checkpoint, vocoder_config,
+                               use_cuda, weight_store)
+
+
+def _mapped_synthesizer(synthesizer_cls, tts_checkpoint, tts_config, vocoder_checkpoint, vocoder_config,
+                        use_cuda, weight_store):
+    from TTS.config import load_config
+    from TTS.tts.models import setup_model as setup_tts_model
+    from TTS.utils.audio import AudioProcessor
+    from TTS.vocoder.models import setup_model as setup_vocoder_model
+
+    device = torch.device("cuda" if use_cuda else "cpu")
+    # Without checkpoint paths the Synthesizer loads nothing; the models are attached below
+    synthesizer = synthesizer_cls(use_cuda=use_cuda)
+
+    synthesizer.tts_config = load_config(tts_config)
+    tts_model = setup_tts_model(config=synthesizer.tts_config).to(device)
+    tensors, metadata = weight_store.load_state(tts_checkpoint)
+    tts_model.load_state_dict(tensors)
+    if hasattr(tts_model, "decoder") and hasattr(tts_model.decoder, "set_r"):
+        tts_model.decoder.set_r(int(metadata.get("r", synthesizer.tts_config.r)))
+    synthesizer.tts_model = tts_model.eval()
+
+    synthesizer.vocoder_config = load_config(vocoder_config)
+    synthesizer.vocoder_ap = AudioProcessor(verbose=False, **synthesizer.vocoder_config.audio)
+    vocoder_model = setup_vocoder_model(synthesizer.vocoder_config)
+    if hasattr(vocoder_model, "model_g"):
+        # Coqui's GAN wrapper: inference only needs the generator, as in GAN.load_checkpoint(eval=True)
+        vocoder_model.model_d = None
+        tensors, _ = weight_store.load_state(vocoder_checkpoint, generator_weights)
+        generator = vocoder_model.model_g
+    else:
+        tensors, _ = weight_store.load_state(vocoder_checkpoint)
+        generator = vocoder_model
+    vocoder_model.to(device)
+    vocoder_model.load_state_dict(tensors)
+    vocoder_model.eval()
+    if hasattr(generator, "remove_weight_norm"):
+        generator.remove_weight_norm()
+    synthesizer.vocoder_model = vocoder_model
+    synthesizer.output_sample_rate = synthesizer.vocoder_config.audio["sample_rate"]
+    return synthesizer
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class ParallelLoader:
+    """
+    Run model loads on threads and time each one.
+
+    Args:
+        max_workers (int): Loads running at once.
+    """
+
+    def __init__(self, max_workers=4):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="model-load")
+        self._futures = {}
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.report = {}  # name -> {"seconds", "status", "error"}
+
+    def submit(self, name, fn, *args, **kwargs):
+        """Start ``fn(*args, **kwargs)`` as the load called ``name``."""
+        def timed():
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self.record(name, time.perf_counter() - start, "failed", str(e))
+                raise
+            self.record(name, time.perf_counter() - start)
+            return result
+
+        future = self._futures[name] = self._pool.submit(timed)
+        return future
+
+    def record(self, name, seconds, status="loaded", error=None):
+        """Add a load timed elsewhere (e.g. a converter's sub-models) to the report."""
+        with self._lock:
+            self.report[name] = {"seconds": round(seconds, 3), "status": status, "error": error}
+
+    def result(self, name):
+        """Wait for the load called ``name``; re-raises its exception."""
+        return self._futures[name].result()
+
+    def finish(self):
+        """Wait for every load, print the startup report and return it."""
+        for future in self._futures.values():
+            future.exception()
+        self._pool.shutdown(wait=True)
+        total = time.perf_counter() - self.started
+
+        print("Model startup report:")
+        with self._lock:
+            for name, entry in sorted(self.report.items(), key=lambda item: item[0]):
+                line = f"  {name:<24} {entry['seconds']:8.2f}s  {entry['status']}"
+                if entry["error"]:
+                    line += f" ({entry['error']})"
+                print(line)
+            summary = {"total_seconds": round(total, 3), "peak_rss_mb": peak_rss_mb(), "models": dict(self.report)}
+        rss = f", peak RSS {summary['peak_rss_mb']:.0f} MB" if summary["peak_rss_mb"] is not None else ""
+        print(f"  {'total (wall clock)':<24} {total:8.2f}s{rss}")
+        return summary
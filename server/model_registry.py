@@ -0,0 +1,291 @@
+"""
+Lazily loaded, shared models.
+
+Each model (the Coqui synthesizer with its HiFi-GAN vocoder, the voice
+conversion stack with Whisper, CAMPPlus, DiT and BigVGAN) is registered with
+a loader and built on first use, so a worker that only serves the default
+voice never loads the VC stack. Code keeps using module-level names through
+a ``ModelProxy``. Models with an ``idle_ttl`` are dropped once unused for that
+long; the next use loads them again.
+"""
+
+import asyncio
+import gc
+import inspect
+import threading
+import time
+
+
+class ModelUnavailable(RuntimeError):
+    """A model could not be loaded (missing files or a failed load)."""
+
+
+def module_tensors(module):
+    """
+    Tensors held directly by ``module``: its own parameters and buffers, and
+    the int8 weights of a dynamically quantized Linear, which live in packed
+    params outside both.
+    """
+    import torch
+
+    yield from module.parameters(recurse=False)
+    yield from module.buffers(recurse=False)
+    if isinstance(getattr(module, "_packed_params", None), torch.ScriptObject):
+        yield from (tensor for tensor in module._weight_bias() if tensor is not None)
+
+
+def model_memory_mb(model):
+    """
+    Size of the tensors held by ``model``'s torch modules, in MB.
+
+    Looks at the object itself and one level of attributes (including dicts
+    of modules, such as the VC model's ``Munch``, and modules behind
+    ``tracing.instrument`` wrappers); shared modules and tensors count once.
+    """
+    try:
+        import torch
+    except ImportError:
+        return None
+
+    modules = []
+    candidates = [model] + list(vars(model).values()) if hasattr(model, "__dict__") else [model]
+    for value in candidates:
+        value = inspect.unwrap(value) if callable(value) else value
+        if isinstance(value, torch.nn.Module):
+            modules.append(value)
+        elif isinstance(value, dict):
+            modules.extend(item for item in value.values() if isinstance(item, torch.nn.Module))
+
+    seen_modules = set()
+    seen = set()
+    total = 0
+    for module in modules:
+        for submodule in module.modules():
+            if id(submodule) in seen_modules:
+                continue
+            seen_modules.add(id(submodule))
+            for tensor in module_tensors(submodule):
+                if tensor.data_ptr() in seen:
+                    continue
+                seen.add(tensor.data_ptr())
+                total += tensor.numel() * tensor.element_size()
+    return total / (1024 * 1024)
+
+
+class _Entry:
+    def __init__(self, name, loader, idle_ttl, available, on_unload):
+        self.name = name
+        self.loader = loader
+        self.idle_ttl = idle_ttl
+        self.available = available
+        self.on_unload = on_unload
+        self.model = None
+        self.error = None
+        self.loads = 0
+        self.load_seconds = None
+        self.last_used = None
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Registry of lazily loaded models.
+
+    Args:
+        clock: Time source, replaceable in tests.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._entries = {}
+        self._reaper = None
+        self._stop = threading.Event()
+
+    def register(self, name, loader, idle_ttl=0.0, available=None, on_unload=None):
+        """
+        Register ``loader()`` as the way to build model ``name``.
+
+        Args:
+            idle_ttl (float): Seconds without use before the model is
+                unloaded; 0 keeps it once loaded.
+            available: Optional ``() -> bool`` telling whether the model can
+                be loaded at all (e.g. its checkpoint exists).
+            on_unload: Optional ``(model) -> None`` run when it is dropped.
+        """
+        self._entries[name] = _Entry(name, loader, idle_ttl, available, on_unload)
+
+    def _entry(self, name):
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise KeyError(f"Unknown model: {name}") from None
+
+    def get(self, name):
+        """Return model ``name``, loading it first if needed (blocking)."""
+        entry = self._entry(name)
+        model = entry.model
+        if model is None:
+            with entry.lock:
+                model = entry.model
+                if model is None:
+                    model = self._load(entry)
+        entry.last_used = self.clock()
+        return model
+
+    def _load(self, entry):
+        # Called with entry.lock held
+        if entry.error is not None:
+            raise ModelUnavailable(f"{entry.name} failed to load: {entry.error}")
+        if entry.available is not None and not entry.available():
+            raise ModelUnavailable(f"{entry.name} is not available on this host")
+        print(f"Loading model {entry.name}...")
+        start = time.perf_counter()
+        try:
+            model = entry.loader()
+        except Exception as e:
+            entry.error = str(e)
+            raise ModelUnavailable(f"{entry.name} failed to load: {e}") from e
+        entry.load_seconds = time.perf_counter() - start
+        entry.loads += 1
+        entry.model = model
+        print(f"Loaded model {entry.name} in {entry.load_seconds:.1f}s")
+        return model
+
+    async def get_async(self, name):
+        """``get`` for the event loop: a model that still has to load is loaded on a thread."""
+        entry = self._entry(name)
+        if entry.model is not None:
+            return self.get(name)
+        return await asyncio.to_thread(self.get, name)
+
+    def is_loaded(self, name):
+        return self._entry(name).model is not None
+
+    def peek(self, name):
+        """Model ``name`` if it is loaded, else None; neither loads it nor counts as a use."""
+        return self._entry(name).model
+
+    def available(self, name):
+        """Whether ``name`` is loaded or expected to load."""
+        entry = self._entry(name)
+        if entry.model is not None:
+            return True
+        if entry.error is not None:
+            return False
+        return entry.available is None or bool(entry.available())
+
+    def unload(self, name):
+        """
+        Drop model ``name`` (and forget a failed load, so it may be retried).
+
+        Callers still holding the model keep it alive until they finish.
+
+        Returns:
+            bool: whether a loaded model was dropped
+        """
+        entry = self._entry(name)
+        with entry.lock:
+            model, entry.model, entry.error = entry.model, None, None
+        if model is None:
+            return False
+        if entry.on_unload is not None:
+            entry.on_unload(model)
+        del model
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+        print(f"Unloaded model {name}")
+        return True
+
+    def reap(self):
+        """Unload models idle for longer than their ``idle_ttl``; returns their names."""
+        now = self.clock()
+        idle = [
+            entry.name for entry in self._entries.values()
+            if entry.model is not None and entry.idle_ttl > 0 and now - entry.last_used > entry.idle_ttl
+        ]
+        return [name for name in idle if self.unload(name)]
+
+    def start_reaper(self, interval=60.0):
+        """Check for idle models every ``interval`` seconds on a daemon thread."""
+        if self._reaper is not None:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.reap()
+                except Exception as e:
+                    print(f"Error unloading idle models: {e}")
+
+        self._reaper = threading.Thread(target=run, name="model-reaper", daemon=True)
+        self._reaper.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        """Per-model state for the admin endpoint."""
+        now = self.clock()
+        models = []
+        for entry in self._entries.values():
+            model = entry.model
+            memory = model_memory_mb(model) if model is not None else 0.0
+            models.append({
+                "name": entry.name,
+                "loaded": model is not None,
+                "available": self.available(entry.name),
+                "loads": entry.loads,
+                "load_seconds": round(entry.load_seconds, 3) if entry.load_seconds is not None else None,
+                "idle_seconds": round(now - entry.last_used, 1) if entry.last_used is not None else None,
+                "idle_ttl": entry.idle_ttl,
+                "memory_mb": round(memory, 1) if memory is not None else None,
+                "error": entry.error,
+            })
+        return models
+
+    def proxy(self, name):
+        """Stand-in object whose attributes are those of model ``name``, loaded on first access."""
+        self._entry(name)
+        return ModelProxy(self, name)
+
+
+class ModelProxy:
+    """Forwards attribute access to a registry model, so call sites need no changes."""
+
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry, name):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attribute):
+        # Introspection (hasattr, mock.patch, copy, pickle) looks up private
+        # and dunder names; answering those must not load the model
+        if attribute.startswith("_"):
+            raise AttributeError(attribute)
+        try:
+            model = self._registry.get(self._name)
+        except ModelUnavailable as e:
+            raise AttributeError(f"{attribute}: {e}") from e
+        return getattr(model, attribute)
+
+    def __dir__(self):
+        if not self._registry.is_loaded(self._name):
+            return []
+        return dir(self._registry.get(self._name))
+
+    def __repr__(self):
+        state = "loaded" if self._registry.is_loaded(self._name) else "not loaded"
+        return f"<ModelProxy {self._name} ({state})>"
+
+
+async def resolve(model):
+    """The object behind ``model`` if it is a proxy, loaded off the event loop when needed."""
+    if isinstance(model, ModelProxy):
+        return await model._registry.get_async(model._name)
+    return model
@@ -1,5 +1,9 @@
+import re
+from functools import lru_cache
 from typing import Dict
 
+NUMBER_PATTERN = re.compile(r"\d+")
+
 class SinhalaNumberConverter:
     def __init__(self):
         self.positions: Dict[int, dict] = {
@@ -72,6 +76,12 @@ class SinhalaNumberConverter:
                 "product_ten_noun": "අනූව", "product_ten_prefix": "අනූ"
             }
         }
+
+        # Positions from the largest down, with their divisors precomputed
+        self.scales = [
+            (self.positions[power], 10 ** power)
+            for power in sorted(self.positions.keys(), reverse=True)
+        ]
     
     def convert(self, translate_me: int, last_prefix: bool = False) -> str:
         """Convert a number to Sinhala text"""
@@ -79,15 +89,13 @@ class SinhalaNumberConverter:
             return self.numbers[0]["noun"]
         
         translated = ""
-        powers = sorted(self.positions.keys(), reverse=True)
         last_moded_index = 0
         
         while translate_me > 0:
-            position = self.positions[powers[last_moded_index]]
+            position, scale = self.scales[last_moded_index]
             power_of_ten = position["power_of_ten"]
             
-            divided = translate_me // (10 ** power_of_ten)
-            moded = translate_me % (10 ** power_of_ten)
+            divided, moded = divmod(translate_me, scale)
             
             prefix = last_prefix or (moded != 0 or power_of_ten != 0)
             translate_me = moded
@@ -136,28 +144,19 @@ class SinhalaNumberConverter:
         return translated.strip()
 
 
+# Built once; the converter is stateless
+converter = SinhalaNumberConverter()
+
+
+@lru_cache(maxsize=4096)
+def number_to_words(number: int) -> str:
+    """Memoized SinhalaNumberConverter.convert (prices, years and times repeat a lot)"""
+    return converter.convert(number)
+
+
 # A function to convert numbers in a sinhala text to sinhala words
 def num_convert(text: str) -> str:
-    converter = SinhalaNumberConverter()
-    
-    result = []
-    current_number = ''
-    
-    for char in text:
-        if char.isdigit():
-            current_number += char
-        else:
-            if current_number:
-                number_in_words = converter.convert(int(current_number))
-                result.append(number_in_words)
-                current_number = ''
-            result.append(char)
-    
-    if current_number:
-        number_in_words = converter.convert(int(current_number))
-        result.append(number_in_words)
-    
-    return ''.join(result)
+    return NUMBER_PATTERN.sub(lambda m: number_to_words(int(m.group())), text)
 
 if __name__ == "__main__":
     # Example usage
@@ -1,201 +1,538 @@
-import time
-import statistics
-from synthesis import synthesizer, tts
-from g2p import convert_text
-from num2sinhala import num_convert
-from short2sinhala import short_convert
-
-# Test texts of different sizes
-TEST_TEXTS = {
-    "short": [
-        "හේලෝ",
-        "ඔබට කොහොමද?",
-        "අද කාලගුණය හොඳයි",
-        "මම පාසලට යනවා",
-        "ස්තූතියි ඔබට"
-    ],
-    "medium": [
-        "මම රු. 1000ක් ගෙවුවා. පෙ.ව. 8.30ට පැමිණෙන්න.",
-        "අද උදේ පෙ.ව. 7.00ට නැගිට්ටා. පාසලට යන්න ලෑස්ති වුණා.",
-        "ගත වූ කාලය 5 මිනිත්තු 30 තත්පර විතරයි. ඉතින් ඉක්මනින් කරලා තිබුණා.",
-        "ප.ව. 2.00ට රැස්වීම තියෙනවා. $ 50ක් වටිනවා.",
-        "කොළඹ නගරයේ ගමනාගමනය අදත් ගැටළුකාරී වෙලා තියෙනවා."
-    ],
-    "long": [
-        "ශ්‍රී ලංකාව දකුණු ආසියාවේ පිහිටි සුන්දර දූපත් රටකි. මෙහි ජනගහනය මිලියන 22ක් පමණ වේ. කොළඹ වාණිජ අගනුවර වන අතර ශ්‍රී ජයවර්ධනපුර කෝට්ටේ නිල අගනුවරයි. රටේ ප්‍රධාන භාෂා වන්නේ සිංහල සහ දෙමළ ය.",
-        "අද පෙ.ව. 9.00ට ආරම්භ වූ රැස්වීමේදී අලුත් ව්‍යාපෘතිය ගැන කතා කළා. ඒකට රු. 10,000,000ක් වියදම් වෙනවා කියලා තීරණය කළා. ව්‍යාපෘතිය අවසන් කරන්න මාස 6ක් විතර ගතවෙයි කියලා අපේක්ෂා කරනවා.",
-        "පරිගණකය සහ ඉන්ටර්නෙට් තාක්ෂණය දියුණු වීමත් සමඟ අපේ ජීවිතය බොහෝ සෙයින් පහසු වී තිබේ. ඔන්ලයින් ගනුදෙනු, ඉගෙනීම, සන්නිවේදනය යන සියල්ලම දැන් ගෙදරින්ම කරගන්න පුළුවන්.",
-        "$ 1,500ක් වටිනා මේ උපකරණය භාවිතා කරලා ප.ව. 3.30ට වැඩ ආරම්භ කරන්න. රාත්‍රී 11.45ට වැඩ නවත්තලා අලුත් දිනයට සූදානම් වෙන්න.",
-        "ගම්බද ප්‍රදේශවල ජනතාවගේ ජීවන තත්ත්වය ඉහළ නැංවීම සඳහා රජය විවිධ වැඩසටහන් ක්‍රියාත්මක කරනවා. අධ්‍යාපනය, සෞඛ්‍ය සේවා, පරිසර සංරක්ෂණය වැනි ක්ෂේත්‍රවල විශේෂ අවධානය යොමු කරලා තිබේ."
-    ]
-}
+"""
+Benchmark suite for the TTS server.
+
+Each subcommand measures one part of the pipeline and prints p50/p90/p99
+latency, real-time factor (RTF, compute time / audio duration), throughput
+and peak memory. ``--json`` writes the results; ``--baseline`` (or the
+``compare`` subcommand) diffs them against a stored report and exits with
+status 1 when a metric regresses by more than ``--tolerance``.
+
+Run from the server directory:
+    python performance.py frontend --json frontend.json
+    python performance.py acoustic --device cpu
+    python performance.py vocoder
+    python performance.py tts --concurrency 1 4
+    python performance.py vc --source voices/test_default.mp3 --reference voices/jerry.mp3
+    python performance.py http --url http://localhost:8000 --concurrency 1 4 8
+    python performance.py compare baseline.json current.json
+
+Missing TTS checkpoints are replaced with randomly initialized models built
+from models/dinithi.json and models/dinithi_vocoder.json, so the acoustic,
+vocoder and tts suites also run on CPU-only machines without the weights.
+"""
+
+import argparse
+import io
+import platform
+import sys
+import wave
+
+from benchmarks.corpus import TEST_TEXTS
+from benchmarks.harness import (
+    Timer, compare_reports, environment, load_report, make_report, peak_rss_mb,
+    print_comparison, print_metrics, run_concurrent, summarize, write_report,
+)
+
+
+def all_texts():
+    return [(category, text) for category, texts in TEST_TEXTS.items() for text in texts]
+
+
+# ---------------------------
+# Devices and models
+# ---------------------------
+
+def resolve_device(name):
+    import torch
+    if name == "auto":
+        name = "cuda" if torch.cuda.is_available() else "cpu"
+    if name == "cuda":
+        torch.cuda.reset_peak_memory_stats()
+        return name, torch.cuda.get_device_name(0), torch.cuda.synchronize
+    return name, f"CPU ({platform.processor() or platform.machine()})", None
+
+
+def peak_vram_mb(device):
+    import torch
+    if device != "cuda":
+        return 0.0
+    return round(torch.cuda.max_memory_allocated() / (1024 * 1024), 1)
+
+
+def load_tts(args, device):
+    from benchmarks.models import load_synthesizer
+    synthesizer, random_init = load_synthesizer(
+        args.tts_checkpoint, args.tts_config, args.vocoder_checkpoint, args.vocoder_config,
+        use_cuda=device == "cuda", max_decoder_steps=args.max_decoder_steps, seed=args.seed
+    )
+    if random_init:
+        print(f"Checkpoints missing, using random weights for: {', '.join(random_init)}")
+    return synthesizer, random_init
+
+
+def phonemize_corpus():
+    from text_frontend import TextFrontend
+    frontend = TextFrontend()
+    return [(category, frontend.process(text, with_ids=False).phonemes) for category, text in all_texts()]
+
+
+def acoustic_pass(synthesizer, phonemes):
+    """Run Tacotron2 sentence by sentence, returning the normalized vocoder input mels."""
+    from TTS.tts.utils.synthesis import synthesis
+    mels = []
+    for sentence in synthesizer.split_into_sentences(phonemes):
+        outputs = synthesis(
+            model=synthesizer.tts_model,
+            text=sentence,
+            CONFIG=synthesizer.tts_config,
+            use_cuda=synthesizer.use_cuda,
+            use_griffin_lim=False,
+        )
+        mel = outputs["outputs"]["model_outputs"][0].detach().cpu().numpy()
+        mel = synthesizer.tts_model.ap.denormalize(mel.T).T
+        mels.append(synthesizer.vocoder_ap.normalize(mel.T))  # [C, T]
+    return mels
+
+
+def mel_seconds(synthesizer, mels):
+    hop_length = synthesizer.vocoder_ap.hop_length
+    return sum(mel.shape[1] for mel in mels) * hop_length / synthesizer.output_sample_rate
+
+
+# ---------------------------
+# Suites
+# ---------------------------
+
+def bench_frontend(args):
+    import g2p
+    import num2sinhala
+    import text_frontend
+    from short2sinhala import short_convert
+
+    frontend = text_frontend.TextFrontend()
 
-def warm_up_model():
-    """Warm up the model with a simple inference"""
-    print("Warming up the model...")
-    start_time = time.time()
-    
-    # Simple warm-up text
-    warm_up_text = "හේලෝ"
-    text_processed = short_convert(warm_up_text)
-    text_processed = num_convert(text_processed)
-    ph = convert_text(text_processed)
-    wav = synthesizer.tts(ph)
-    
-    warm_up_time = time.time() - start_time
-    print(f"Model warmed up in {warm_up_time:.2f} seconds")
-    return warm_up_time
-
-def measure_inference_time(text):
-    """Measure inference time for a single text"""
-    # Preprocessing time
-    preprocess_start = time.time()
-    text_processed = short_convert(text)
-    text_processed = num_convert(text_processed)
-    ph = convert_text(text_processed)
-    preprocess_time = time.time() - preprocess_start
-    
-    # TTS inference time
-    tts_start = time.time()
-    wav = synthesizer.tts(ph)
-    tts_time = time.time() - tts_start
-    
-    # Calculate audio duration (assuming 22050 Hz sample rate)
-    audio_duration = len(wav) / 22050
-    
-    # Real-time factor
-    rtf = tts_time / audio_duration if audio_duration > 0 else 0
-    
-    return {
-        'preprocess_time': preprocess_time,
-        'tts_time': tts_time,
-        'total_time': preprocess_time + tts_time,
-        'audio_duration': audio_duration,
-        'rtf': rtf,
-        'text_length': len(text),
-        'phoneme_length': len(ph.split())
+    def clear_caches():
+        if args.cold:
+            g2p.word_to_ipa.cache_clear()
+            text_frontend.verbalize_token.cache_clear()
+            num2sinhala.number_to_words.cache_clear()
+
+    stages = {
+        "short": short_convert,
+        "num": lambda text: num2sinhala.num_convert(short_convert(text)),
+        "g2p": lambda text: g2p.convert_text(num2sinhala.num_convert(short_convert(text))),
+        "fused": lambda text: frontend.process(text, with_ids=False),
     }
+    for _ in range(args.warmup):
+        for _, text in all_texts():
+            for fn in stages.values():
+                fn(text)
+
+    metrics = {}
+    for stage, fn in stages.items():
+        for category in TEST_TEXTS:
+            latencies = []
+            for _ in range(args.repeats):
+                for text in TEST_TEXTS[category]:
+                    clear_caches()
+                    with Timer() as timer:
+                        fn(text)
+                    latencies.append(timer.ms)
+            metrics.update(summarize(latencies, f"frontend/{stage}/{category}/latency", "_ms"))
+
+    texts = [text for _, text in all_texts()]
+    for concurrency in args.concurrency:
+        run = run_concurrent(stages["fused"], texts, concurrency, args.repeats)
+        metrics.update(summarize(run["latencies_ms"], f"frontend/c{concurrency}/latency", "_ms"))
+        metrics[f"frontend/c{concurrency}/throughput_per_sec"] = round(run["throughput_per_sec"], 2)
+
+    metrics["peak_rss_mb"] = peak_rss_mb()
+    return metrics, {"device": "cpu"}
+
+
+def bench_acoustic(args):
+    device, device_name, sync = resolve_device(args.device)
+    synthesizer, random_init = load_tts(args, device)
+    corpus = phonemize_corpus()
+
+    for _ in range(args.warmup):
+        acoustic_pass(synthesizer, corpus[0][1])
+
+    metrics = {}
+    for category in TEST_TEXTS:
+        latencies, rtfs = [], []
+        for _ in range(args.repeats):
+            for text_category, phonemes in corpus:
+                if text_category != category:
+                    continue
+                with Timer(sync) as timer:
+                    mels = acoustic_pass(synthesizer, phonemes)
+                latencies.append(timer.ms)
+                rtfs.append(timer.ms / 1000 / mel_seconds(synthesizer, mels))
+        metrics.update(summarize(latencies, f"acoustic/{category}/latency", "_ms"))
+        metrics.update(summarize(rtfs, f"acoustic/{category}/rtf"))
+
+    metrics["peak_rss_mb"] = peak_rss_mb()
+    metrics["peak_vram_mb"] = peak_vram_mb(device)
+    return metrics, {"device": device_name, "random_init": random_init}
+
+
+def bench_vocoder(args):
+    import numpy as np
+    import torch
+
+    device, device_name, sync = resolve_device(args.device)
+    synthesizer, random_init = load_tts(args, device)
+    # Vocoder inputs come from the acoustic model and are not timed
+    corpus = [(category, acoustic_pass(synthesizer, phonemes)) for category, phonemes in phonemize_corpus()]
+
+    def vocode(mels):
+        lengths = [mel.shape[1] for mel in mels]
+        batch = np.full((len(mels), mels[0].shape[0], max(lengths)), min(float(mel.min()) for mel in mels),
+                        dtype=np.float32)
+        for i, mel in enumerate(mels):
+            batch[i, :, :mel.shape[1]] = mel
+        with torch.no_grad():
+            return synthesizer.vocoder_model.inference(torch.from_numpy(batch).to(device))
+
+    for _ in range(args.warmup):
+        vocode(corpus[0][1])
+
+    metrics = {}
+    for category in TEST_TEXTS:
+        latencies, rtfs = [], []
+        for _ in range(args.repeats):
+            for text_category, mels in corpus:
+                if text_category != category:
+                    continue
+                with Timer(sync) as timer:
+                    vocode(mels)
+                latencies.append(timer.ms)
+                rtfs.append(timer.ms / 1000 / mel_seconds(synthesizer, mels))
+        metrics.update(summarize(latencies, f"vocoder/{category}/latency", "_ms"))
+        metrics.update(summarize(rtfs, f"vocoder/{category}/rtf"))
+
+    # Batched vocoding, as done by tts_batching.synthesize_batch
+    sentences = [mel for _, mels in corpus for mel in mels]
+    for batch_size in args.batch_sizes:
+        with Timer(sync) as timer:
+            for _ in range(args.repeats):
+                for start in range(0, len(sentences), batch_size):
+                    vocode(sentences[start:start + batch_size])
+        audio = mel_seconds(synthesizer, sentences) * args.repeats
+        metrics[f"vocoder/batch{batch_size}/sentences_per_sec"] = round(
+            len(sentences) * args.repeats / (timer.ms / 1000), 2)
+        metrics[f"vocoder/batch{batch_size}/rtf"] = round(timer.ms / 1000 / audio, 4)
+
+    metrics["peak_rss_mb"] = peak_rss_mb()
+    metrics["peak_vram_mb"] = peak_vram_mb(device)
+    return metrics, {"device": device_name, "random_init": random_init}
+
+
+def bench_tts(args):
+    from tts_batching import BatchScheduler, synthesize_batch
+
+    device, device_name, sync = resolve_device(args.device)
+    synthesizer, random_init = load_tts(args, device)
+    corpus = phonemize_corpus()
+    sample_rate = synthesizer.output_sample_rate
+
+    for _ in range(args.warmup):
+        synthesizer.tts(corpus[0][1])
+
+    metrics = {}
+    for category in TEST_TEXTS:
+        latencies, rtfs = [], []
+        for _ in range(args.repeats):
+            for text_category, phonemes in corpus:
+                if text_category != category:
+                    continue
+                with Timer(sync) as timer:
+                    wav = synthesizer.tts(phonemes)
+                latencies.append(timer.ms)
+                rtfs.append(timer.ms / 1000 / (len(wav) / sample_rate))
+        metrics.update(summarize(latencies, f"tts/{category}/latency", "_ms"))
+        metrics.update(summarize(rtfs, f"tts/{category}/rtf"))
+
+    # Concurrent clients go through the same batch scheduler as the server
+    scheduler = BatchScheduler(
+        lambda texts: synthesize_batch(synthesizer, texts),
+        max_batch_size=args.batch_size,
+        max_wait_ms=args.batch_window_ms,
+        name="bench"
+    )
+    phonemes = [phonemes for _, phonemes in corpus]
+    for concurrency in args.concurrency:
+        run = run_concurrent(scheduler.run_sync, phonemes, concurrency, args.repeats)
+        metrics.update(summarize(run["latencies_ms"], f"tts/c{concurrency}/latency", "_ms"))
+        metrics[f"tts/c{concurrency}/throughput_per_sec"] = round(run["throughput_per_sec"], 3)
+
+    metrics["peak_rss_mb"] = peak_rss_mb()
+    metrics["peak_vram_mb"] = peak_vram_mb(device)
+    return metrics, {"device": device_name, "random_init": random_init}
+
+
+def bench_vc(args):
+    import os
+    import torch
+
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "vc"))
+    from vc.resample import load_audio
+    from vc.voice_converter import VoiceConverter
+
+    if not os.path.exists(args.checkpoint):
+        # Whisper, CAMPPlus and BigVGAN come from pretrained downloads, so the
+        # VC stack has no random-weight fallback
+        raise SystemExit(f"VC checkpoint not found: {args.checkpoint}")
+
+    device, device_name, sync = resolve_device(args.device)
+    converter = VoiceConverter(args.checkpoint, args.config, device=torch.device(device),
+                               backend=args.backend, export_dir=args.export_dir, backend_threads=args.threads,
+                               precision=args.precision)
+    source = load_audio(args.source, converter.sr)
+    source_seconds = len(source) / converter.sr
+    convert_kwargs = dict(diffusion_steps=args.steps, inference_cfg_rate=args.cfg_rate,
+                          solver=args.solver, t_schedule=args.t_schedule)
+
+    @torch.inference_mode()
+    def cfm(cond, reference, converter=converter):
+        mel2 = reference["mel2"]
+        cat_condition = torch.cat([reference["prompt_condition"], cond], dim=1)
+        with converter.autocast():
+            target = converter.model.cfm.inference(
+                cat_condition, torch.LongTensor([cat_condition.size(1)]).to(mel2.device),
+                mel2, reference["style2"], None, args.steps,
+                inference_cfg_rate=args.cfg_rate, solver=args.solver, t_schedule=args.t_schedule)
+        return target[:, :, mel2.size(-1):]
+
+    @torch.inference_mode()
+    def vocode(mel):
+        return converter.vocoder_fn(mel.float())
+
+    for _ in range(args.warmup):
+        converter.convert_waveform(source, converter.sr, args.reference, **convert_kwargs)
+
+    stages = {name: [] for name in ("reference_cold", "reference_warm", "source_condition", "cfm", "vocoder", "total")}
+    for _ in range(args.repeats):
+        converter.ref_cache.clear()
+        with Timer(sync) as timer:
+            reference = converter.get_reference_features(args.reference)
+        stages["reference_cold"].append(timer.ms)
+        with Timer(sync) as timer:
+            reference = converter.get_reference_features(args.reference)
+        stages["reference_warm"].append(timer.ms)
+        with Timer(sync) as timer:
+            cond = converter.get_source_condition(source, converter.sr)
+        stages["source_condition"].append(timer.ms)
+        with Timer(sync) as timer:
+            mel = cfm(cond, reference)
+        stages["cfm"].append(timer.ms)
+        with Timer(sync) as timer:
+            vocode(mel)
+        stages["vocoder"].append(timer.ms)
+        with Timer(sync) as timer:
+            converter.convert_waveform(source, converter.sr, args.reference, **convert_kwargs)
+        stages["total"].append(timer.ms)
+
+    metrics = {}
+    for stage, latencies in stages.items():
+        metrics.update(summarize(latencies, f"vc/{stage}/latency", "_ms"))
+    metrics.update(summarize([ms / 1000 / source_seconds for ms in stages["total"]], "vc/total/rtf"))
+    for name, size_mb in converter.footprint_mb().items():
+        metrics[f"vc/footprint/{name}_mb"] = round(size_mb, 2)
+
+    if args.accuracy and converter.precision != "fp32":
+        # Same source, reference and diffusion noise through an fp32 converter
+        reference_converter = VoiceConverter(args.checkpoint, args.config, device=torch.device(device),
+                                             precision="fp32")
+
+        def final_mel(conv):
+            cond = conv.get_source_condition(source, conv.sr)
+            reference = conv.get_reference_features(args.reference)
+            torch.manual_seed(0)
+            return cfm(cond, reference, conv).float().cpu()
+
+        expected, actual = final_mel(reference_converter), final_mel(converter)
+        frames = min(expected.size(-1), actual.size(-1))
+        expected, actual = expected[..., :frames], actual[..., :frames]
+        metrics["vc/accuracy/mel_l1"] = (actual - expected).abs().mean().item()
+        metrics["vc/accuracy/mel_rel_err"] = ((actual - expected).norm() / expected.norm()).item()
+
+    metrics["peak_rss_mb"] = peak_rss_mb()
+    metrics["peak_vram_mb"] = peak_vram_mb(device)
+    return metrics, {"device": device_name, "backend": args.backend, "precision": converter.precision,
+                     "source_seconds": round(source_seconds, 2)}
+
+
+def bench_http(args):
+    import threading
+    import httpx
+
+    texts = [text for _, text in all_texts()]
+    local = threading.local()
+
+    def client():
+        if not hasattr(local, "client"):
+            local.client = httpx.Client(base_url=args.url, timeout=args.timeout)
+        return local.client
+
+    counter = iter(range(sys.maxsize))
+
+    def request(text):
+        if args.cache_bust:
+            # A trailing number makes every request miss the result cache
+            text = f"{text} {next(counter)}"
+        response = client().post("/synthesize", json={"text": text, "voice": args.voice})
+        response.raise_for_status()
+        with wave.open(io.BytesIO(response.content)) as wav:
+            return wav.getnframes() / wav.getframerate()
+
+    for _ in range(args.warmup):
+        request(texts[0])
+
+    metrics = {}
+    for concurrency in args.concurrency:
+        durations = []
+
+        def timed_request(text):
+            durations.append(request(text))
+
+        run = run_concurrent(timed_request, texts, concurrency, args.repeats)
+        metrics.update(summarize(run["latencies_ms"], f"http/c{concurrency}/latency", "_ms"))
+        metrics[f"http/c{concurrency}/throughput_per_sec"] = round(run["throughput_per_sec"], 3)
+        # Latencies and durations are not paired under concurrency, so RTF is
+        # reported over the whole run
+        metrics[f"http/c{concurrency}/rtf"] = round(
+            sum(run["latencies_ms"]) / 1000 / sum(durations), 4) if sum(durations) else 0.0
+    return metrics, {"device": f"server at {args.url}"}
+
+
+SUITES = {
+    "frontend": bench_frontend,
+    "acoustic": bench_acoustic,
+    "vocoder": bench_vocoder,
+    "tts": bench_tts,
+    "vc": bench_vc,
+    "http": bench_http,
+}
+
+
+# ---------------------------
+# Command line
+# ---------------------------
+
+def check_regressions(baseline, report, tolerance, ignore):
+    rows = compare_reports(baseline, report, tolerance, ignore)
+    print_comparison(rows)
+    regressions = [row["name"] for row in rows if row["regressed"]]
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {tolerance:.0%}")
+        return 1
+    print(f"\nNo regressions beyond {tolerance:.0%}")
+    return 0
+
+
+def add_compare_args(parser):
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed relative change in the wrong direction (default 0.10)")
+    parser.add_argument("--ignore", nargs="*", default=[],
+                        help="Skip metrics whose name contains any of these strings (e.g. peak_)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="suite", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--repeats", type=int, default=5, help="Passes over the benchmark corpus")
+    common.add_argument("--warmup", type=int, default=1)
+    common.add_argument("--json", help="Write the report to this file")
+    common.add_argument("--baseline", help="Compare against this report and exit 1 on regressions")
+    add_compare_args(common)
+
+    models = argparse.ArgumentParser(add_help=False)
+    models.add_argument("--device", default="auto", choices=["auto", "cpu", "cuda"])
+    models.add_argument("--seed", type=int, default=0)
+    models.add_argument("--tts-checkpoint", default="models/dinithi.pth")
+    models.add_argument("--tts-config", default="models/dinithi.json")
+    models.add_argument("--vocoder-checkpoint", default="models/dinithi_vocoder.pth")
+    models.add_argument("--vocoder-config", default="models/dinithi_vocoder.json")
+    models.add_argument("--max-decoder-steps", type=int,
+                        help="Cap Tacotron2 decoding (defaults to 400 with random weights)")
+
+    frontend = subparsers.add_parser("frontend", parents=[common], help="Abbreviations, numbers and G2P")
+    frontend.set_defaults(repeats=200)
+    frontend.add_argument("--cold", action="store_true", help="Clear the word memos before every call")
+    frontend.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+
+    subparsers.add_parser("acoustic", parents=[common, models], help="Tacotron2 only")
+
+    vocoder = subparsers.add_parser("vocoder", parents=[common, models], help="HiFi-GAN only")
+    vocoder.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4])
+
+    tts = subparsers.add_parser("tts", parents=[common, models], help="In-process synthesis with batching")
+    tts.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    tts.add_argument("--batch-size", type=int, default=4)
+    tts.add_argument("--batch-window-ms", type=float, default=15.0)
+
+    vc = subparsers.add_parser("vc", parents=[common], help="Voice conversion stages")
+    vc.add_argument("--device", default="auto", choices=["auto", "cpu", "cuda"])
+    vc.add_argument("--source", default="voices/test_default.mp3")
+    vc.add_argument("--reference", default="voices/jerry.mp3")
+    vc.add_argument("--checkpoint", default="vc/checkpoints/Indic-seed-uvit-whisper-small-wavenet.pth")
+    vc.add_argument("--config", default="vc/checkpoints/config_dit_mel_seed_uvit_whisper_small_wavenet.yml")
+    vc.add_argument("--steps", type=int, default=5)
+    vc.add_argument("--solver", default="euler")
+    vc.add_argument("--t-schedule", default="uniform")
+    vc.add_argument("--cfg-rate", type=float, default=0.7)
+    vc.add_argument("--backend", default="eager", choices=["eager", "torchscript", "onnx"],
+                    help="Run the estimator, CAMPPlus and vocoder from graphs exported by vc/export.py")
+    vc.add_argument("--export-dir", default="vc/exported")
+    vc.add_argument("--threads", type=int, help="ONNX Runtime intra-op threads")
+    vc.add_argument("--precision", choices=["fp32", "fp16", "bf16", "int8-dynamic"],
+                    help="Default: fp16 on GPU, fp32 on CPU")
+    vc.add_argument("--accuracy", action="store_true",
+                    help="Also report the final mel's error against an fp32 converter")
+
+    http = subparsers.add_parser("http", parents=[common], help="End-to-end /synthesize against a running server")
+    http.add_argument("--url", default="http://localhost:8000")
+    http.add_argument("--voice", default="dinithi")
+    http.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    http.add_argument("--timeout", type=float, default=120.0)
+    http.add_argument("--cache-bust", action="store_true",
+                      help="Make every request unique so the server's result cache is bypassed")
+
+    compare = subparsers.add_parser("compare", help="Diff two reports; exit 1 on regressions")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    add_compare_args(compare)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.suite == "compare":
+        return check_regressions(load_report(args.baseline), load_report(args.current),
+                                 args.tolerance, args.ignore)
+
+    metrics, env = SUITES[args.suite](args)
+    config = {key: value for key, value in vars(args).items()
+              if key not in ("json", "baseline", "tolerance", "ignore")}
+    report = make_report(args.suite, environment(**env), config, metrics)
+
+    print(f"\n{args.suite.upper()} on {report['environment']['device']}")
+    print("=" * 60)
+    print_metrics(metrics)
+
+    if args.json:
+        write_report(report, args.json)
+        print(f"\nReport written to {args.json}")
+    if args.baseline:
+        print()
+        return check_regressions(load_report(args.baseline), report, args.tolerance, args.ignore)
+    return 0
 
-def run_performance_test():
-    """Run comprehensive performance tests"""
-    print("Starting TTS Performance Measurement")
-    print("=" * 50)
-    
-    # Warm up the model
-    warm_up_time = warm_up_model()
-    print()
-    
-    results = {}
-    
-    for category, texts in TEST_TEXTS.items():
-        print(f"Testing {category.upper()} texts...")
-        category_results = []
-        
-        for i, text in enumerate(texts, 1):
-            print(f"  Processing {category} text {i}/{len(texts)}: {text[:50]}...")
-            
-            # Run multiple iterations for more stable measurements
-            iterations = 3 if category == "long" else 5
-            iteration_results = []
-            
-            for j in range(iterations):
-                result = measure_inference_time(text)
-                iteration_results.append(result)
-            
-            # Average the iterations
-            avg_result = {
-                'preprocess_time': statistics.mean([r['preprocess_time'] for r in iteration_results]),
-                'tts_time': statistics.mean([r['tts_time'] for r in iteration_results]),
-                'total_time': statistics.mean([r['total_time'] for r in iteration_results]),
-                'audio_duration': statistics.mean([r['audio_duration'] for r in iteration_results]),
-                'rtf': statistics.mean([r['rtf'] for r in iteration_results]),
-                'text_length': iteration_results[0]['text_length'],
-                'phoneme_length': iteration_results[0]['phoneme_length']
-            }
-            
-            category_results.append(avg_result)
-        
-        results[category] = category_results
-        print(f"Completed {category} texts\n")
-    
-    return results
-
-def calculate_statistics(results):
-    """Calculate comprehensive statistics"""
-    stats = {}
-    
-    for category, category_results in results.items():
-        stats[category] = {
-            'count': len(category_results),
-            'avg_preprocess_time': statistics.mean([r['preprocess_time'] for r in category_results]),
-            'avg_tts_time': statistics.mean([r['tts_time'] for r in category_results]),
-            'avg_total_time': statistics.mean([r['total_time'] for r in category_results]),
-            'avg_audio_duration': statistics.mean([r['audio_duration'] for r in category_results]),
-            'avg_rtf': statistics.mean([r['rtf'] for r in category_results]),
-            'avg_text_length': statistics.mean([r['text_length'] for r in category_results]),
-            'avg_phoneme_length': statistics.mean([r['phoneme_length'] for r in category_results]),
-            'min_total_time': min([r['total_time'] for r in category_results]),
-            'max_total_time': max([r['total_time'] for r in category_results]),
-            'std_total_time': statistics.stdev([r['total_time'] for r in category_results]) if len(category_results) > 1 else 0
-        }
-    
-    return stats
-
-def print_performance_report(stats):
-    """Print a detailed performance report"""
-    print("PERFORMANCE REPORT USING RTX 3050 GPU")
-    print("=" * 80)
-    
-    print(f"{'Category':<10} {'Count':<6} {'Avg Time':<10} {'Avg RTF':<10} {'Text Len':<10} {'Audio Dur':<10}")
-    print("-" * 80)
-    
-    for category, data in stats.items():
-        print(f"{category.capitalize():<10} "
-              f"{data['count']:<6} "
-              f"{data['avg_total_time']:.3f}s{'':<4} "
-              f"{data['avg_rtf']:.3f}{'':<6} "
-              f"{data['avg_text_length']:.0f}{'':<6} "
-              f"{data['avg_audio_duration']:.2f}s{'':<5}")
-    
-    print("\nDETAILED BREAKDOWN")
-    print("=" * 80)
-    
-    for category, data in stats.items():
-        print(f"\n{category.upper()} TEXTS:")
-        print(f"Average text length: {data['avg_text_length']:.0f} characters")
-        print(f"Average phoneme count: {data['avg_phoneme_length']:.0f}")
-        print(f"Average preprocessing: {data['avg_preprocess_time']:.3f}s")
-        print(f"Average TTS inference: {data['avg_tts_time']:.3f}s")
-        print(f"Average total time: {data['avg_total_time']:.3f}s")
-        print(f"Average audio duration: {data['avg_audio_duration']:.2f}s")
-        print(f"Average RTF: {data['avg_rtf']:.3f}")
-        print(f"Time range: {data['min_total_time']:.3f}s - {data['max_total_time']:.3f}s")
-        print(f"Standard deviation: {data['std_total_time']:.3f}s")
-
-def main():
-    """Main performance testing function"""
-    try:
-        results = run_performance_test()
-        stats = calculate_statistics(results)
-        print_performance_report(stats)
-        
-        # Overall summary
-        all_times = []
-        all_rtfs = []
-        for category_results in results.values():
-            all_times.extend([r['total_time'] for r in category_results])
-            all_rtfs.extend([r['rtf'] for r in category_results])
-        
-        print(f"\nOVERALL SUMMARY")
-        print("=" * 50)
-        print(f"Total tests run: {len(all_times)}")
-        print(f"Overall average time: {statistics.mean(all_times):.3f}s")
-        print(f"Overall average RTF: {statistics.mean(all_rtfs):.3f}")
-        print(f"Best RTF: {min(all_rtfs):.3f}")
-        print(f"Worst RTF: {max(all_rtfs):.3f}")
-        
-    except Exception as e:
-        print(f"Error during performance testing: {e}")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+Content-addressed cache for synthesized audio.
+
+Results are keyed on the normalized phoneme string, the voice and a
+fingerprint of the model files, so a repeated prompt skips TTS and voice
+conversion entirely. There is an in-memory LRU tier and an optional
+size-bounded on-disk tier. Concurrent requests for the same key share one
+computation.
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+def model_fingerprint(paths, extra=""):
+    """
+    Return a short checksum identifying a set of model files.
+
+    Each file contributes its size plus its first and last MiB, which changes
+    whenever a checkpoint is replaced without hashing gigabytes at startup.
+    Missing files are recorded as such.
+    """
+    digest = hashlib.sha256(extra.encode())
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        if not os.path.exists(path):
+            digest.update(b"missing")
+            continue
+        size = os.path.getsize(path)
+        digest.update(str(size).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read(1 << 20))
+            if size > 2 << 20:
+                f.seek(-(1 << 20), os.SEEK_END)
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    Two-tier LRU cache of audio bytes with single-flight computation.
+
+    Args:
+        max_items (int): Entries kept in memory.
+        cache_dir (str): Directory for the disk tier, or None to disable it.
+        max_disk_bytes (int): Size bound of the disk tier.
+    """
+
+    def __init__(self, max_items=128, cache_dir=None, max_disk_bytes=512 * 1024 * 1024):
+        self.max_items = max_items
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._disk = OrderedDict()  # key -> size, oldest first
+        self._disk_bytes = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.bytes_served = 0
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._load_disk_index()
+
+    @staticmethod
+    def make_key(phonemes, voice, model_version):
+        return hashlib.sha256(f"{model_version}\0{voice}\0{phonemes}".encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    def _load_disk_index(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".wav"):
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def get(self, key):
+        """Return cached bytes for ``key`` or None, updating hit statistics."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                value = self._memory[key]
+                self.memory_hits += 1
+                self.bytes_served += len(value)
+                return value
+            on_disk = key in self._disk
+
+        if on_disk:
+            try:
+                with open(self._disk_path(key), "rb") as f:
+                    value = f.read()
+                os.utime(self._disk_path(key))
+            except OSError:
+                value = None
+            if value is not None:
+                with self._lock:
+                    if key in self._disk:
+                        self._disk.move_to_end(key)
+                    self.disk_hits += 1
+                    self.bytes_served += len(value)
+                    self._remember(key, value)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """Store bytes in memory and, if enabled, on disk."""
+        with self._lock:
+            self._remember(key, value)
+        if not self.cache_dir or len(value) > self.max_disk_bytes:
+            return
+
+        tmp_path = self._disk_path(key) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(value)
+        os.replace(tmp_path, self._disk_path(key))
+
+        evicted = []
+        with self._lock:
+            self._disk_bytes -= self._disk.pop(key, 0)
+            self._disk[key] = len(value)
+            self._disk_bytes += len(value)
+            while self._disk_bytes > self.max_disk_bytes and self._disk:
+                old_key, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                os.remove(self._disk_path(old_key))
+            except OSError:
+                pass
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    async def get_or_compute(self, key, compute):
+        """
+        Return cached bytes for ``key``, or await ``compute()`` to produce them.
+
+        ``compute`` is an async callable returning ``(audio_bytes, cacheable)``.
+        Concurrent callers with the same key wait for the first one's result.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+            else:
+                self.shared += 1
+
+        if not owner:
+            return await asyncio.wrap_future(future)
+
+        try:
+            value, cacheable = await compute()
+            if cacheable:
+                self.put(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def clear(self):
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            keys = list(self._disk)
+            self._disk.clear()
+            self._disk_bytes = 0
+        for key in keys:
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "shared": self.shared,
+                "hit_ratio": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "bytes_served": self.bytes_served,
+                "memory_items": len(self._memory),
+                "disk_items": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
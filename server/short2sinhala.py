@@ -1,6 +1,10 @@
 import re
 from typing import Dict
 
+# Pattern to match time with පෙ.ව. or ප.ව. (e.g., "2.30ට පෙ.ව." or "පෙ.ව. 8.00ට")
+TIME_PATTERN = r'(\d{1,2})\.(\d{2})([^\s]*)\s*(පෙ\.ව\.|ප\.ව\.)|((පෙ\.ව\.|ප\.ව\.)\s*(\d{1,2})\.(\d{2})([^\s]*))'
+TIME_REGEX = re.compile(TIME_PATTERN)
+
 class SinhalaAbbreviationConverter:
     def __init__(self):
         self.abbreviations: Dict[str, str] = {
@@ -9,69 +13,73 @@ class SinhalaAbbreviationConverter:
             "ප.ව.": "පස්වරු",
             "$": "ඩොලර්"
         }
+        # All abbreviations in one alternation, longest first
+        self.abbreviation_regex = re.compile("|".join(
+            re.escape(abbrev) for abbrev in sorted(self.abbreviations, key=len, reverse=True)
+        ))
+        # Time formats first, then any abbreviation, in a single scan
+        self.combined_regex = re.compile(f"{TIME_PATTERN}|(?P<abbrev>{self.abbreviation_regex.pattern})")
     
-    def convert_time_format(self, text: str) -> str:
-        """Convert time formats with පෙ.ව. or ප.ව."""
-        # Pattern to match time with පෙ.ව. or ප.ව. (e.g., "2.30ට පෙ.ව." or "පෙ.ව. 8.00ට")
-        time_pattern = r'(\d{1,2})\.(\d{2})([^\s]*)\s*(පෙ\.ව\.|ප\.ව\.)|((පෙ\.ව\.|ප\.ව\.)\s*(\d{1,2})\.(\d{2})([^\s]*))'
+    def expand_abbreviations(self, text: str) -> str:
+        """Replace every abbreviation with its full form"""
+        return self.abbreviation_regex.sub(lambda m: self.abbreviations[m.group()], text)
+
+    def replace_time(self, match, expand_suffix: bool = False) -> str:
+        """
+        Spell out one TIME_PATTERN match. With ``expand_suffix`` any
+        abbreviation inside the suffix glued to the time is expanded too.
+        """
+        if match.group(1):  # Time before පෙ.ව./ප.ව.
+            hour = match.group(1)
+            minute = match.group(2)
+            suffix = match.group(3) or ""
+            period = match.group(4)
+        else:  # පෙ.ව./ප.ව. before time
+            period = match.group(6)
+            hour = match.group(7)
+            minute = match.group(8)
+            suffix = match.group(9) or ""
         
-        def replace_time(match):
-            if match.group(1):  # Time before පෙ.ව./ප.ව.
-                hour = match.group(1)
-                minute = match.group(2)
-                suffix = match.group(3) or ""
-                period = match.group(4)
-            else:  # පෙ.ව./ප.ව. before time
-                period = match.group(6)
-                hour = match.group(7)
-                minute = match.group(8)
-                suffix = match.group(9) or ""
-            
-            # Convert period abbreviation
-            period_full = self.abbreviations.get(period, period)
-            
-            # Handle time format
-            if minute == "00":
-                # Remove .00, just keep the hour
-                if match.group(1):  # Time before period
-                    return f"{hour}{suffix} {period_full}"
-                else:  # Period before time
-                    return f"{period_full} {hour}{suffix}"
-            else:
-                # Replace dot with යි when minutes are not zero
-                if match.group(1):  # Time before period
-                    return f"{hour} යි {minute}{suffix} {period_full}"
-                else:  # Period before time
-                    return f"{period_full} {hour} යි {minute}{suffix}"
+        if expand_suffix:
+            suffix = self.expand_abbreviations(suffix)
+
+        # Convert period abbreviation
+        period_full = self.abbreviations.get(period, period)
         
-        return re.sub(time_pattern, replace_time, text)
+        # Handle time format
+        if minute == "00":
+            # Remove .00, just keep the hour
+            if match.group(1):  # Time before period
+                return f"{hour}{suffix} {period_full}"
+            else:  # Period before time
+                return f"{period_full} {hour}{suffix}"
+        else:
+            # Replace dot with යි when minutes are not zero
+            if match.group(1):  # Time before period
+                return f"{hour} යි {minute}{suffix} {period_full}"
+            else:  # Period before time
+                return f"{period_full} {hour} යි {minute}{suffix}"
+
+    def convert_time_format(self, text: str) -> str:
+        """Convert time formats with පෙ.ව. or ප.ව."""
+        return TIME_REGEX.sub(self.replace_time, text)
     
     def convert(self, text: str) -> str:
         """Convert abbreviations in Sinhala text to their full forms"""
-        # First handle time formats
-        result = self.convert_time_format(text)
-        
-        # Then handle remaining abbreviations that weren't part of time formats
-        sorted_abbrevs = sorted(self.abbreviations.items(), key=lambda x: len(x[0]), reverse=True)
-        
-        for abbrev, full_form in sorted_abbrevs:
-            if abbrev == "$":
-                result = result.replace(abbrev, full_form)
-            elif abbrev not in ["පෙ.ව.", "ප.ව."]:  # Skip time periods as they're already handled
-                pattern = re.escape(abbrev)
-                result = re.sub(pattern, full_form, result)
-            else:
-                # Handle standalone පෙ.ව./ප.ව. that aren't part of time
-                # Simple replacement for remaining instances not caught by time conversion
-                if abbrev in result:
-                    result = result.replace(abbrev, full_form)
-        
-        return result
+        def dispatch(match):
+            if match.group("abbrev"):
+                return self.abbreviations[match.group("abbrev")]
+            return self.replace_time(match, expand_suffix=True)
+
+        return self.combined_regex.sub(dispatch, text)
+
+
+# Built once; the converter is stateless
+converter = SinhalaAbbreviationConverter()
 
 
 def short_convert(text: str) -> str:
     """Convert abbreviations in a Sinhala text to full forms"""
-    converter = SinhalaAbbreviationConverter()
     return converter.convert(text)
 
 
@@ -0,0 +1,77 @@
+"""
+Helpers for streaming synthesized audio sentence by sentence.
+"""
+
+import re
+import struct
+
+from fastapi.responses import StreamingResponse
+
+# Sentence ends: full stop, question/exclamation marks, Sinhala kunddaliya, newlines
+SENTENCE_PATTERN = re.compile(r"[^.!?෴\n]+(?:[.!?෴]+|\n+|$)")
+# Clause separators used to break up over-long sentences
+CLAUSE_PATTERN = re.compile(r"[^,;:]+(?:[,;:]+|$)")
+
+# Streaming WAV headers can't know the final size; 0xFFFFFFFF is the
+# conventional "unknown length" marker understood by browsers and ffmpeg.
+UNKNOWN_SIZE = 0xFFFFFFFF
+
+
+def split_sentences(text: str, max_chars: int = 200) -> list:
+    """
+    Split normalized text into sentences, breaking sentences longer than
+    ``max_chars`` at clause separators. Empty pieces are dropped.
+    """
+    pieces = []
+    for match in SENTENCE_PATTERN.finditer(text):
+        sentence = match.group().strip()
+        if not sentence:
+            continue
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        for clause in CLAUSE_PATTERN.finditer(sentence):
+            clause = clause.group().strip()
+            if clause:
+                pieces.append(clause)
+    return pieces
+
+
+def wav_stream_header(sample_rate: int, channels: int = 1, bits_per_sample: int = 16) -> bytes:
+    """Return a PCM WAV header with unknown (streaming) data length."""
+    byte_rate = sample_rate * channels * bits_per_sample // 8
+    block_align = channels * bits_per_sample // 8
+    return (
+        b"RIFF" + struct.pack("<I", UNKNOWN_SIZE) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, byte_rate, block_align, bits_per_sample)
+        + b"data" + struct.pack("<I", UNKNOWN_SIZE)
+    )
+
+
+def to_pcm16(wav) -> bytes:
+    """Convert a float waveform in [-1, 1] to little-endian 16-bit PCM bytes."""
+    import numpy as np
+
+    samples = np.clip(np.asarray(wav, dtype=np.float32), -1.0, 1.0)
+    return (samples * 32767).astype("<i2").tobytes()
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that runs ``on_close()`` once the response is done.
+
+    A generator's own ``finally`` only runs if it was started, so cleanup
+    placed there is skipped when the client disconnects or the send fails
+    before the first chunk is pulled. ``on_close`` runs however the
+    response ends, including when it is cancelled.
+    """
+
+    def __init__(self, content, on_close, **kwargs):
+        super().__init__(content, **kwargs)
+        self.on_close = on_close
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.on_close()
@@ -1,8 +1,6 @@
 from TTS.utils.synthesizer import Synthesizer
 
-from g2p import convert_text
-from num2sinhala import num_convert
-from short2sinhala import short_convert
+from text_frontend import TextFrontend
 import torch
 
 tts_path = "server/models/dinithi.pth"
@@ -20,11 +18,12 @@ synthesizer = Synthesizer(
     use_cuda=usecuda
 )
 
+text_frontend = TextFrontend()
+
 def tts(text):
-    text_with_shorts_converted = short_convert(text)
-    text_with_numbers_converted = num_convert(text_with_shorts_converted)
-    print(f"Text after number conversion: {text_with_numbers_converted}")
-    ph = convert_text(text_with_numbers_converted)
+    frontend_output = text_frontend.process(text, with_ids=False)
+    print(f"Text after number conversion: {frontend_output.normalized}")
+    ph = frontend_output.phonemes
 
     print(f"Phonemized text: {ph}")
 
@@ -26,6 +26,14 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def fresh_result_cache():
+    """Give each test an empty, memory-only result cache"""
+    from result_cache import ResultCache
+    with patch('main.result_cache', ResultCache()) as cache:
+        yield cache
+
+
 @pytest.fixture
 def mock_supabase():
     """Mock Supabase client"""
@@ -56,11 +64,12 @@ def mock_synthesizer():
 
 
 @pytest.fixture
-def mock_convert_text():
-    """Mock g2p convert_text function"""
-    with patch('main.convert_text') as mock_convert:
-        mock_convert.return_value = "fake phonemized text"
-        yield mock_convert
+def mock_text_frontend():
+    """Mock the text frontend (normalization + G2P)"""
+    with patch('main.text_frontend') as mock_frontend:
+        mock_frontend.process.return_value.phonemes = "fake phonemized text"
+        mock_frontend.phonemize.return_value = "fake phonemized text"
+        yield mock_frontend
 
 
 @pytest.fixture
@@ -1,4 +1,5 @@
 import pytest
+from unittest.mock import patch
 from fastapi.testclient import TestClient
 from main import app
 
@@ -22,6 +23,65 @@ class TestBasicEndpoints:
         assert response.headers["content-type"] == "application/json"
 
 
+
+@pytest.mark.unit
+class TestHealthEndpoints:
+    """Test liveness and readiness probes"""
+
+    def setup_method(self):
+        self.client = TestClient(app)
+
+    def test_healthz(self):
+        """Test that liveness doesn't depend on warmup"""
+        response = self.client.get("/healthz")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    @patch('main.warmup')
+    def test_readyz_before_warmup(self, mock_warmup):
+        """Test that a cold worker reports not ready"""
+        mock_warmup.ready = False
+        mock_warmup.status.return_value = {"state": "running"}
+
+        response = self.client.get("/readyz")
+
+        assert response.status_code == 503
+        assert response.json()["ready"] is False
+
+    @patch('main.model_registry')
+    @patch('main.warmup')
+    def test_readyz_after_warmup(self, mock_warmup, mock_registry):
+        """Test that a warmed worker with a usable TTS model reports ready"""
+        mock_warmup.ready = True
+        mock_warmup.status.return_value = {"state": "ready"}
+        mock_registry.available.return_value = True
+
+        response = self.client.get("/readyz")
+
+        assert response.status_code == 200
+        assert response.json() == {"ready": True, "warmup": {"state": "ready"}}
+
+@pytest.mark.unit
+class TestVoiceStatus:
+    """Test the custom voice feature status endpoint"""
+
+    def setup_method(self):
+        self.client = TestClient(app)
+
+    @patch('main.vc_available', return_value=True)
+    @patch('main.voice_store')
+    @patch('main.get_custom_voice', return_value={"url": "https://x/voice.wav"})
+    def test_poll_does_not_load_vc(self, mock_get_voice, mock_store, mock_available):
+        """Test that a status poll with no tracked job leaves the VC stack unloaded"""
+        import main
+        mock_store.peek.return_value = "cache/voices/voice.wav"
+
+        response = self.client.get("/user-voices/untracked-voice/status", params={"user_id": "test-user"})
+
+        assert response.status_code == 200
+        assert response.json() == {"voice_id": "untracked-voice", "status": "pending"}
+        assert not main.model_registry.is_loaded("vc")
+
 @pytest.mark.unit  
 class TestCORS:
     """Test CORS configuration"""
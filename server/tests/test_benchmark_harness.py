@@ -0,0 +1,51 @@
+import pytest
+from benchmarks.harness import compare_reports, make_report, percentile, run_concurrent, summarize
+
+
+def report(metrics):
+    return make_report("test", {"device": "cpu"}, {}, metrics)
+
+
+@pytest.mark.unit
+class TestBenchmarkHarness:
+    """Test latency statistics and baseline comparison used by performance.py"""
+
+    def test_percentile_interpolates(self):
+        """Test that percentiles interpolate between samples"""
+        values = [4.0, 1.0, 3.0, 2.0]
+        assert percentile(values, 0) == 1.0
+        assert percentile(values, 50) == 2.5
+        assert percentile(values, 100) == 4.0
+        assert percentile([], 99) == 0.0
+
+    def test_summarize_names_metrics(self):
+        """Test that summaries are flattened under the given prefix and unit"""
+        metrics = summarize([10.0, 20.0, 30.0], "acoustic/short/latency", "_ms")
+        assert metrics["acoustic/short/latency_p50_ms"] == 20.0
+        assert metrics["acoustic/short/latency_mean_ms"] == 20.0
+        assert set(metrics) == {f"acoustic/short/latency_{stat}_ms" for stat in ("p50", "p90", "p99", "mean")}
+
+    def test_compare_flags_regressions_by_direction(self):
+        """Test that slower latency and lower throughput regress, improvements don't"""
+        baseline = report({"a/latency_p99_ms": 100.0, "a/throughput_per_sec": 10.0, "a/rtf_p50": 0.5, "gone": 1.0})
+        current = report({"a/latency_p99_ms": 120.0, "a/throughput_per_sec": 8.0, "a/rtf_p50": 0.3, "new": 1.0})
+        rows = {row["name"]: row for row in compare_reports(baseline, current, tolerance=0.10)}
+
+        assert set(rows) == {"a/latency_p99_ms", "a/throughput_per_sec", "a/rtf_p50"}
+        assert rows["a/latency_p99_ms"]["regressed"]
+        assert rows["a/throughput_per_sec"]["regressed"]
+        assert not rows["a/rtf_p50"]["regressed"]
+        assert not compare_reports(baseline, current, tolerance=0.25)[0]["regressed"]
+        assert compare_reports(baseline, current, ignore=["a/"]) == []
+
+    def test_run_concurrent_counts_every_call(self):
+        """Test that every item is sent once per repeat and errors propagate"""
+        run = run_concurrent(lambda item: item, [1, 2, 3], concurrency=2, repeats=2)
+        assert len(run["latencies_ms"]) == 6
+        assert run["throughput_per_sec"] > 0
+
+        def fail(item):
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            run_concurrent(fail, [1], concurrency=1)
@@ -0,0 +1,189 @@
+import math
+import os
+import sys
+import pytest
+from types import SimpleNamespace
+
+torch = pytest.importorskip("torch")
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "vc"))
+flow_matching = pytest.importorskip("modules.flow_matching")
+
+
+class ExponentialDecay(torch.nn.Module):
+    """Toy estimator for dx/dt = -x, whose exact solution is x0 * exp(-t)"""
+
+    def forward(self, x, prompt_x, x_lens, t, style, mu):
+        return -x
+
+
+def make_cfm():
+    args = SimpleNamespace(DiT=SimpleNamespace(in_channels=1), reg_loss_type="l1")
+    cfm = flow_matching.BASECFM(args)
+    cfm.estimator = ExponentialDecay()
+    return cfm
+
+
+def solve(cfm, solver, steps, schedule="uniform"):
+    x = torch.ones(1, 1, 4, dtype=torch.float64)
+    t_span = flow_matching.make_t_span(steps, schedule).double()
+    args = (x, None, torch.zeros(1, 1, 0), torch.zeros(1, 1, 4), None, None, t_span, 0)
+    if solver == "euler":
+        return cfm.solve_euler(*args)
+    return cfm.solve_ode(*args, solver=solver)
+
+
+@pytest.mark.unit
+class TestFlowMatchingSolvers:
+    """Test the CFM ODE solvers and timestep schedules"""
+
+    def test_schedules_span_zero_to_one(self):
+        """Test that every schedule starts at noise and ends at data"""
+        for schedule in flow_matching.T_SCHEDULES:
+            t_span = flow_matching.make_t_span(8, schedule)
+            assert t_span[0].item() == 0 and abs(t_span[-1].item() - 1) < 1e-6
+            assert torch.all(t_span[1:] > t_span[:-1])
+
+    def test_higher_order_solvers_are_more_accurate(self):
+        """Test that each solver beats Euler at the same number of steps"""
+        cfm = make_cfm()
+        exact = math.exp(-1)
+        euler_error = abs(solve(cfm, "euler", 5)[0, 0, 0].item() - exact)
+        for solver in ("midpoint", "heun", "rk4", "dpm_multistep"):
+            error = abs(solve(cfm, solver, 5)[0, 0, 0].item() - exact)
+            assert error < euler_error, solver
+        assert abs(solve(cfm, "rk4", 5)[0, 0, 0].item() - exact) < 1e-5
+
+    def test_nfe_per_step(self):
+        """Test that solvers make the expected number of estimator calls"""
+        cfm = make_cfm()
+        for solver, per_step in [("euler", 1), ("midpoint", 2), ("heun", 2), ("rk4", 4), ("dpm_multistep", 1)]:
+            before = cfm.nfe
+            solve(cfm, solver, 4, schedule="cosine")
+            assert cfm.nfe - before == 4 * per_step, solver
+
+    def test_unknown_solver_rejected(self):
+        """Test that a typo in the solver name fails loudly"""
+        with pytest.raises(ValueError):
+            solve(make_cfm(), "rk5", 2)
+
+    def test_batched_prompts_of_different_lengths(self):
+        """Test that per-item prompt lengths keep each prompt region fixed at zero"""
+        cfm = make_cfm()
+        x = torch.ones(2, 1, 6, dtype=torch.float64)
+        prompt = torch.full((2, 1, 3), 5.0, dtype=torch.float64)
+        t_span = flow_matching.make_t_span(4).double()
+
+        out = cfm.solve_ode(x, torch.LongTensor([6, 5]), prompt, torch.zeros(2, 6, 4), None, None, t_span, 0,
+                            solver="heun", prompt_lens=torch.LongTensor([1, 3]))
+
+        assert torch.all(out[0, 0, :1] == 0) and torch.all(out[0, 0, 1:] > 0)
+        assert torch.all(out[1, 0, :3] == 0) and torch.all(out[1, 0, 3:] > 0)
+        assert torch.allclose(out[0, 0, 3:], out[1, 0, 3:])
+
+
+def make_dit_cfm():
+    """CFM around a tiny randomly initialized DiT with the production (wavenet) head"""
+    torch.manual_seed(0)
+    args = SimpleNamespace(
+        dit_type="DiT", reg_loss_type="l1",
+        DiT=SimpleNamespace(
+            depth=2, num_heads=2, hidden_dim=32, in_channels=8,
+            content_type="continuous", content_codebook_size=16, content_dim=12,
+            is_causal=False, final_layer_type="wavenet", style_condition=True,
+            class_dropout_prob=0.1, long_skip_connection=True, uvit_skip_connection=True,
+        ),
+        wavenet=SimpleNamespace(hidden_dim=16, kernel_size=5, dilation_rate=1, num_layers=2,
+                                p_dropout=0.0, style_condition=True),
+        style_encoder=SimpleNamespace(dim=6),
+    )
+    cfm = flow_matching.CFM(args).eval()
+    cfm.estimator.setup_caches(max_batch_size=1, max_seq_length=512)
+    return cfm
+
+
+@pytest.mark.unit
+class TestLengthBuckets:
+    """Test padding estimator inputs to length buckets"""
+
+    def test_bucket_ladder(self):
+        """Test that buckets grow geometrically and end at the context window"""
+        buckets = flow_matching.make_length_buckets(2580)
+
+        assert buckets[0] == 64 and buckets[-1] == 2580
+        assert all(b > a for a, b in zip(buckets, buckets[1:]))
+        assert all(b / a <= 1.3 for a, b in zip(buckets[:-2], buckets[1:-1]))
+        assert flow_matching.bucket_length(64, buckets) == 64
+        assert flow_matching.bucket_length(65, buckets) == buckets[1]
+        assert flow_matching.bucket_length(3000, buckets) == 3000
+
+    def test_padded_inference_matches_unpadded(self):
+        """Test that bucketed inference returns the unpadded result, noise included"""
+        cfm = make_dit_cfm()
+        mu = torch.randn(1, 70, 12)
+        prompt = torch.randn(1, 8, 20)
+        style = torch.randn(1, 6)
+        x_lens = torch.LongTensor([70])
+
+        torch.manual_seed(1)
+        expected = cfm.inference(mu, x_lens, prompt, style, None, 3, inference_cfg_rate=0.7)
+        cfm.length_buckets = (64, 96, 128)
+        torch.manual_seed(1)
+        actual = cfm.inference(mu, x_lens, prompt, style, None, 3, inference_cfg_rate=0.7)
+
+        assert actual.shape == expected.shape == (1, 8, 70)
+        torch.testing.assert_close(actual, expected, rtol=1e-4, atol=1e-4)
+
+    def test_length_mask(self):
+        """Test that the mask spans the padded width and reuses cached positions"""
+        diffusion_transformer = pytest.importorskip("modules.diffusion_transformer")
+        mask = diffusion_transformer.length_mask(torch.LongTensor([3, 5]), 6)
+
+        assert mask.tolist() == [[True] * 3 + [False] * 3, [True] * 5 + [False]]
+        assert diffusion_transformer.mask_positions(6, torch.device("cpu")) is \
+            diffusion_transformer.mask_positions(6, torch.device("cpu"))
+
+
+@pytest.mark.unit
+class TestEstimatorSession:
+    """Test precomputing the condition-only estimator work once per solve"""
+
+    def test_session_matches_forward(self):
+        """Test that a session step equals a full forward with the same conditions"""
+        estimator = make_dit_cfm().estimator
+        x, prompt_x = torch.randn(2, 8, 40), torch.randn(2, 8, 40)
+        x_lens, t = torch.LongTensor([40, 30]), torch.rand(2)
+        style, cond = torch.randn(2, 6), torch.randn(2, 40, 12)
+
+        with torch.no_grad():
+            expected = estimator(x, prompt_x, x_lens, t, style, cond)
+            actual = estimator.session(prompt_x, x_lens, style, cond)(x, t)
+
+        torch.testing.assert_close(actual, expected, rtol=1e-4, atol=1e-5)
+
+    def test_session_with_unsplittable_merge_layer(self):
+        """Test the fallback when the input merge isn't a plain Linear (e.g. quantized)"""
+        estimator = make_dit_cfm().estimator
+        x, prompt_x = torch.randn(1, 8, 24), torch.randn(1, 8, 24)
+        x_lens, t = torch.LongTensor([24]), torch.rand(1)
+        style, cond = torch.randn(1, 6), torch.randn(1, 24, 12)
+        with torch.no_grad():
+            expected = estimator(x, prompt_x, x_lens, t, style, cond)
+            estimator.cond_x_merge_linear = torch.nn.Sequential(estimator.cond_x_merge_linear)
+            actual = estimator.session(prompt_x, x_lens, style, cond)(x, t)
+
+        torch.testing.assert_close(actual, expected, rtol=1e-5, atol=1e-6)
+
+    @pytest.mark.parametrize("solver", ["euler", "heun"])
+    def test_inference_matches_per_call_path(self, solver):
+        """Test that solves with and without a session agree"""
+        cfm = make_dit_cfm()
+        mu, prompt, style = torch.randn(1, 50, 12), torch.randn(1, 8, 15), torch.randn(1, 6)
+        x_lens = torch.LongTensor([50])
+
+        outputs = []
+        for use_session in (False, True):
+            cfm.use_estimator_session = use_session
+            torch.manual_seed(2)
+            outputs.append(cfm.inference(mu, x_lens, prompt, style, None, 3, inference_cfg_rate=0.7, solver=solver))
+
+        torch.testing.assert_close(outputs[1], outputs[0], rtol=1e-4, atol=1e-4)
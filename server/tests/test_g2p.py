@@ -1,5 +1,8 @@
+import random
 import pytest
 from g2p import convert_text, VOWEL_SIGNS, INDEP_VOWELS, CONS_MAP, SPECIAL_SIGNS
+from g2p import (convert_text_reference, word_to_ipa, sinhala_to_ipa, compiled_apply_rules, apply_all_rules,
+                 VIRAMA, ZWJ)
 
 
 @pytest.mark.unit
@@ -115,4 +118,37 @@ class TestG2PConversion:
     def test_convert_numeric_input(self):
         """Test conversion with numeric input"""
         with pytest.raises((TypeError, AttributeError)):
-            convert_text(123)
\ No newline at end of file
+            convert_text(123)
+
+@pytest.mark.unit
+class TestCompiledG2P:
+    """Test that the compiled, memoized G2P matches the reference implementation"""
+
+    SENTENCES = [
+        "මෛත‍්‍රී පාලනයක්' හදන්න ඇවිල්ලා අද මේ අය ගෙන යන්නේ තුච්ඡ, නින්දිත පාලනයක්",
+        "මං වතුපිටිවල ඉස්පිරිත‍ාලෙ ළඟ ආයතනයක වැඩ කරනවා පරිගණක නිලධාරිනියක් හැටියට.",
+        "\"ශ්‍රී ලංකා\" කියන රටේ නාමය ලොව පුරා ප්‍රසිද්ධයි. අපේ ක්‍යාලේජ් ළමයි",
+        "කුමරු කාර්යං කරලා ගියේ නාගරික මණ්ඩපය. කලාව කලේ ක්‍රියාත්මක",
+    ]
+
+    def test_sentences_match_reference(self):
+        """Test known sentences against the reference converter"""
+        for sentence in self.SENTENCES:
+            assert convert_text(sentence) == convert_text_reference(sentence)
+
+    def test_random_words_match_reference(self):
+        """Test random grapheme sequences, including malformed ones"""
+        rng = random.Random(0)
+        alphabet = (list(CONS_MAP) * 4 + list(VOWEL_SIGNS) * 2 + [VIRAMA] * 6 + [ZWJ] * 3
+                    + ["ර", "ය"] * 4 + list(INDEP_VOWELS) + list(SPECIAL_SIGNS) + list("a.,1'"))
+        for _ in range(20000):
+            word = "".join(rng.choices(alphabet, k=rng.randint(1, 9)))
+            assert word_to_ipa.__wrapped__(word) == sinhala_to_ipa(word), word
+
+    def test_random_phoneme_strings_match_reference_rules(self):
+        """Test the compiled rewrite rules on random phoneme strings"""
+        rng = random.Random(0)
+        alphabet = list("krluaəhebæoʋsɖʈjiːtmnpgd")
+        for _ in range(20000):
+            phonemes = "".join(rng.choices(alphabet, k=rng.randint(1, 10)))
+            assert compiled_apply_rules(phonemes) == "".join(apply_all_rules(phonemes)), phonemes
@@ -0,0 +1,40 @@
+import pytest
+from inflight_limiter import InFlightLimiter, ServerBusy
+
+
+@pytest.mark.unit
+class TestInFlightLimiter:
+    """Test admission control for requests in flight"""
+
+    def test_rejects_past_limit(self):
+        """Test that requests beyond max_in_flight are rejected"""
+        limiter = InFlightLimiter(max_in_flight=2, retry_after=7)
+        limiter.acquire()
+        limiter.acquire()
+
+        with pytest.raises(ServerBusy) as exc_info:
+            limiter.acquire()
+        assert exc_info.value.retry_after == 7
+
+        stats = limiter.stats()
+        assert stats["in_flight"] == 2
+        assert stats["admitted"] == 2
+        assert stats["rejected"] == 1
+
+    def test_slots_are_released(self):
+        """Test that finished requests free their slot"""
+        limiter = InFlightLimiter(max_in_flight=1)
+        for _ in range(3):
+            with limiter.slot():
+                assert limiter.stats()["in_flight"] == 1
+        assert limiter.stats()["in_flight"] == 0
+        assert limiter.stats()["peak_in_flight"] == 1
+
+    def test_slot_released_on_error(self):
+        """Test that a failing request gives its slot back"""
+        limiter = InFlightLimiter(max_in_flight=1)
+        with pytest.raises(RuntimeError):
+            with limiter.slot():
+                raise RuntimeError("synthesis failed")
+        limiter.acquire()
+        assert limiter.stats()["in_flight"] == 1
@@ -12,12 +12,12 @@ class TestIntegrationFlow:
         self.client = TestClient(app)
     
     @patch('main.supabase')
-    @patch('main.convert_text')
+    @patch('main.text_frontend')
     @patch('main.synthesizer')
-    def test_complete_tts_flow(self, mock_synthesizer, mock_convert_text, mock_supabase):
+    def test_complete_tts_flow(self, mock_synthesizer, mock_frontend, mock_supabase):
         """Test complete TTS flow from text to audio"""
         # Setup mocks
-        mock_convert_text.return_value = "phonemized_text"
+        mock_frontend.process.return_value.phonemes = "phonemized_text"
         mock_synthesizer.tts.return_value = b"fake_audio_data"
         
         # Mock save_wav to actually write data to the buffer
@@ -121,11 +121,11 @@ class TestPerformanceIntegration:
         for response in responses:
             assert response.status_code == 200
     
-    @patch('main.convert_text')
+    @patch('main.text_frontend')
     @patch('main.synthesizer')
-    def test_tts_performance(self, mock_synthesizer, mock_convert_text):
+    def test_tts_performance(self, mock_synthesizer, mock_frontend):
         """Test TTS endpoint performance with longer text"""
-        mock_convert_text.return_value = "long_phonemized_text" * 10
+        mock_frontend.process.return_value.phonemes = "long_phonemized_text" * 10
         mock_synthesizer.tts.return_value = b"fake_audio_data" * 1000
         
         # Mock save_wav to actually write data to the buffer
@@ -0,0 +1,166 @@
+import os
+import sys
+import pytest
+
+torch = pytest.importorskip("torch")
+from model_loader import ParallelLoader, WeightStore, _mapped_synthesizer, generator_weights
+
+
+def save_coqui_checkpoint(path):
+    """Checkpoint shaped like a Coqui training checkpoint, with optimizer state and a tied weight"""
+    torch.manual_seed(0)
+    weight = torch.randn(4, 3)
+    state = {
+        "model": {"encoder.weight": weight, "decoder.weight": weight, "decoder.bias": torch.randn(4)},
+        "optimizer": {"state": {0: {"exp_avg": torch.randn(4, 3)}}},
+        "config": {"r": 2},
+        "step": 1000,
+    }
+    torch.save(state, path)
+    return state
+
+
+@pytest.mark.unit
+class TestWeightStore:
+    """Test converting checkpoints to memory-mapped weight files"""
+
+    def test_converts_model_weights_only(self, tmp_path):
+        """Test that only the model weights and Tacotron's r are kept"""
+        source = str(tmp_path / "tts.pth")
+        state = save_coqui_checkpoint(source)
+        store = WeightStore(str(tmp_path / "weights"))
+
+        tensors, metadata = store.load_state(source)
+
+        assert set(tensors) == {"encoder.weight", "decoder.weight", "decoder.bias"}
+        for name, tensor in tensors.items():
+            assert torch.equal(tensor, state["model"][name])
+        assert metadata == {"r": "2"}
+
+    def test_conversion_reused(self, tmp_path):
+        """Test that a checkpoint is converted once until it changes"""
+        source = str(tmp_path / "tts.pth")
+        save_coqui_checkpoint(source)
+        store = WeightStore(str(tmp_path / "weights"))
+
+        first = store.convert(source)
+        assert store.convert(source) == first
+
+        stat = os.stat(source)
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert store.convert(source) != first
+
+    def test_loads_into_module(self, tmp_path):
+        """Test that a plain state dict round-trips into a module"""
+        module = torch.nn.Linear(3, 4)
+        source = str(tmp_path / "campplus.bin")
+        torch.save(module.state_dict(), source)
+        store = WeightStore(str(tmp_path / "weights"))
+
+        restored = torch.nn.Linear(3, 4)
+        restored.load_state_dict(store.load_state(source)[0])
+
+        assert torch.equal(restored.weight, module.weight)
+
+
+@pytest.fixture
+def coqui(monkeypatch):
+    """The installed Coqui TTS package instead of conftest's mocks"""
+    for name in [name for name in sys.modules if name == "TTS" or name.startswith("TTS.")]:
+        monkeypatch.delitem(sys.modules, name)
+    try:
+        pytest.importorskip("TTS.utils.synthesizer")
+        yield
+    finally:
+        for name in [name for name in sys.modules if name == "TTS" or name.startswith("TTS.")]:
+            del sys.modules[name]
+
+
+def save_coqui_models(tmp_path):
+    """Small Tacotron2 and MelGAN checkpoints and configs, saved the way Coqui's trainer saves them"""
+    from TTS.tts.configs.tacotron2_config import Tacotron2Config
+    from TTS.tts.models import setup_model as setup_tts_model
+    from TTS.vocoder.configs import MelganConfig
+    from TTS.vocoder.models import setup_model as setup_vocoder_model
+
+    torch.manual_seed(0)
+    paths = {}
+    for name, config, setup in (("tts", Tacotron2Config(r=2), setup_tts_model),
+                                ("vocoder", MelganConfig(), setup_vocoder_model)):
+        model = setup(config)
+        paths[f"{name}_config"] = str(tmp_path / f"{name}.json")
+        paths[f"{name}_checkpoint"] = str(tmp_path / f"{name}.pth")
+        config.save_json(paths[f"{name}_config"])
+        torch.save({"model": model.state_dict(), "config": config.to_dict(), "r": 2}, paths[f"{name}_checkpoint"])
+    return paths
+
+
+@pytest.mark.unit
+class TestMappedSynthesizer:
+    """Test building the Coqui Synthesizer from converted weights"""
+
+    def test_generator_weights(self):
+        """Test that only a GAN vocoder's generator weights are kept"""
+        weight = torch.randn(2)
+        state = {"model": {"model_g.conv.weight": weight, "model_d.conv.weight": torch.randn(2)}}
+        assert generator_weights(state)[0] == {"model_g.conv.weight": weight}
+
+        legacy = {"model": {"conv.weight": weight}, "model_disc": {"conv.weight": torch.randn(2)}}
+        assert generator_weights(legacy)[0] == {"model_g.conv.weight": weight}
+
+    def test_matches_coqui_loading(self, tmp_path, coqui):
+        """Test that the mapped path loads the same models as Coqui's own checkpoint loading"""
+        from TTS.utils.synthesizer import Synthesizer
+
+        paths = save_coqui_models(tmp_path)
+        store = WeightStore(str(tmp_path / "weights"))
+
+        mapped = _mapped_synthesizer(Synthesizer, paths["tts_checkpoint"], paths["tts_config"],
+                                     paths["vocoder_checkpoint"], paths["vocoder_config"], False, store)
+        original = Synthesizer(tts_checkpoint=paths["tts_checkpoint"], tts_config_path=paths["tts_config"],
+                               vocoder_checkpoint=paths["vocoder_checkpoint"],
+                               vocoder_config=paths["vocoder_config"], use_cuda=False)
+
+        assert mapped.output_sample_rate == original.output_sample_rate == 22050
+        assert mapped.tts_model.decoder.r == 2
+        assert mapped.vocoder_model.model_d is None
+        assert not any(name.endswith("weight_g") or "parametrizations" in name
+                       for name, _ in mapped.vocoder_model.named_parameters())
+        for name, tensor in original.tts_model.state_dict().items():
+            assert torch.equal(mapped.tts_model.state_dict()[name], tensor), name
+        mel = torch.randn(1, 80, 20)
+        with torch.no_grad():
+            assert torch.allclose(mapped.vocoder_model.inference(mel), original.vocoder_model.inference(mel))
+
+
+@pytest.mark.unit
+class TestParallelLoader:
+    """Test parallel model loading and the startup report"""
+
+    def test_results_and_report(self):
+        """Test that loads return their results and are timed"""
+        loader = ParallelLoader(max_workers=2)
+        loader.submit("tts", lambda: "synthesizer")
+        loader.submit("vc", lambda: "converter")
+        loader.record("vc/dit", 0.5)
+
+        assert loader.result("tts") == "synthesizer"
+        report = loader.finish()
+
+        assert set(report["models"]) == {"tts", "vc", "vc/dit"}
+        assert report["models"]["vc"]["status"] == "loaded"
+        assert report["models"]["vc/dit"]["seconds"] == 0.5
+
+    def test_failed_load(self):
+        """Test that a failed load re-raises and is reported"""
+        def broken():
+            raise RuntimeError("checkpoint missing")
+
+        loader = ParallelLoader()
+        loader.submit("vc", broken)
+
+        with pytest.raises(RuntimeError):
+            loader.result("vc")
+        report = loader.finish()
+        assert report["models"]["vc"]["status"] == "failed"
+        assert report["models"]["vc"]["error"] == "checkpoint missing"
@@ -0,0 +1,226 @@
+import asyncio
+import threading
+import pytest
+from model_registry import ModelRegistry, ModelUnavailable, model_memory_mb, resolve
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeModel:
+    def __init__(self, sr=22050):
+        self.sr = sr
+
+
+@pytest.mark.unit
+class TestModelRegistry:
+    """Test lazy loading, sharing and idle unloading of models"""
+
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.registry = ModelRegistry(clock=self.clock)
+        self.loads = 0
+
+    def loader(self):
+        self.loads += 1
+        return FakeModel()
+
+    def test_loads_on_first_use_and_shares(self):
+        """Test that a model loads on first use and later calls get the same instance"""
+        self.registry.register("tts", self.loader)
+        assert not self.registry.is_loaded("tts")
+        assert self.loads == 0
+
+        first = self.registry.get("tts")
+        second = self.registry.get("tts")
+
+        assert first is second
+        assert self.loads == 1
+        assert self.registry.is_loaded("tts")
+
+    def test_concurrent_first_use_loads_once(self):
+        """Test that requests racing for an unloaded model share one load"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_loader():
+            started.set()
+            release.wait(5)
+            return self.loader()
+
+        self.registry.register("vc", slow_loader)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.registry.get("vc"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        started.wait(5)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert self.loads == 1
+        assert len(results) == 4 and all(result is results[0] for result in results)
+
+    def test_proxy_forwards_attributes(self):
+        """Test that a proxy loads the model when an attribute is read"""
+        self.registry.register("vc", self.loader)
+        proxy = self.registry.proxy("vc")
+
+        assert self.loads == 0
+        assert proxy.sr == 22050
+        assert self.loads == 1
+
+    def test_peek_does_not_load_or_touch(self):
+        """Test that peek returns only a loaded model and doesn't count as a use"""
+        self.registry.register("vc", self.loader, idle_ttl=10)
+        assert self.registry.peek("vc") is None
+        assert self.loads == 0
+
+        model = self.registry.get("vc")
+        self.clock.now = 11
+        assert self.registry.peek("vc") is model
+        assert self.registry.reap() == ["vc"]
+
+    def test_proxy_introspection_does_not_load(self):
+        """Test that private names and dir() on a proxy leave the model unloaded"""
+        self.registry.register("vc", self.loader)
+        proxy = self.registry.proxy("vc")
+
+        assert not hasattr(proxy, "__code__")
+        assert not hasattr(proxy, "_cache")
+        assert dir(proxy) == []
+        assert self.loads == 0
+
+    def test_proxy_of_unavailable_model(self):
+        """Test that attributes of a model that can't load raise AttributeError"""
+        self.registry.register("vc", self.loader, available=lambda: False)
+        proxy = self.registry.proxy("vc")
+
+        assert not hasattr(proxy, "sr")
+        with pytest.raises(AttributeError, match="not available"):
+            proxy.sr
+
+    def test_resolve(self):
+        """Test that resolve loads proxies and passes other objects through"""
+        self.registry.register("vc", self.loader)
+        model = asyncio.run(resolve(self.registry.proxy("vc")))
+        other = object()
+
+        assert model is self.registry.get("vc")
+        assert asyncio.run(resolve(other)) is other
+
+    def test_reap_unloads_idle_models(self):
+        """Test that models past their idle TTL are unloaded and reload on next use"""
+        self.registry.register("vc", self.loader, idle_ttl=60)
+        self.registry.register("tts", self.loader)
+        self.registry.get("vc")
+        self.registry.get("tts")
+
+        self.clock.now = 30
+        assert self.registry.reap() == []
+        self.registry.get("vc")  # resets the idle timer
+        self.clock.now = 89
+        assert self.registry.reap() == []
+
+        self.clock.now = 200
+        assert self.registry.reap() == ["vc"]
+        assert not self.registry.is_loaded("vc")
+        assert self.registry.is_loaded("tts")
+
+        self.registry.get("vc")
+        assert self.loads == 3
+
+    def test_on_unload_hook(self):
+        """Test that the unload hook receives the dropped model"""
+        dropped = []
+        self.registry.register("vc", self.loader, on_unload=dropped.append)
+        model = self.registry.get("vc")
+
+        assert self.registry.unload("vc")
+        assert dropped == [model]
+        assert not self.registry.unload("vc")
+
+    def test_unavailable_model(self):
+        """Test that a model whose files are missing is reported and never loaded"""
+        self.registry.register("vc", self.loader, available=lambda: False)
+
+        assert not self.registry.available("vc")
+        with pytest.raises(ModelUnavailable):
+            self.registry.get("vc")
+        assert self.loads == 0
+
+    def test_failed_load_is_remembered(self):
+        """Test that a failed load marks the model unavailable until it is unloaded"""
+        def broken():
+            self.loads += 1
+            raise OSError("bad checkpoint")
+
+        self.registry.register("vc", broken)
+        with pytest.raises(ModelUnavailable, match="bad checkpoint"):
+            self.registry.get("vc")
+        with pytest.raises(ModelUnavailable):
+            self.registry.get("vc")
+
+        assert self.loads == 1
+        assert not self.registry.available("vc")
+        assert self.registry.status()[0]["error"] == "bad checkpoint"
+
+        self.registry.unload("vc")
+        assert self.registry.available("vc")
+
+    def test_status(self):
+        """Test the per-model report"""
+        self.registry.register("tts", self.loader)
+        self.registry.register("vc", self.loader, idle_ttl=900)
+        self.registry.get("vc")
+        self.clock.now = 12
+
+        status = {entry["name"]: entry for entry in self.registry.status()}
+
+        assert status["tts"]["loaded"] is False
+        assert status["tts"]["idle_seconds"] is None
+        assert status["vc"]["loaded"] is True
+        assert status["vc"]["loads"] == 1
+        assert status["vc"]["idle_seconds"] == 12
+        assert status["vc"]["idle_ttl"] == 900
+
+    def test_unknown_model(self):
+        """Test that unregistered names raise KeyError"""
+        with pytest.raises(KeyError):
+            self.registry.get("missing")
+
+
+@pytest.mark.unit
+class TestModelMemory:
+    """Test the memory figure reported for loaded models"""
+
+    def setup_method(self):
+        self.torch = pytest.importorskip("torch")
+
+    def test_counts_instrumented_modules(self):
+        """Test that modules behind tracing wrappers are counted, shared ones once"""
+        import tracing
+        torch = self.torch
+        model = FakeModel()
+        model.campplus_model = torch.nn.Linear(256, 256, bias=False)
+        model.vocoder_fn = torch.nn.Linear(256, 256, bias=False)
+        model.models = {"shared": model.vocoder_fn}
+        tracing.instrument(model, "campplus_model", "campplus")
+        tracing.instrument(model, "vocoder_fn", "bigvgan")
+
+        assert model_memory_mb(model) == pytest.approx(2 * 256 * 256 * 4 / 2 ** 20)
+
+    def test_counts_quantized_weights(self):
+        """Test that dynamic int8 Linear weights, kept in packed params, are counted"""
+        torch = self.torch
+        from torch.ao.quantization import quantize_dynamic
+        model = FakeModel()
+        model.dit = quantize_dynamic(torch.nn.Sequential(torch.nn.Linear(256, 256)), {torch.nn.Linear},
+                                     dtype=torch.qint8)
+
+        assert model_memory_mb(model) == pytest.approx((256 * 256 + 256 * 4) / 2 ** 20)
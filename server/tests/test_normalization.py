@@ -0,0 +1,39 @@
+import pytest
+from num2sinhala import num_convert, number_to_words, SinhalaNumberConverter
+from short2sinhala import short_convert
+
+
+@pytest.mark.unit
+class TestNumberConversion:
+    """Test Sinhala number-to-words conversion"""
+
+    def test_numbers_in_text(self):
+        """Test that digit runs are replaced and the rest is kept"""
+        assert num_convert("කෝපි 2ක්") == "කෝපි දෙකක්"
+        assert num_convert("රුපියල් 1000ක්") == "රුපියල් දහසක්"
+        assert num_convert("නැත") == "නැත"
+
+    def test_memoized_matches_converter(self):
+        """Test that the cached converter agrees with a fresh one"""
+        fresh = SinhalaNumberConverter()
+        for number in (0, 7, 19, 45, 100, 2025, 150000, 10 ** 12 + 5):
+            assert number_to_words(number) == fresh.convert(number)
+
+
+@pytest.mark.unit
+class TestAbbreviationConversion:
+    """Test Sinhala abbreviation and time expansion"""
+
+    def test_abbreviations(self):
+        """Test currency abbreviations"""
+        assert short_convert("රු. 100") == "රුපියල් 100"
+        assert short_convert("$ 50") == "ඩොලර් 50"
+
+    def test_time_formats(self):
+        """Test times written before and after the period"""
+        assert short_convert("පෙ.ව. 8.30ට") == "පෙරවරු 8 යි 30ට"
+        assert short_convert("2.00ට ප.ව.") == "2ට පස්වරු"
+
+    def test_expansions_are_not_expanded_again(self):
+        """Test that a full stop after a period abbreviation isn't read as රු."""
+        assert short_convert("ප.ව..") == "පස්වරු."
@@ -0,0 +1,132 @@
+import pytest
+from types import SimpleNamespace
+
+np = pytest.importorskip("numpy")
+torch = pytest.importorskip("torch")
+voice_converter = pytest.importorskip("vc.voice_converter")
+
+ReferenceFeatureCache = voice_converter.ReferenceFeatureCache
+
+
+def features(value):
+    return {"mel2": torch.full((1, 2, 3), float(value)), "style2": torch.full((1, 4), float(value))}
+
+
+def make_converter(cache, monkeypatch, feature_tag="tag"):
+    """VoiceConverter with stand-in models that counts reference extractions"""
+    monkeypatch.setattr(voice_converter, "load_audio", lambda path, sr: np.zeros(sr // 10, dtype=np.float32))
+    monkeypatch.setattr(voice_converter, "resample", lambda audio, orig_sr, target_sr: audio)
+
+    converter = voice_converter.VoiceConverter.__new__(voice_converter.VoiceConverter)
+    converter.device = torch.device("cpu")
+    converter.sr = 16000
+    converter.feature_tag = feature_tag
+    converter.ref_cache = cache
+    converter.extractions = 0
+
+    def semantic_fn(waves_16k):
+        converter.extractions += 1
+        return torch.zeros(1, 5, 8)
+
+    converter.semantic_fn = semantic_fn
+    converter.to_mel = lambda audio: torch.zeros(1, 80, 10)
+    converter.campplus_model = lambda feat: torch.zeros(1, 192)
+    converter.model = SimpleNamespace(
+        length_regulator=lambda S_ori, ylens, n_quantizers, f0: (S_ori, None, None, None, None))
+    return converter
+
+
+@pytest.mark.unit
+class TestReferenceFeatureCache:
+    """Test the in-memory LRU and on-disk reference feature cache"""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is dropped first"""
+        cache = ReferenceFeatureCache(max_items=2)
+        cache.put("a", features(1))
+        cache.put("b", features(2))
+        assert cache.get("a", "cpu") is not None
+
+        cache.put("c", features(3))
+
+        assert cache.contains("a") and cache.contains("c")
+        assert not cache.contains("b")
+        assert cache.get("b", "cpu") is None
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that entries written to disk are read back by a new cache"""
+        ReferenceFeatureCache(cache_dir=str(tmp_path)).put("a", features(1))
+
+        reloaded = ReferenceFeatureCache(cache_dir=str(tmp_path))
+        assert reloaded.contains("a")
+        cached = reloaded.get("a", "cpu")
+
+        assert torch.equal(cached["mel2"], features(1)["mel2"])
+        assert torch.equal(cached["style2"], features(1)["style2"])
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_disk_entry_outlives_eviction(self, tmp_path):
+        """Test that an entry evicted from memory is reloaded from disk"""
+        cache = ReferenceFeatureCache(max_items=1, cache_dir=str(tmp_path))
+        cache.put("a", features(1))
+        cache.put("b", features(2))
+
+        assert torch.equal(cache.get("a", "cpu")["mel2"], features(1)["mel2"])
+
+
+@pytest.mark.unit
+class TestGetReferenceFeatures:
+    """Test that reference features are extracted once per reference file and model"""
+
+    def test_extracted_once(self, tmp_path, monkeypatch):
+        """Test that a repeated reference is served from the cache"""
+        reference = tmp_path / "ref.wav"
+        reference.write_bytes(b"voice-a")
+        converter = make_converter(ReferenceFeatureCache(), monkeypatch)
+
+        first = converter.get_reference_features(str(reference))
+        assert converter.has_reference_features(str(reference))
+        second = converter.get_reference_features(str(reference))
+
+        assert converter.extractions == 1
+        assert second is first
+        assert set(first) == {"S_ori", "mel2", "style2", "prompt_condition"}
+
+    def test_reloaded_from_disk(self, tmp_path, monkeypatch):
+        """Test that a restarted converter reads persisted features instead of extracting"""
+        reference = tmp_path / "ref.wav"
+        reference.write_bytes(b"voice-a")
+        cache_dir = str(tmp_path / "features")
+        make_converter(ReferenceFeatureCache(cache_dir=cache_dir), monkeypatch).get_reference_features(str(reference))
+
+        restarted = make_converter(ReferenceFeatureCache(cache_dir=cache_dir), monkeypatch)
+        assert restarted.has_reference_features(str(reference))
+        restarted.get_reference_features(str(reference))
+
+        assert restarted.extractions == 0
+
+    def test_changed_reference_file(self, tmp_path, monkeypatch):
+        """Test that new content at the same path is extracted again"""
+        reference = tmp_path / "ref.wav"
+        reference.write_bytes(b"voice-a")
+        converter = make_converter(ReferenceFeatureCache(), monkeypatch)
+        converter.get_reference_features(str(reference))
+
+        reference.write_bytes(b"another voice")
+
+        assert not converter.has_reference_features(str(reference))
+        converter.get_reference_features(str(reference))
+        assert converter.extractions == 2
+
+    def test_changed_feature_tag(self, tmp_path, monkeypatch):
+        """Test that features cached for other models are not reused"""
+        reference = tmp_path / "ref.wav"
+        reference.write_bytes(b"voice-a")
+        cache_dir = str(tmp_path / "features")
+        make_converter(ReferenceFeatureCache(cache_dir=cache_dir), monkeypatch).get_reference_features(str(reference))
+
+        retrained = make_converter(ReferenceFeatureCache(cache_dir=cache_dir), monkeypatch, feature_tag="other")
+
+        assert not retrained.has_reference_features(str(reference))
+        retrained.get_reference_features(str(reference))
+        assert retrained.extractions == 1
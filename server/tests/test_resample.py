@@ -0,0 +1,27 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+torchaudio = pytest.importorskip("torchaudio")
+
+from vc.resample import get_resampler, resample
+
+
+@pytest.mark.unit
+class TestResample:
+    """Test cached polyphase resampling"""
+
+    def test_matches_functional_resample(self):
+        """Test that cached kernels give the same output as torchaudio.functional.resample"""
+        wave = torch.randn(1, 22050)
+        expected = torchaudio.functional.resample(wave, 22050, 16000)
+        assert torch.allclose(resample(wave, 22050, 16000), expected, atol=1e-5)
+
+    def test_kernel_is_built_once_per_rate_pair(self):
+        """Test that the same Resample module is reused"""
+        assert get_resampler(22050, 16000) is get_resampler(22050, 16000)
+        assert get_resampler(22050, 16000) is not get_resampler(24000, 16000)
+
+    def test_same_rate_is_identity(self):
+        """Test that equal rates return the input untouched"""
+        wave = torch.randn(1, 100)
+        assert resample(wave, 16000, 16000) is wave
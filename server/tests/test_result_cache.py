@@ -0,0 +1,83 @@
+import pytest
+import asyncio
+import os
+from result_cache import ResultCache, model_fingerprint
+
+
+@pytest.mark.unit
+class TestResultCache:
+    """Test the content-addressed synthesized audio cache"""
+
+    def test_key_depends_on_phonemes_voice_and_model(self):
+        """Test that every key component changes the key"""
+        key = ResultCache.make_key("ආයුබෝවන්", "dinithi", "v1")
+        assert key == ResultCache.make_key("ආයුබෝවන්", "dinithi", "v1")
+        assert key != ResultCache.make_key("ආයුබෝවන", "dinithi", "v1")
+        assert key != ResultCache.make_key("ආයුබෝවන්", "oshadi", "v1")
+        assert key != ResultCache.make_key("ආයුබෝවන්", "dinithi", "v2")
+
+    def test_memory_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = ResultCache(max_items=2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        assert cache.get("a") == b"1"
+        cache.put("c", b"3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+        assert cache.get("c") == b"3"
+
+    def test_disk_tier_survives_restart_and_is_bounded(self, tmp_path):
+        """Test that disk entries are reloaded and the size bound is enforced"""
+        cache = ResultCache(max_items=1, cache_dir=str(tmp_path), max_disk_bytes=8)
+        cache.put("a", b"1234")
+        cache.put("b", b"5678")
+        cache.put("c", b"9999")
+
+        assert not os.path.exists(tmp_path / "a.wav")
+        reopened = ResultCache(cache_dir=str(tmp_path), max_disk_bytes=8)
+        assert reopened.get("b") == b"5678"
+        assert reopened.get("c") == b"9999"
+        assert reopened.stats()["disk_hits"] == 2
+
+    def test_concurrent_misses_compute_once(self):
+        """Test that concurrent requests for one key share a single computation"""
+        cache = ResultCache()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return b"audio", True
+
+        async def main():
+            return await asyncio.gather(*[cache.get_or_compute("k", compute) for _ in range(4)])
+
+        assert asyncio.run(main()) == [b"audio"] * 4
+        assert len(calls) == 1
+        stats = cache.stats()
+        assert stats["misses"] == 4
+        assert stats["shared"] == 3
+        assert asyncio.run(cache.get_or_compute("k", compute)) == b"audio"
+        assert cache.stats()["memory_hits"] == 1
+
+    def test_uncacheable_result_is_not_stored(self):
+        """Test that results flagged as not cacheable (e.g. VC fallback) are recomputed"""
+        cache = ResultCache()
+
+        async def compute():
+            return b"fallback", False
+
+        assert asyncio.run(cache.get_or_compute("k", compute)) == b"fallback"
+        assert cache.get("k") is None
+
+    def test_model_fingerprint_tracks_file_contents(self, tmp_path):
+        """Test that replacing a checkpoint changes the model version"""
+        checkpoint = tmp_path / "model.pth"
+        checkpoint.write_bytes(b"weights-v1")
+        first = model_fingerprint([str(checkpoint)])
+        checkpoint.write_bytes(b"weights-v2")
+
+        assert model_fingerprint([str(checkpoint)]) != first
+        assert model_fingerprint([str(tmp_path / "missing.pth")]) != first
@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+import struct
+from streaming import ClosingStreamingResponse, split_sentences, wav_stream_header
+
+
+@pytest.mark.unit
+class TestSentenceSplitting:
+    """Test splitting normalized text into streamable sentences"""
+
+    def test_splits_on_sentence_ends(self):
+        """Test splitting on full stops and question marks"""
+        text = "අද කාලගුණය හොඳයි. ඔබට කොහොමද? මම පාසලට යනවා"
+        assert split_sentences(text) == [
+            "අද කාලගුණය හොඳයි.",
+            "ඔබට කොහොමද?",
+            "මම පාසලට යනවා",
+        ]
+
+    def test_splits_on_newlines(self):
+        """Test that newlines end a sentence"""
+        assert split_sentences("පළමු පේළිය\nදෙවන පේළිය") == ["පළමු පේළිය", "දෙවන පේළිය"]
+
+    def test_long_sentence_split_into_clauses(self):
+        """Test that over-long sentences are split at commas"""
+        text = "ඔන්ලයින් ගනුදෙනු, ඉගෙනීම, සන්නිවේදනය"
+        assert split_sentences(text, max_chars=20) == ["ඔන්ලයින් ගනුදෙනු,", "ඉගෙනීම,", "සන්නිවේදනය"]
+
+    @pytest.mark.parametrize("text", ["", "   ", "...", "\n\n"])
+    def test_blank_text(self, text):
+        """Test that text without content yields no sentences"""
+        assert split_sentences(text) == []
+
+
+@pytest.mark.unit
+class TestWavStreamHeader:
+    """Test the streaming WAV header"""
+
+    def test_header_layout(self):
+        """Test that the header is a 44-byte PCM header with unknown sizes"""
+        header = wav_stream_header(22050)
+        assert len(header) == 44
+        assert header[:4] == b"RIFF"
+        assert header[8:16] == b"WAVEfmt "
+        channels, sample_rate = struct.unpack("<HI", header[22:28])
+        assert (channels, sample_rate) == (1, 22050)
+        assert struct.unpack("<H", header[34:36])[0] == 16
+        assert header[36:40] == b"data"
+        assert struct.unpack("<I", header[40:44])[0] == 0xFFFFFFFF
+
+
+@pytest.mark.unit
+class TestClosingStreamingResponse:
+    """Test that streaming responses always release what they hold"""
+
+    SCOPE = {"type": "http", "asgi": {"spec_version": "2.4"}, "extensions": {}}
+
+    async def receive(self):
+        return {"type": "http.disconnect"}
+
+    def test_closes_after_stream(self):
+        """Test that on_close runs once the body has been sent"""
+        closed = []
+        sent = []
+
+        async def body():
+            yield b"chunk"
+
+        async def send(message):
+            sent.append(message)
+
+        response = ClosingStreamingResponse(body(), lambda: closed.append(True))
+        asyncio.run(response(self.SCOPE, self.receive, send))
+
+        assert closed == [True]
+        assert any(message.get("body") == b"chunk" for message in sent)
+
+    def test_closes_when_generator_never_starts(self):
+        """Test that on_close runs when sending fails before the first chunk"""
+        closed = []
+        started = []
+
+        async def body():
+            started.append(True)
+            yield b"chunk"
+
+        async def send(message):
+            raise OSError("client went away")
+
+        from starlette.requests import ClientDisconnect
+
+        response = ClosingStreamingResponse(body(), lambda: closed.append(True))
+        with pytest.raises(ClientDisconnect):
+            asyncio.run(response(self.SCOPE, self.receive, send))
+
+        assert started == []
+        assert closed == [True]
@@ -0,0 +1,61 @@
+import pytest
+from unittest.mock import patch
+import text_frontend
+from text_frontend import TextFrontend
+from benchmarks.corpus import TEST_TEXTS
+
+# The stages text_frontend itself calls; tests/test_simple.py may have
+# replaced sys.modules['g2p'] with a mock by the time this file is collected
+convert_text = text_frontend.g2p.convert_text
+num_convert = text_frontend.num2sinhala.num_convert
+short_convert = text_frontend.short2sinhala.short_convert
+
+
+class FakeTokenizer:
+    def text_to_ids(self, text):
+        return [ord(char) for char in text]
+
+
+@pytest.mark.unit
+class TestTextFrontend:
+    """Test the fused normalization + G2P frontend"""
+
+    def test_matches_separate_stages(self):
+        """Test that the fused pass equals short_convert -> num_convert -> convert_text"""
+        frontend = TextFrontend()
+        texts = [text for category in TEST_TEXTS.values() for text in category]
+        texts += ["පෙ.ව. 8.30ට  රු.1000ක්\nගෙවන්න", "  123  ", ""]
+        for text in texts:
+            normalized = num_convert(short_convert(text))
+            output = frontend.process(text)
+            assert output.normalized == normalized
+            assert output.phonemes == convert_text(normalized)
+            assert output.token_ids is None
+
+    def test_normalize_and_phonemize(self):
+        """Test the single-stage helpers used by the streaming endpoint"""
+        frontend = TextFrontend()
+        assert frontend.normalize("රු. 100") == "රුපියල් සියය"
+        assert frontend.phonemize("කට") == convert_text("කට")
+
+    def test_normalize_skips_g2p(self):
+        """Test that normalize matches the separate stages without running G2P"""
+        frontend = TextFrontend()
+        texts = [text for category in TEST_TEXTS.values() for text in category]
+        texts += ["පෙ.ව. 8.30ට  රු.1000ක්\nගෙවන්න", "  123  ", ""]
+        with patch.object(text_frontend.g2p, "word_to_ipa", side_effect=AssertionError("G2P ran")):
+            for text in texts:
+                assert frontend.normalize(text) == num_convert(short_convert(text))
+
+    def test_token_ids_from_tokenizer(self):
+        """Test that token IDs come from the tokenizer unless disabled"""
+        frontend = TextFrontend(tokenizer=FakeTokenizer())
+        output = frontend.process("කට 2")
+        assert output.token_ids == [ord(char) for char in output.phonemes]
+        assert frontend.process("කට 2", with_ids=False).token_ids is None
+
+    def test_process_batch(self):
+        """Test that batch processing matches processing texts one by one"""
+        frontend = TextFrontend()
+        texts = ["කට මට", "රු. 50", "කට මට"]
+        assert frontend.process_batch(texts) == [frontend.process(text) for text in texts]
@@ -0,0 +1,73 @@
+import pytest
+import tracing
+from tts_batching import BatchScheduler
+
+
+@pytest.mark.unit
+class TestTracing:
+    """Test request tracing spans and Prometheus rendering"""
+
+    def test_spans_are_recorded_and_observed(self):
+        """Test that spans land in the current trace and the stage histogram"""
+        before = tracing.STAGE_SECONDS.count(stage="test_g2p", voice="oshadi")
+        trace = tracing.start_trace(voice="oshadi")
+        with tracing.span("test_g2p"):
+            pass
+        with tracing.span("test_g2p"):
+            pass
+
+        assert [stage for stage, _ in trace.spans] == ["test_g2p", "test_g2p"]
+        assert tracing.STAGE_SECONDS.count(stage="test_g2p", voice="oshadi") == before + 2
+        assert trace.server_timing().startswith("test_g2p;dur=")
+        assert trace.server_timing().count("test_g2p") == 1
+
+    def test_histogram_render(self):
+        """Test the Prometheus text format of a histogram"""
+        histogram = tracing.Histogram("demo_seconds", "Demo", ("stage",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, stage="a")
+        histogram.observe(0.5, stage="a")
+        histogram.observe(5.0, stage="a")
+        lines = histogram.render()
+
+        assert '# TYPE demo_seconds histogram' in lines
+        assert 'demo_seconds_bucket{stage="a",le="0.1"} 1' in lines
+        assert 'demo_seconds_bucket{stage="a",le="1.0"} 2' in lines
+        assert 'demo_seconds_bucket{stage="a",le="+Inf"} 3' in lines
+        assert 'demo_seconds_count{stage="a"} 3' in lines
+
+    def test_counter_render(self):
+        """Test that counters accumulate per label set"""
+        counter = tracing.Counter("demo_total", "Demo", ("reason",))
+        counter.inc(reason="failed")
+        counter.inc(2, reason="failed")
+        assert counter.value(reason="failed") == 3
+        assert 'demo_total{reason="failed"} 3' in counter.render()
+
+    def test_batch_stages_are_credited_to_every_caller(self):
+        """Test that spans inside a batch function reach each submitting request"""
+        def batch_fn(items):
+            with tracing.span("test_vocoder"):
+                return items
+
+        scheduler = BatchScheduler(batch_fn, max_batch_size=2, max_wait_ms=200, name="test")
+        traces = []
+        futures = []
+        for item in range(2):
+            traces.append(tracing.start_trace(voice="dinithi"))
+            futures.append(scheduler.submit(item))
+        assert [future.result(timeout=5) for future in futures] == [0, 1]
+
+        for trace in traces:
+            assert [stage for stage, _ in trace.spans] == ["test_queue", "test_vocoder"]
+
+    def test_instrument_wraps_attribute(self):
+        """Test that instrumented calls are timed and still return their result"""
+        class Model:
+            def inference(self, x):
+                return x + 1
+
+        model = Model()
+        tracing.instrument(model, "inference", "test_model")
+        trace = tracing.start_trace()
+        assert model.inference(1) == 2
+        assert trace.spans[0][0] == "test_model"
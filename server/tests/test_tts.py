@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, AsyncMock
 from fastapi.testclient import TestClient
 from main import app
 
@@ -11,12 +11,12 @@ class TestTTSSynthesis:
     def setup_method(self):
         self.client = TestClient(app)
     
-    @patch('main.convert_text')
+    @patch('main.text_frontend')
     @patch('main.synthesizer')
-    def test_synthesize_success(self, mock_synthesizer, mock_convert_text):
+    def test_synthesize_success(self, mock_synthesizer, mock_frontend):
         """Test successful text synthesis"""
         # Setup mocks
-        mock_convert_text.return_value = "phonemized_text"
+        mock_frontend.process.return_value.phonemes = "phonemized_text"
         mock_synthesizer.tts.return_value = b"fake_audio_data"
         mock_synthesizer.save_wav = Mock()
         
@@ -33,7 +33,7 @@ class TestTTSSynthesis:
         assert "synthesized.wav" in response.headers["Content-Disposition"]
         
         # Verify mocks were called
-        mock_convert_text.assert_called_once_with("Hello world")
+        mock_frontend.process.assert_called_once_with("Hello world", with_ids=False)
         mock_synthesizer.tts.assert_called_once_with("phonemized_text")
     
     def test_synthesize_empty_text(self):
@@ -61,11 +61,11 @@ class TestTTSSynthesis:
         )
         assert response.status_code == 422
     
-    @patch('main.convert_text')
+    @patch('main.text_frontend')
     @patch('main.synthesizer')
-    def test_synthesize_with_sinhala_text(self, mock_synthesizer, mock_convert_text):
+    def test_synthesize_with_sinhala_text(self, mock_synthesizer, mock_frontend):
         """Test synthesis with Sinhala text"""
-        mock_convert_text.return_value = "sinhala_phonemes"
+        mock_frontend.process.return_value.phonemes = "sinhala_phonemes"
         mock_synthesizer.tts.return_value = b"sinhala_audio_data"
         mock_synthesizer.save_wav = Mock()
         
@@ -75,14 +75,14 @@ class TestTTSSynthesis:
         )
         
         assert response.status_code == 200
-        mock_convert_text.assert_called_once_with("සුභ දවසක්")
+        mock_frontend.process.assert_called_once_with("සුභ දවසක්", with_ids=False)
         mock_synthesizer.tts.assert_called_once_with("sinhala_phonemes")
     
-    @patch('main.convert_text')
+    @patch('main.text_frontend')
     @patch('main.synthesizer')
-    def test_synthesize_error_handling(self, mock_synthesizer, mock_convert_text):
+    def test_synthesize_error_handling(self, mock_synthesizer, mock_frontend):
         """Test error handling in synthesis"""
-        mock_convert_text.side_effect = Exception("G2P conversion failed")
+        mock_frontend.process.side_effect = Exception("G2P conversion failed")
         
         # The actual implementation doesn't have try-catch, so exception propagates
         try:
@@ -94,4 +94,130 @@ class TestTTSSynthesis:
             assert False, "Expected an exception but didn't get one"
         except Exception as e:
             # The exception should propagate from the G2P conversion
-            assert "G2P conversion failed" in str(e)
\ No newline at end of file
+            assert "G2P conversion failed" in str(e)
+
+    @patch('main.text_frontend')
+    @patch('main.inference_limiter')
+    def test_synthesize_busy_returns_503(self, mock_limiter, mock_frontend):
+        """Test that too many requests in flight answer 503 with Retry-After"""
+        from inflight_limiter import ServerBusy
+        mock_frontend.process.return_value.phonemes = "phonemized_text"
+        mock_limiter.slot.side_effect = ServerBusy(retry_after=3)
+
+        response = self.client.post(
+            "/synthesize",
+            json={"text": "test text"}
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "3"
+
+    @patch('main.render_pcm', new_callable=AsyncMock, return_value=b"\x01\x00")
+    @patch('main.text_frontend')
+    @patch('main.inference_limiter')
+    def test_synthesize_stream(self, mock_limiter, mock_frontend, mock_render):
+        """Test that the streaming endpoint sends a WAV header then each sentence"""
+        mock_frontend.normalize.side_effect = lambda text: text
+        mock_frontend.phonemize.return_value = "phonemized_text"
+
+        response = self.client.post(
+            "/synthesize/stream",
+            json={"text": "අද කාලගුණය හොඳයි. ඔබට කොහොමද?"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "audio/wav"
+        assert response.content[:4] == b"RIFF"
+        assert response.content[44:] == b"\x01\x00" * 2
+        assert mock_render.call_count == 2
+        assert mock_limiter.acquire.call_count == mock_limiter.release.call_count == 1
+
+    @patch('main.vc_available', return_value=True)
+    @patch('main.vc_scheduler')
+    @patch('main.voice_converter')
+    @patch('main.text_frontend')
+    @patch('main.tts_scheduler')
+    def test_synthesize_stream_converted_voice(self, mock_tts_scheduler, mock_frontend, mock_converter,
+                                               mock_vc_scheduler, mock_available):
+        """Test that converted voices are streamed chunk by chunk within a sentence"""
+        from concurrent.futures import Future
+
+        def finished(result):
+            future = Future()
+            future.set_result(result)
+            return future
+
+        mock_frontend.normalize.side_effect = lambda text: text
+        mock_frontend.phonemize.return_value = "phonemized_text"
+        mock_tts_scheduler.run = AsyncMock(return_value=[0.0])
+        mock_vc_scheduler.call.side_effect = lambda fn, *args: finished(fn(*args))
+        mock_converter.sr = 22050
+        mock_converter.convert_voice_stream.return_value = (chunk for chunk in [[0.5], [0.5]])
+
+        response = self.client.post(
+            "/synthesize/stream",
+            json={"text": "අද කාලගුණය හොඳයි", "voice": "jerry"}
+        )
+
+        assert response.status_code == 200
+        assert response.content[44:] == b"\xff\x3f" * 2
+        assert mock_converter.convert_voice_stream.call_count == 1
+
+    @patch('main.upload_to_supabase_background')
+    @patch('main.text_frontend')
+    @patch('main.synthesizer')
+    def test_synthesize_uploads_response_bytes(self, mock_synthesizer, mock_frontend, mock_upload):
+        """Test that the encoded response is reused for the upload without temp files"""
+        mock_frontend.process.return_value.phonemes = "phonemized_text"
+        mock_synthesizer.tts.return_value = [0.0] * 10
+        mock_synthesizer.save_wav.side_effect = lambda wav, buffer: buffer.write(b"RIFFwav")
+
+        response = self.client.post(
+            "/synthesize",
+            json={"text": "test text", "user_id": "test-user-id"}
+        )
+
+        assert response.status_code == 200
+        assert response.content == b"RIFFwav"
+        assert mock_upload.call_args[0][0] == b"RIFFwav"
+
+    @patch('main.vc_available', return_value=False)
+    @patch('main.upload_to_supabase_background')
+    @patch('main.text_frontend')
+    @patch('main.synthesizer')
+    def test_synthesize_uploads_fallback_name(self, mock_synthesizer, mock_frontend, mock_upload, mock_available):
+        """Test that audio falling back to the default voice is uploaded under its fallback name"""
+        mock_frontend.process.return_value.phonemes = "fallback_phonemes"
+        mock_synthesizer.tts.return_value = [0.0] * 10
+        mock_synthesizer.save_wav.side_effect = lambda wav, buffer: buffer.write(b"RIFFwav")
+
+        response = self.client.post(
+            "/synthesize",
+            json={"text": "test text", "voice": "jerry", "user_id": "test-user-id"}
+        )
+
+        assert response.status_code == 200
+        assert mock_upload.call_args[0][1].endswith("_dinithi_fallback.wav")
+
+    @patch('main.SERVER_TIMING', True)
+    @patch('main.text_frontend')
+    @patch('main.synthesizer')
+    def test_synthesize_reports_stage_timings(self, mock_synthesizer, mock_frontend):
+        """Test the Server-Timing header and the /metrics stage histograms"""
+        mock_frontend.process.return_value.phonemes = "phonemized_text"
+        mock_synthesizer.tts.return_value = [0.0] * 10
+        mock_synthesizer.save_wav.side_effect = lambda wav, buffer: buffer.write(b"RIFFwav")
+
+        response = self.client.post(
+            "/synthesize",
+            json={"text": "test text"}
+        )
+
+        assert response.status_code == 200
+        assert "frontend;dur=" in response.headers["Server-Timing"]
+        assert "total;dur=" in response.headers["Server-Timing"]
+
+        metrics = self.client.get("/metrics").text
+        assert 'tts_stage_seconds_count{stage="frontend",voice="dinithi"}' in metrics
+        assert 'tts_request_seconds_count{route="/synthesize",method="POST",status="200"}' in metrics
+        assert 'tts_result_cache_total{result="miss"}' in metrics
@@ -0,0 +1,127 @@
+import pytest
+import threading
+import tracing
+from tts_batching import BatchScheduler
+
+
+@pytest.mark.unit
+class TestBatchScheduler:
+    """Test cross-request batching of TTS inputs"""
+
+    def test_single_item_roundtrip(self):
+        """Test that a lone item is processed and returned"""
+        scheduler = BatchScheduler(lambda items: [item.upper() for item in items], max_wait_ms=1)
+        assert scheduler.run_sync("abc") == "ABC"
+
+    def test_concurrent_items_share_a_batch(self):
+        """Test that items submitted within the window are batched together"""
+        seen_batches = []
+        release = threading.Event()
+
+        def batch_fn(items):
+            release.wait(1)
+            seen_batches.append(list(items))
+            return [item * 2 for item in items]
+
+        scheduler = BatchScheduler(batch_fn, max_batch_size=3, max_wait_ms=200)
+        futures = [scheduler.submit(i) for i in range(3)]
+        release.set()
+
+        assert [f.result(timeout=5) for f in futures] == [0, 2, 4]
+        assert seen_batches == [[0, 1, 2]]
+
+        stats = scheduler.stats()
+        assert stats["batches"] == 1
+        assert stats["items"] == 3
+        assert stats["batch_size_counts"] == {3: 1}
+
+    def test_batch_size_limit(self):
+        """Test that batches never exceed max_batch_size"""
+        sizes = []
+
+        def batch_fn(items):
+            sizes.append(len(items))
+            return items
+
+        scheduler = BatchScheduler(batch_fn, max_batch_size=2, max_wait_ms=50)
+        futures = [scheduler.submit(i) for i in range(5)]
+        assert [f.result(timeout=5) for f in futures] == [0, 1, 2, 3, 4]
+        assert max(sizes) <= 2
+
+    def test_error_is_isolated_to_failing_item(self):
+        """Test that one bad input doesn't fail the rest of its batch"""
+        def batch_fn(items):
+            if "bad" in items:
+                raise ValueError("bad input")
+            return items
+
+        scheduler = BatchScheduler(batch_fn, max_batch_size=2, max_wait_ms=200)
+        good = scheduler.submit("good")
+        bad = scheduler.submit("bad")
+
+        assert good.result(timeout=5) == "good"
+        with pytest.raises(ValueError):
+            bad.result(timeout=5)
+        assert scheduler.stats()["errors"] == 1
+
+    def test_single_item_error_is_recorded(self):
+        """Test that a failed lone item still gets its queue wait, trace and stats"""
+        def batch_fn(items):
+            tracing.record("tts_acoustic", 0.5)
+            raise ValueError("bad input")
+
+        scheduler = BatchScheduler(batch_fn, max_wait_ms=1, name="tts")
+        with tracing.collect() as trace:
+            future = scheduler.submit("bad")
+        with pytest.raises(ValueError):
+            future.result(timeout=5)
+
+        assert [stage for stage, _ in trace.spans] == ["tts_queue", "tts_acoustic"]
+        stats = scheduler.stats()
+        assert stats["errors"] == 1
+        assert stats["batches"] == 1
+        assert stats["items"] == 1
+
+    def test_missing_results_fail_their_callers(self):
+        """Test that items batch_fn returned no result for fail instead of hanging"""
+        release = threading.Event()
+
+        def batch_fn(items):
+            release.wait(1)
+            return items[:1]
+
+        scheduler = BatchScheduler(batch_fn, max_batch_size=2, max_wait_ms=200)
+        first = scheduler.submit("a")
+        second = scheduler.submit("b")
+        release.set()
+
+        assert first.result(timeout=5) == "a"
+        with pytest.raises(RuntimeError, match="1 results for 2 items"):
+            second.result(timeout=5)
+        assert scheduler.stats()["errors"] == 1
+
+    async def test_async_run(self):
+        """Test awaiting a result from an event loop"""
+        scheduler = BatchScheduler(lambda items: [len(item) for item in items], max_wait_ms=1)
+        assert await scheduler.run("හේලෝ") == 4
+
+    def test_call_runs_between_batches_on_worker(self):
+        """Test that one-off calls run on the worker thread without joining a batch"""
+        seen_batches = []
+        threads = set()
+
+        def batch_fn(items):
+            threads.add(threading.current_thread().name)
+            seen_batches.append(list(items))
+            return items
+
+        scheduler = BatchScheduler(batch_fn, max_batch_size=4, max_wait_ms=100, name="calls")
+        first = scheduler.submit(1)
+        call = scheduler.call(lambda x: (threading.current_thread().name, x * 10), 5)
+        second = scheduler.submit(2)
+
+        assert call.result(timeout=5) == ("calls-scheduler", 50)
+        assert first.result(timeout=5) == 1
+        assert second.result(timeout=5) == 2
+        assert [1] in seen_batches
+        assert threads == {"calls-scheduler"}
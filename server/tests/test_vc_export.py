@@ -0,0 +1,118 @@
+import os
+import sys
+import pytest
+from types import SimpleNamespace
+
+torch = pytest.importorskip("torch")
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "vc"))
+diffusion_transformer = pytest.importorskip("modules.diffusion_transformer")
+export = pytest.importorskip("vc.export")
+
+N_MELS = 8
+CONTENT_DIM = 12
+STYLE_DIM = 6
+
+
+def make_estimator():
+    """Tiny randomly initialized DiT with the production layout"""
+    torch.manual_seed(0)
+    args = SimpleNamespace(
+        DiT=SimpleNamespace(
+            depth=2, num_heads=2, hidden_dim=32, in_channels=N_MELS,
+            content_type="continuous", content_codebook_size=16, content_dim=CONTENT_DIM,
+            is_causal=False, final_layer_type="mlp", style_condition=True,
+            class_dropout_prob=0.1, long_skip_connection=True, uvit_skip_connection=True,
+        ),
+        style_encoder=SimpleNamespace(dim=STYLE_DIM),
+    )
+    estimator = diffusion_transformer.DiT(args).eval()
+    estimator.setup_caches(max_batch_size=1, max_seq_length=512)
+    return estimator
+
+
+def estimator_inputs(frames, lens):
+    batch = len(lens)
+    return (
+        torch.randn(batch, N_MELS, frames),
+        torch.randn(batch, N_MELS, frames),
+        torch.tensor(lens),
+        torch.rand(batch),
+        torch.randn(batch, STYLE_DIM),
+        torch.randn(batch, frames, CONTENT_DIM),
+    )
+
+
+@pytest.fixture(params=export.FORMATS)
+def exported_estimator(request, tmp_path):
+    if request.param == "onnx":
+        pytest.importorskip("onnx")
+        pytest.importorskip("onnxruntime")
+    estimator = make_estimator()
+    path = export.export_component(
+        export.EstimatorExport(estimator), estimator_inputs(48, [48, 32]),
+        str(tmp_path / ("estimator" + export.EXTENSIONS[request.param])),
+        request.param, export.SPECS["estimator"]
+    )
+    return estimator, export.load_runner(path, request.param)
+
+
+@pytest.mark.unit
+class TestEstimatorExport:
+    """Test that exported DiT graphs match the eager estimator"""
+
+    @pytest.mark.parametrize("frames,lens", [(48, [48, 32]), (80, [80, 80]), (100, [100, 70, 100, 40])])
+    def test_parity_across_lengths(self, exported_estimator, frames, lens):
+        """Test parity at the traced shape and at other batch sizes and lengths"""
+        estimator, runner = exported_estimator
+        inputs = estimator_inputs(frames, lens)
+
+        with torch.no_grad():
+            expected = estimator(*inputs)
+            actual = export.ExportedEstimator(runner, N_MELS)(*inputs)
+
+        assert actual.shape == expected.shape
+        torch.testing.assert_close(actual, expected, rtol=1e-4, atol=1e-4)
+
+    def test_shared_lens_expanded_to_batch(self, exported_estimator):
+        """Test the CFG call shape, where one x_lens and timestep cover the batch"""
+        estimator, runner = exported_estimator
+        x, prompt_x, _, _, style, cond = estimator_inputs(40, [40, 40])
+        x_lens, t = torch.tensor([40]), torch.rand(1)
+
+        with torch.no_grad():
+            expected = estimator(x, prompt_x, x_lens.expand(2), t.expand(2), style, cond)
+            actual = export.ExportedEstimator(runner, N_MELS)(x, prompt_x, x_lens, t, style, cond)
+
+        torch.testing.assert_close(actual, expected, rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.unit
+class TestLoadExported:
+    """Test swapping converter modules for exported graphs"""
+
+    def test_rejects_other_checkpoint(self, tmp_path):
+        """Test that graphs exported from another checkpoint are refused"""
+        (tmp_path / export.MANIFEST_NAME).write_text(
+            '{"version": 2, "feature_tag": "other", "files": {"onnx": {}}}', encoding="utf-8")
+        converter = SimpleNamespace(feature_tag="current")
+
+        with pytest.raises(ValueError, match="different VC checkpoint"):
+            export.load_exported(converter, "onnx", str(tmp_path))
+
+    def test_rejects_old_export_format(self, tmp_path):
+        """Test that graphs exported before the format version was bumped are refused"""
+        (tmp_path / export.MANIFEST_NAME).write_text(
+            '{"feature_tag": "current", "files": {"onnx": {}}}', encoding="utf-8")
+        converter = SimpleNamespace(feature_tag="current")
+
+        with pytest.raises(ValueError, match="older format"):
+            export.load_exported(converter, "onnx", str(tmp_path))
+
+    def test_reports_missing_components(self, tmp_path):
+        """Test that a partial export names the missing graphs"""
+        (tmp_path / export.MANIFEST_NAME).write_text(
+            '{"version": 2, "feature_tag": "current", "files": {"onnx": {"vocoder": "vocoder.onnx"}}}', encoding="utf-8")
+        converter = SimpleNamespace(feature_tag="current")
+
+        with pytest.raises(ValueError, match="estimator, campplus"):
+            export.load_exported(converter, "onnx", str(tmp_path))
@@ -0,0 +1,84 @@
+import os
+import sys
+import pytest
+from types import SimpleNamespace
+
+torch = pytest.importorskip("torch")
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "vc"))
+diffusion_transformer = pytest.importorskip("modules.diffusion_transformer")
+precision = pytest.importorskip("vc.precision")
+
+
+def make_estimator():
+    """Tiny randomly initialized DiT with the production layout"""
+    torch.manual_seed(0)
+    args = SimpleNamespace(
+        DiT=SimpleNamespace(
+            depth=2, num_heads=2, hidden_dim=64, in_channels=8,
+            content_type="continuous", content_codebook_size=16, content_dim=12,
+            is_causal=False, final_layer_type="mlp", style_condition=True,
+            class_dropout_prob=0.1, long_skip_connection=True, uvit_skip_connection=True,
+        ),
+        style_encoder=SimpleNamespace(dim=6),
+    )
+    estimator = diffusion_transformer.DiT(args).eval()
+    estimator.setup_caches(max_batch_size=1, max_seq_length=256)
+    return estimator
+
+
+@pytest.mark.unit
+class TestResolvePrecision:
+    """Test precision mode selection"""
+
+    def test_fp16_flag_only_applies_on_gpu(self):
+        """Test that the legacy fp16 flag maps to fp16 on GPU and fp32 on CPU"""
+        assert precision.resolve_precision(None, True, torch.device("cuda")) == "fp16"
+        assert precision.resolve_precision(None, True, torch.device("cpu")) == "fp32"
+
+    def test_int8_requires_cpu(self):
+        """Test that dynamic quantization is refused on GPU"""
+        with pytest.raises(ValueError, match="only supported on CPU"):
+            precision.resolve_precision("int8-dynamic", False, torch.device("cuda"))
+
+    def test_unknown_precision(self):
+        """Test that unknown modes are rejected"""
+        with pytest.raises(ValueError, match="Unknown precision"):
+            precision.resolve_precision("fp8", False, torch.device("cpu"))
+
+
+@pytest.mark.unit
+class TestDynamicQuantization:
+    """Test int8-dynamic quantization of the VC models"""
+
+    def test_pointwise_conv_to_linear(self):
+        """Test that pointwise convolutions are rewritten without changing outputs"""
+        model = torch.nn.Sequential(torch.nn.Conv1d(16, 32, 1), torch.nn.ReLU(), torch.nn.Conv1d(32, 8, 3))
+        x = torch.randn(2, 16, 20)
+        expected = model(x)
+
+        precision.pointwise_to_linear(model)
+
+        assert isinstance(model[0], precision.PointwiseLinear)
+        assert isinstance(model[2], torch.nn.Conv1d)
+        torch.testing.assert_close(model(x), expected, rtol=1e-5, atol=1e-5)
+
+    def test_dit_layers_quantized(self):
+        """Test that only the listed DiT Linear layers are quantized and outputs stay close"""
+        estimator = make_estimator()
+        inputs = (torch.randn(2, 8, 40), torch.randn(2, 8, 40), torch.tensor([40, 30]),
+                  torch.rand(2), torch.randn(2, 6), torch.randn(2, 40, 12))
+        with torch.no_grad():
+            expected = estimator(*inputs)
+        size_before = precision.module_size_mb(estimator)
+
+        precision.quantize_linear(estimator, precision.DIT_QUANTIZED_LAYERS)
+        with torch.no_grad():
+            actual = estimator(*inputs)
+
+        block = estimator.transformer.layers[0]
+        assert "quantized" in type(block.attention.wqkv).__module__
+        assert "quantized" in type(block.feed_forward.w2).__module__
+        assert "quantized" in type(estimator.cond_x_merge_linear).__module__
+        assert isinstance(estimator.skip_linear, torch.nn.Linear)
+        assert precision.module_size_mb(estimator) < size_before
+        assert ((actual - expected).norm() / expected.norm()).item() < 0.1
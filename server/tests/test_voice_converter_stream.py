@@ -0,0 +1,131 @@
+import pytest
+from types import SimpleNamespace
+
+np = pytest.importorskip("numpy")
+torch = pytest.importorskip("torch")
+voice_converter = pytest.importorskip("vc.voice_converter")
+
+HOP = 4
+
+
+def make_converter(prompt_frames=8):
+    """VoiceConverter with stand-in models: the 'DiT' echoes its condition and the vocoder upsamples by HOP"""
+    converter = voice_converter.VoiceConverter.__new__(voice_converter.VoiceConverter)
+    converter.device = torch.device("cpu")
+    converter.precision = "fp32"
+    converter.sr = 16000
+    converter.hop_length = HOP
+    converter.max_context_window = 128
+    converter.overlap_frame_len = 4
+    converter.overlap_wave_len = converter.overlap_frame_len * HOP
+
+    converter.get_source_condition = lambda wave, sr, length_adjust: torch.from_numpy(wave).view(1, -1, 1).float()
+    converter.get_reference_features = lambda path: {
+        "mel2": torch.zeros(1, 1, prompt_frames),
+        "style2": None,
+        "prompt_condition": torch.zeros(1, prompt_frames, 1),
+    }
+
+    def inference(cat_condition, lengths, mel2, style2, f0, steps, **kwargs):
+        return cat_condition.transpose(1, 2)
+
+    converter.model = SimpleNamespace(cfm=SimpleNamespace(inference=inference))
+    converter.vocoder_fn = lambda mel: mel[:, 0].repeat_interleave(HOP, dim=-1)
+    return converter
+
+
+@pytest.mark.unit
+class TestConvertVoiceStream:
+    """Test chunked streaming voice conversion"""
+
+    def test_stream_matches_convert_waveform(self):
+        """Test that the streamed chunks concatenate to convert_waveform's output"""
+        converter = make_converter()
+        source = np.linspace(-1, 1, 300).astype(np.float32)
+
+        chunks = list(converter.convert_voice_stream(source, 16000, "ref.wav"))
+        sr, full = converter.convert_waveform(source, 16000, "ref.wav")
+
+        assert sr == 16000
+        assert len(chunks) > 1
+        np.testing.assert_allclose(np.concatenate(chunks), full)
+
+    def test_small_chunks_yield_early(self):
+        """Test that smaller chunks give a shorter first piece of audio"""
+        converter = make_converter()
+        source = np.ones(300, dtype=np.float32)
+
+        small = next(converter.convert_voice_stream(source, 16000, "ref.wav", chunk_frames=32))
+        large = next(converter.convert_voice_stream(source, 16000, "ref.wav"))
+
+        assert len(small) < len(large)
+
+    def test_short_source_single_chunk(self):
+        """Test that a source shorter than one chunk is converted in one piece"""
+        converter = make_converter()
+        source = np.ones(20, dtype=np.float32)
+
+        chunks = list(converter.convert_voice_stream(source, 16000, "ref.wav", chunk_frames=64))
+
+        assert len(chunks) == 1
+        assert len(chunks[0]) == 20 * HOP
+
+
+@pytest.mark.unit
+class TestConvertVoiceBatch:
+    """Test batched voice conversion"""
+
+    def test_long_item_conditions_once(self):
+        """Test that an item too long for one window reuses its source condition"""
+        converter = make_converter()
+        get_source_condition = converter.get_source_condition
+        calls = []
+        converter.get_source_condition = lambda *args: calls.append(args) or get_source_condition(*args)
+        source = np.linspace(-1, 1, 300).astype(np.float32)
+
+        (sr, wave), = converter.convert_voice_batch([(source, 16000, "ref.wav")])
+
+        assert len(calls) == 1
+        np.testing.assert_allclose(wave, converter.convert_waveform(source, 16000, "ref.wav")[1])
+
+    def test_vocoder_padding_is_silence(self):
+        """Test that shorter items' mels are padded with the log-mel floor"""
+        converter = make_converter()
+        vocoded = []
+        vocoder_fn = converter.vocoder_fn
+        converter.vocoder_fn = lambda mel: vocoded.append(mel) or vocoder_fn(mel)
+
+        results = converter.convert_voice_batch([(np.ones(20, dtype=np.float32), 16000, "ref.wav"),
+                                                 (np.ones(50, dtype=np.float32), 16000, "ref.wav")])
+
+        mels, = vocoded
+        assert torch.all(mels[0, :, 20:] == voice_converter.MEL_FLOOR)
+        assert [len(wave) for _, wave in results] == [20 * HOP, 50 * HOP]
+
+
+@pytest.mark.unit
+class TestCrossfade:
+    """Test on-device chunk crossfading"""
+
+    def test_matches_cosine_crossfade(self):
+        """Test that the tensor crossfade matches the equal-power cosine curves"""
+        previous = torch.rand(16)
+        chunk = torch.rand(40)
+        expected = chunk.clone().numpy()
+        fade_out = np.cos(np.linspace(0, np.pi / 2, 16)) ** 2
+        fade_in = np.cos(np.linspace(np.pi / 2, 0, 16)) ** 2
+        expected[:16] = expected[:16] * fade_in + previous.numpy() * fade_out
+
+        result = voice_converter.VoiceConverter._crossfade(previous, chunk)
+
+        assert result is chunk
+        np.testing.assert_allclose(result.numpy(), expected, rtol=1e-5, atol=1e-6)
+
+    def test_fade_windows_cached(self):
+        """Test that fade windows are built once per overlap, device and dtype"""
+        first = voice_converter.fade_windows(16, torch.device("cpu"), torch.float32)
+        second = voice_converter.fade_windows(16, torch.device("cpu"), torch.float32)
+        half = voice_converter.fade_windows(16, torch.device("cpu"), torch.float16)
+
+        assert first is second
+        assert half[0].dtype == torch.float16
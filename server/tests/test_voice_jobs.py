@@ -0,0 +1,57 @@
+import pytest
+from concurrent.futures import Future
+from voice_jobs import FeatureJobs
+
+
+@pytest.mark.unit
+class TestFeatureJobs:
+    """Test status tracking of background voice feature extraction"""
+
+    def test_job_lifecycle(self):
+        """Test queued -> running -> ready transitions"""
+        jobs = FeatureJobs()
+        future = Future()
+        jobs.start("voice-1", lambda: future)
+        assert jobs.status("voice-1")["status"] == "queued"
+
+        jobs.mark_running("voice-1")
+        assert jobs.status("voice-1")["status"] == "running"
+
+        future.set_result(None)
+        assert jobs.status("voice-1")["status"] == "ready"
+        assert jobs.status("voice-1")["error"] is None
+
+    def test_failed_job_keeps_error(self):
+        """Test that extraction errors are reported in the job status"""
+        jobs = FeatureJobs()
+        future = Future()
+        jobs.start("voice-1", lambda: future)
+        future.set_exception(RuntimeError("decode failed"))
+
+        status = jobs.status("voice-1")
+        assert status["status"] == "failed"
+        assert status["error"] == "decode failed"
+
+    def test_forget_and_bound(self):
+        """Test that deleted and old jobs are dropped"""
+        jobs = FeatureJobs(max_items=2)
+        for voice_id in ("a", "b", "c"):
+            done = Future()
+            done.set_result(None)
+            jobs.start(voice_id, lambda: done)
+        assert jobs.status("a") is None
+        jobs.forget("b")
+        assert jobs.status("b") is None
+        assert jobs.status("c")["status"] == "ready"
+
+    def test_forgotten_job_not_revived(self):
+        """Test that a job forgotten while running is not re-added when it finishes"""
+        jobs = FeatureJobs()
+        future = Future()
+        jobs.start("voice-1", lambda: future)
+        jobs.forget("voice-1")
+
+        jobs.mark_running("voice-1")
+        future.set_result(None)
+
+        assert jobs.status("voice-1") is None
@@ -0,0 +1,136 @@
+import pytest
+import asyncio
+import os
+import threading
+from voice_store import TTLCache, VoiceStore
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeClient:
+    """Stands in for httpx.AsyncClient and counts requests"""
+
+    def __init__(self, files):
+        self.files = files
+        self.requests = []
+
+    async def get(self, url):
+        self.requests.append(url)
+        await asyncio.sleep(0.01)
+        return FakeResponse(self.files[url])
+
+
+@pytest.mark.unit
+class TestVoiceStore:
+    """Test the on-disk custom voice reference store"""
+
+    def test_repeat_use_does_not_download_again(self, tmp_path):
+        """Test that a cached voice is served from disk, also after a restart"""
+        client = FakeClient({"https://x/voice_a.mp3": b"voice-a"})
+        store = VoiceStore(cache_dir=str(tmp_path), client=client)
+
+        async def use():
+            async with store.reference("https://x/voice_a.mp3") as path:
+                with open(path, "rb") as f:
+                    return path, f.read()
+
+        path, content = asyncio.run(use())
+        assert content == b"voice-a"
+        assert path.endswith(".mp3")
+        assert asyncio.run(use())[0] == path
+        assert client.requests == ["https://x/voice_a.mp3"]
+
+        reopened = VoiceStore(cache_dir=str(tmp_path), client=client)
+        assert asyncio.run(reopened.acquire("https://x/voice_a.mp3")) == path
+        assert client.requests == ["https://x/voice_a.mp3"]
+
+    def test_concurrent_misses_share_one_download(self, tmp_path):
+        """Test that simultaneous requests for a new voice download it once"""
+        client = FakeClient({"https://x/a.wav": b"a"})
+        store = VoiceStore(cache_dir=str(tmp_path), client=client)
+
+        async def main():
+            return await asyncio.gather(*[store.acquire("https://x/a.wav") for _ in range(3)])
+
+        assert len(set(asyncio.run(main()))) == 1
+        assert len(client.requests) == 1
+        assert store.stats()["pinned"] == 1
+
+    def test_lru_eviction_skips_pinned_files(self, tmp_path):
+        """Test that the size bound evicts the least recently used unpinned file"""
+        client = FakeClient({"https://x/a.wav": b"aaaa", "https://x/b.wav": b"bbbb", "https://x/c.wav": b"cccc"})
+        store = VoiceStore(cache_dir=str(tmp_path), max_bytes=8, client=client)
+
+        async def main():
+            pinned = await store.acquire("https://x/a.wav")
+            async with store.reference("https://x/b.wav"):
+                pass
+            async with store.reference("https://x/c.wav"):
+                pass
+            return pinned
+
+        pinned = asyncio.run(main())
+        assert os.path.exists(pinned)
+        assert store.stats()["evictions"] == 1
+        assert store.stats()["bytes"] == 8
+        asyncio.run(store.acquire("https://x/b.wav"))
+        assert client.requests.count("https://x/b.wav") == 2
+
+    def test_download_written_off_event_loop(self, tmp_path):
+        """Test that downloaded files and the index are written on another thread"""
+        client = FakeClient({"https://x/a.wav": b"a"})
+        store = VoiceStore(cache_dir=str(tmp_path), client=client)
+        threads = []
+        store_file = store._store
+        store._store = lambda url, content: threads.append(threading.current_thread()) or store_file(url, content)
+
+        path = asyncio.run(store.acquire("https://x/a.wav"))
+
+        assert threads and threads[0] is not threading.main_thread()
+        assert os.path.exists(path)
+
+    def test_put_stores_uploaded_content(self, tmp_path):
+        """Test that uploaded content is served without a download"""
+        client = FakeClient({})
+        store = VoiceStore(cache_dir=str(tmp_path), client=client)
+        path = store.put("https://x/new.wav", b"uploaded")
+
+        assert store.peek("https://x/new.wav") == path
+        assert asyncio.run(store.acquire("https://x/new.wav")) == path
+        assert client.requests == []
+
+    def test_discard_removes_file(self, tmp_path):
+        """Test that a deleted voice is no longer served"""
+        client = FakeClient({"https://x/a.wav": b"a"})
+        store = VoiceStore(cache_dir=str(tmp_path), client=client)
+        path = asyncio.run(store.acquire("https://x/a.wav"))
+        store.release(path)
+        store.discard("https://x/a.wav")
+
+        assert not os.path.exists(path)
+        asyncio.run(store.acquire("https://x/a.wav"))
+        assert len(client.requests) == 2
+
+
+@pytest.mark.unit
+class TestTTLCache:
+    """Test the voice metadata cache"""
+
+    def test_entries_expire_and_invalidate(self):
+        """Test TTL expiry and predicate invalidation"""
+        now = [0.0]
+        cache = TTLCache(ttl=10, clock=lambda: now[0])
+        cache.put(("v1", "u1"), {"name": "A"})
+        cache.put(("v2", "u2"), {"name": "B"})
+        assert cache.get(("v1", "u1")) == {"name": "A"}
+
+        cache.invalidate(lambda key: key[1] == "u1")
+        assert cache.get(("v1", "u1")) is None
+        now[0] = 11
+        assert cache.get(("v2", "u2")) is None
@@ -0,0 +1,55 @@
+import pytest
+from warmup import Warmup
+
+
+@pytest.mark.unit
+class TestWarmup:
+    """Test the startup warmup runner"""
+
+    def test_runs_steps_in_order(self):
+        """Test that steps run in order and the worker becomes ready"""
+        calls = []
+        warmup = Warmup()
+        warmup.add("frontend", calls.append, "frontend")
+        warmup.add("tts", calls.append, "tts")
+        assert not warmup.ready
+        assert warmup.status()["state"] == "pending"
+
+        warmup.run()
+
+        assert calls == ["frontend", "tts"]
+        assert warmup.ready
+        status = warmup.status()
+        assert status["completed"] == status["total"] == 2
+        assert [step["step"] for step in status["steps"]] == ["frontend", "tts"]
+
+    def test_failed_step_does_not_block_readiness(self):
+        """Test that a failing step is reported and the remaining steps still run"""
+        calls = []
+
+        def broken():
+            raise RuntimeError("no checkpoint")
+
+        warmup = Warmup()
+        warmup.add("vc", broken)
+        warmup.add("tts", calls.append, "tts")
+        warmup.run()
+
+        assert warmup.ready
+        assert calls == ["tts"]
+        failed = warmup.status()["steps"][0]
+        assert (failed["step"], failed["status"], failed["error"]) == ("vc", "failed", "no checkpoint")
+
+    def test_background_start(self):
+        """Test that start runs the steps on a thread"""
+        warmup = Warmup()
+        warmup.add("noop", lambda: None)
+        warmup.start()
+
+        assert warmup.wait(timeout=5)
+
+    def test_skip(self):
+        """Test that a disabled warmup reports ready immediately"""
+        warmup = Warmup()
+        warmup.skip()
+        assert warmup.ready
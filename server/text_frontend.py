@@ -0,0 +1,104 @@
+"""
+Fused text frontend: abbreviations -> numbers -> G2P.
+
+Produces exactly ``convert_text(num_convert(short_convert(text)))`` but
+tokenizes the text once. Abbreviations and spelled-out times are expanded in
+one scan of the whole text (times can span whitespace). Each
+whitespace-delimited token then goes through number verbalization, NFC
+normalization and G2P in one memoized step. Digit runs never cross
+whitespace and NFC never composes across it, so working per token gives the
+same result as the three whole-string passes.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional
+
+import g2p
+import num2sinhala
+import short2sinhala
+
+TOKEN_PATTERN = re.compile(r"\S+|\s+")
+DIGIT_PATTERN = re.compile(r"\d")
+
+
+@dataclass
+class FrontendOutput:
+    text: str
+    normalized: str
+    phonemes: str
+    token_ids: Optional[List[int]] = None
+
+
+def normalize_token(token: str) -> str:
+    """Verbalize the numbers in one non-whitespace token."""
+    return num2sinhala.num_convert(token) if DIGIT_PATTERN.search(token) else token
+
+
+@lru_cache(maxsize=g2p.WORD_CACHE_SIZE)
+def verbalize_token(token: str) -> tuple:
+    """
+    Run one non-whitespace token through numbers and G2P.
+
+    Returns:
+        tuple: (normalized_token, phonemes)
+    """
+    normalized = normalize_token(token)
+    nfc = g2p.normalize_text(normalized)
+    if " " not in nfc:
+        return normalized, g2p.word_to_ipa(nfc)
+    # Number words contain spaces; split again exactly like convert_text does
+    return normalized, "".join(
+        piece if piece.isspace() else g2p.word_to_ipa(piece)
+        for piece in TOKEN_PATTERN.findall(nfc)
+    )
+
+
+class TextFrontend:
+    """
+    Text to phonemes (and optionally Tacotron token IDs) in one pipeline.
+
+    Args:
+        tokenizer: Coqui ``TTSTokenizer`` used to turn phonemes into token IDs.
+            Without one, ``token_ids`` is None.
+    """
+
+    def __init__(self, tokenizer=None):
+        self.tokenizer = tokenizer
+        self.abbreviations = short2sinhala.converter
+
+    def normalize(self, text: str) -> str:
+        """Abbreviation and number expansion only (``num_convert(short_convert(text))``), without G2P."""
+        expanded = self.abbreviations.convert(text)
+        return "".join(
+            token if token.isspace() else normalize_token(token)
+            for token in TOKEN_PATTERN.findall(expanded)
+        )
+
+    def phonemize(self, normalized: str) -> str:
+        """G2P only, for text that is already normalized (``convert_text``)."""
+        return g2p.convert_text(normalized)
+
+    def process(self, text: str, with_ids: bool = True) -> FrontendOutput:
+        expanded = self.abbreviations.convert(text)
+        normalized = []
+        phonemes = []
+        for token in TOKEN_PATTERN.findall(expanded):
+            if token.isspace():
+                normalized.append(token)
+                phonemes.append(token)
+            else:
+                token_normalized, token_phonemes = verbalize_token(token)
+                normalized.append(token_normalized)
+                phonemes.append(token_phonemes)
+
+        phoneme_text = "".join(phonemes)
+        token_ids = None
+        if with_ids and self.tokenizer is not None:
+            token_ids = self.tokenizer.text_to_ids(phoneme_text)
+        return FrontendOutput(text, "".join(normalized), phoneme_text, token_ids)
+
+    def process_batch(self, texts: List[str], with_ids: bool = True) -> List[FrontendOutput]:
+        """Process several texts; repeated words across the batch share the token memo."""
+        return [self.process(text, with_ids) for text in texts]
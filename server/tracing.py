@@ -0,0 +1,252 @@
+"""
+Lightweight per-stage tracing and Prometheus metrics.
+
+A ``Trace`` is attached to each HTTP request through a context variable.
+``span(stage)`` blocks anywhere below it (event loop, inference pool threads,
+which copy the context) record their duration into the trace. Each duration
+is also observed in the ``tts_stage_seconds`` histogram, labelled with the
+stage and the request's voice, so ``/metrics`` shows where time goes per
+voice. Work done by a BatchScheduler worker for several requests is recorded
+into a batch trace and then credited to every request in the batch (see
+``collect`` and ``Trace.merge``).
+
+A span costs two ``perf_counter`` calls, a list append and one locked
+histogram update, so tracing stays on in production. Metrics are rendered in
+the Prometheus text format without extra dependencies.
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; covers sub-millisecond G2P up to long voice conversions
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            return sum(series[:-1]) if series else 0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = sorted((key, list(series)) for key, series in self._series.items())
+        for key, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', le)])} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {series[-1]!r}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+STAGE_SECONDS = registry.histogram(
+    "tts_stage_seconds", "Time spent in each synthesis pipeline stage", ("stage", "voice"))
+REQUEST_SECONDS = registry.histogram(
+    "tts_request_seconds", "HTTP request latency", ("route", "method", "status"))
+FALLBACKS = registry.counter(
+    "tts_fallback_total", "Requests served by a fallback path", ("voice", "reason"))
+RESULT_CACHE = registry.counter(
+    "tts_result_cache_total", "Synthesis result cache lookups", ("result",))
+
+
+class Trace:
+    """
+    Stage durations of one request (or one batch).
+
+    Args:
+        voice (str): Label for histogram observations. ``None`` only collects
+            durations without observing them (used for batch traces).
+    """
+
+    __slots__ = ("voice", "spans")
+
+    def __init__(self, voice=""):
+        self.voice = voice
+        self.spans = []
+
+    def add(self, stage, seconds):
+        self.spans.append((stage, seconds))
+        if self.voice is not None:
+            STAGE_SECONDS.observe(seconds, stage=stage, voice=self.voice)
+
+    def merge(self, other):
+        """Credit another trace's stages (e.g. a shared batch) to this one."""
+        for stage, seconds in other.spans:
+            self.add(stage, seconds)
+
+    def server_timing(self):
+        """Format as a ``Server-Timing`` header value, summing repeated stages."""
+        totals = {}
+        for stage, seconds in self.spans:
+            totals[stage] = totals.get(stage, 0.0) + seconds
+        return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in totals.items())
+
+
+_current_trace = contextvars.ContextVar("trace", default=None)
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def start_trace(voice=""):
+    """Attach a new trace to the current context and return it."""
+    trace = Trace(voice)
+    _current_trace.set(trace)
+    return trace
+
+
+def set_voice(voice):
+    """Label the current request's stages with ``voice`` from now on."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.voice = voice
+
+
+def record(stage, seconds):
+    """Record a duration measured elsewhere against the current trace."""
+    trace = _current_trace.get()
+    if trace is None:
+        STAGE_SECONDS.observe(seconds, stage=stage, voice="")
+    else:
+        trace.add(stage, seconds)
+
+
+@contextmanager
+def span(stage):
+    """Time the enclosed block as ``stage``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+
+@contextmanager
+def collect():
+    """
+    Run the enclosed block under a fresh, non-observing trace and yield it.
+
+    Used by batch workers: the collected spans are merged into each
+    participating request's trace afterwards.
+    """
+    trace = Trace(voice=None)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def instrument(owner, attribute, stage, sync=None):
+    """
+    Replace ``owner.<attribute>`` with a wrapper that runs it inside ``span(stage)``.
+
+    Used to time model calls (Tacotron2, HiFi-GAN, Whisper, DiT, BigVGAN)
+    without touching third-party code. Pass ``sync`` (e.g.
+    ``torch.cuda.synchronize``) so queued GPU work is charged to this stage.
+    """
+    fn = getattr(owner, attribute)
+
+    def traced(*args, **kwargs):
+        with span(stage):
+            result = fn(*args, **kwargs)
+            if sync is not None:
+                sync()
+            return result
+
+    traced.__wrapped__ = fn
+    setattr(owner, attribute, traced)
+    return traced
@@ -0,0 +1,285 @@
+"""
+Cross-request batching for TTS inference.
+
+Concurrent /synthesize requests submit their phonemized text to a
+BatchScheduler, which groups whatever arrives within a short window into a
+single call of its batch function and hands each caller back its own result.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import tracing
+
+
+class _Call:
+    """A one-off function queued to run alone on the scheduler's worker thread."""
+
+    __slots__ = ("fn", "args", "kwargs")
+
+    def __init__(self, fn, args, kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+
+class BatchScheduler:
+    """
+    Collects items from concurrent callers and runs them through ``batch_fn``
+    together.
+
+    A batch is flushed as soon as ``max_batch_size`` items are waiting, or when
+    the first item of the batch has waited ``max_wait_ms``. ``batch_fn`` takes a
+    list of items and must return a list of results in the same order. Batches
+    run on a single worker thread, so the model behind ``batch_fn`` is never
+    used concurrently.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=4, max_wait_ms=15.0, name="batch"):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+        # Metrics
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.errors = 0
+        self.batch_size_counts = {}
+        self.max_queue_depth = 0
+        self._queue_waits = deque(maxlen=1000)
+        self._batch_times = deque(maxlen=1000)
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run_forever, name=f"{self.name}-scheduler", daemon=True
+                )
+                self._worker.start()
+
+    def submit(self, item):
+        """Queue an item and return a concurrent.futures.Future for its result."""
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((item, future, time.perf_counter(), tracing.current_trace()))
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+        return future
+
+    async def run(self, item):
+        """Submit an item and await its result without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(item))
+
+    def run_sync(self, item):
+        """Submit an item and block until its result is ready."""
+        return self.submit(item).result()
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Run ``fn(*args, **kwargs)`` on the worker thread, between batches.
+
+        For other work on the model behind ``batch_fn`` (e.g. precomputing
+        features) that must not run concurrently with it. Returns a
+        concurrent.futures.Future.
+        """
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((_Call(fn, args, kwargs), future, time.perf_counter(), None))
+        return future
+
+    def _run_forever(self):
+        pending = None
+        while True:
+            entry = pending or self._queue.get()
+            pending = None
+            if isinstance(entry[0], _Call):
+                self._run_call(entry)
+                continue
+
+            batch = [entry]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if isinstance(entry[0], _Call):
+                    # Runs right after this batch
+                    pending = entry
+                    break
+                batch.append(entry)
+            self._run_batch(batch)
+
+    def _run_call(self, entry):
+        call, future, _, _ = entry
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(call.fn(*call.args, **call.kwargs))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _run_batch(self, batch):
+        # Drop callers that gave up while waiting
+        batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        started = time.perf_counter()
+        items = [item for item, _, _, _ in batch]
+        # Model stages timed inside batch_fn are credited to every caller
+        with tracing.collect() as batch_trace:
+            try:
+                results = self.batch_fn(items)
+            except Exception as e:
+                if len(batch) == 1:
+                    results = [e]
+                else:
+                    # Re-run one by one so a single bad input doesn't fail the others
+                    results = []
+                    for item, future, _, _ in batch:
+                        try:
+                            results.append(self.batch_fn([item])[0])
+                        except Exception as item_error:
+                            results.append(item_error)
+
+        finished = time.perf_counter()
+        results = list(results)
+        if len(results) != len(batch):
+            # Callers without a result would otherwise wait forever
+            error = RuntimeError(f"{self.name}: batch_fn returned {len(results)} results for {len(batch)} items")
+            results = results[:len(batch)] + [error] * (len(batch) - len(results))
+        for _, _, queued_at, trace in batch:
+            if trace is not None:
+                trace.add(f"{self.name}_queue", started - queued_at)
+                trace.merge(batch_trace)
+
+        for (_, future, _, _), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+        with self._stats_lock:
+            self.batches += 1
+            self.items += len(batch)
+            self.errors += sum(isinstance(result, Exception) for result in results)
+            self.batch_size_counts[len(batch)] = self.batch_size_counts.get(len(batch), 0) + 1
+            self._batch_times.append(finished - started)
+            self._queue_waits.extend(started - queued_at for _, _, queued_at, _ in batch)
+
+    @staticmethod
+    def _percentile_ms(samples, q):
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1))))
+        return round(ordered[index] * 1000, 2)
+
+    def stats(self):
+        """Return queue-depth, batch-size and latency metrics."""
+        with self._stats_lock:
+            queue_waits = list(self._queue_waits)
+            batch_times = list(self._batch_times)
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+                "batches": self.batches,
+                "items": self.items,
+                "errors": self.errors,
+                "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "batch_size_counts": dict(sorted(self.batch_size_counts.items())),
+                "queue_wait_ms": {
+                    "p50": self._percentile_ms(queue_waits, 50),
+                    "p99": self._percentile_ms(queue_waits, 99),
+                },
+                "batch_time_ms": {
+                    "p50": self._percentile_ms(batch_times, 50),
+                    "p99": self._percentile_ms(batch_times, 99),
+                },
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+
+def synthesize_batch(synthesizer, texts):
+    """
+    Synthesize several phonemized texts with a shared HiFi-GAN pass.
+
+    Tacotron2 decodes autoregressively and decides per utterance when to stop,
+    so the acoustic model still runs sentence by sentence. The resulting mel
+    spectrograms are padded to a common length and vocoded as one batch, then
+    trimmed and reassembled exactly like ``Synthesizer.tts`` does (sentence
+    split, silence trimming, 10000 samples of silence after each sentence).
+
+    Returns:
+        list: one waveform (list of floats) per input text
+    """
+    if len(texts) == 1 or synthesizer.vocoder_model is None:
+        return [synthesizer.tts(text) for text in texts]
+
+    import numpy as np
+    import torch
+    from TTS.tts.utils.synthesis import synthesis, trim_silence
+
+    tts_model = synthesizer.tts_model
+    vocoder_ap = synthesizer.vocoder_ap
+    if synthesizer.vocoder_config["audio"]["sample_rate"] != tts_model.ap.sample_rate:
+        # Mismatched rates need per-utterance interpolation; keep the stock path
+        return [synthesizer.tts(text) for text in texts]
+
+    device = "cuda" if synthesizer.use_cuda else "cpu"
+
+    # Acoustic model, one sentence at a time
+    sentence_owner = []
+    mels = []
+    for index, text in enumerate(texts):
+        for sentence in synthesizer.split_into_sentences(text):
+            outputs = synthesis(
+                model=tts_model,
+                text=sentence,
+                CONFIG=synthesizer.tts_config,
+                use_cuda=synthesizer.use_cuda,
+                use_griffin_lim=False,
+            )
+            mel = outputs["outputs"]["model_outputs"][0].detach().cpu().numpy()
+            mel = tts_model.ap.denormalize(mel.T).T
+            mels.append(vocoder_ap.normalize(mel.T))  # [C, T]
+            sentence_owner.append(index)
+
+    # One padded vocoder batch; padding uses the quietest frame value
+    lengths = [mel.shape[1] for mel in mels]
+    pad_value = min(float(mel.min()) for mel in mels)
+    batch = np.full((len(mels), mels[0].shape[0], max(lengths)), pad_value, dtype=np.float32)
+    for i, mel in enumerate(mels):
+        batch[i, :, :mel.shape[1]] = mel
+    with torch.no_grad():
+        waveforms = synthesizer.vocoder_model.inference(torch.from_numpy(batch).to(device))
+    waveforms = waveforms.cpu().numpy().reshape(len(mels), -1)
+
+    hop_length = vocoder_ap.hop_length
+    do_trim = "do_trim_silence" in synthesizer.tts_config.audio and synthesizer.tts_config.audio["do_trim_silence"]
+    results = [[] for _ in texts]
+    for owner, length, waveform in zip(sentence_owner, lengths, waveforms):
+        waveform = waveform[:length * hop_length]
+        if do_trim:
+            waveform = trim_silence(waveform, tts_model.ap)
+        results[owner] += list(waveform)
+        results[owner] += [0] * 10000
+    return results
@@ -0,0 +1,260 @@
+"""
+Export the voice conversion models to TorchScript and ONNX for CPU inference.
+
+The DiT estimator (dynamic batch and time axes, masked by ``x_lens``),
+CAMPPlus and BigVGAN (weight norm is removed when the vocoder is loaded) are
+traced from a loaded ``VoiceConverter`` and written to ``--out-dir`` with a
+``manifest.json``. The server loads them with ``VC_BACKEND=torchscript`` or
+``VC_BACKEND=onnx``; Whisper and the length regulator stay eager.
+
+Usage (from server/):
+    python -m vc.export --format torchscript onnx --out-dir vc/exported
+"""
+
+import argparse
+import inspect
+import json
+import os
+import sys
+
+import torch
+from torch import nn
+
+COMPONENTS = ("estimator", "campplus", "vocoder")
+FORMATS = ("torchscript", "onnx")
+EXTENSIONS = {"torchscript": ".pt", "onnx": ".onnx"}
+MANIFEST_NAME = "manifest.json"
+# Bumped when exported graphs change behaviour; 2 masks x_lens against the
+# padded input width, which length buckets need
+EXPORT_VERSION = 2
+
+# Input/output names and dynamic axes of each exported graph
+SPECS = {
+    "estimator": {
+        "inputs": ["x", "prompt_x", "x_lens", "t", "style", "cond"],
+        "outputs": ["velocity"],
+        "dynamic_axes": {
+            "x": {0: "batch", 2: "frames"},
+            "prompt_x": {0: "batch", 2: "frames"},
+            "x_lens": {0: "batch"},
+            "t": {0: "batch"},
+            "style": {0: "batch"},
+            "cond": {0: "batch", 1: "frames"},
+            "velocity": {0: "batch", 2: "frames"},
+        },
+    },
+    "campplus": {
+        "inputs": ["fbank"],
+        "outputs": ["embedding"],
+        "dynamic_axes": {"fbank": {0: "batch", 1: "frames"}, "embedding": {0: "batch"}},
+    },
+    "vocoder": {
+        "inputs": ["mel"],
+        "outputs": ["wave"],
+        "dynamic_axes": {"mel": {0: "batch", 2: "frames"}, "wave": {0: "batch", 2: "samples"}},
+    },
+}
+
+
+class EstimatorExport(nn.Module):
+    """DiT estimator with the positional signature used by BASECFM.velocity."""
+
+    def __init__(self, estimator):
+        super().__init__()
+        self.estimator = estimator
+
+    def forward(self, x, prompt_x, x_lens, t, style, cond):
+        return self.estimator(x, prompt_x, x_lens, t, style, cond)
+
+
+def example_inputs(converter, component, frames=96, batch=2):
+    """
+    Tracing inputs for ``component`` of a loaded converter.
+
+    The estimator is traced with a CFG-sized batch whose items have different
+    lengths, so the masking path is part of the graph.
+    """
+    estimator = converter.model.cfm.estimator
+    n_mels = estimator.in_channels
+    if component == "campplus":
+        return (torch.randn(1, 200, 80),)
+    if component == "vocoder":
+        return (torch.randn(1, n_mels, frames),)
+    style = converter.campplus_model(torch.randn(1, 200, 80)).repeat(batch, 1)
+    return (
+        torch.randn(batch, n_mels, frames),
+        torch.randn(batch, n_mels, frames),
+        torch.tensor([frames] + [frames - 16] * (batch - 1)),
+        torch.rand(batch),
+        style,
+        torch.randn(batch, frames, estimator.cond_projection.in_features),
+    )
+
+
+def export_component(module, inputs, path, fmt, spec, opset=17):
+    """Trace ``module`` on ``inputs`` and save it to ``path`` as ``fmt``."""
+    module = module.eval()
+    with torch.no_grad():
+        if fmt == "torchscript":
+            traced = torch.jit.trace(module, inputs, check_trace=False)
+            torch.jit.save(torch.jit.freeze(traced), path)
+        elif fmt == "onnx":
+            options = {}
+            if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+                # Newer torch defaults to the dynamo exporter, which ignores dynamic_axes
+                options["dynamo"] = False
+            torch.onnx.export(
+                module, inputs, path,
+                input_names=spec["inputs"],
+                output_names=spec["outputs"],
+                dynamic_axes=spec["dynamic_axes"],
+                opset_version=opset,
+                do_constant_folding=True,
+                **options
+            )
+        else:
+            raise ValueError(f"Unknown export format: {fmt}")
+    return path
+
+
+def export_models(converter, out_dir, formats=FORMATS, components=COMPONENTS, opset=17):
+    """
+    Export ``components`` of a CPU fp32 converter to ``out_dir``.
+
+    Returns:
+        dict: the manifest written next to the graphs
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    modules = {
+        "estimator": EstimatorExport(converter.model.cfm.estimator),
+        "campplus": converter.campplus_model,
+        "vocoder": converter.vocoder_fn,
+    }
+    manifest = {
+        "version": EXPORT_VERSION,
+        "feature_tag": converter.feature_tag,
+        "sr": converter.sr,
+        "hop_length": converter.hop_length,
+        "files": {fmt: {} for fmt in formats},
+    }
+    for component in components:
+        inputs = example_inputs(converter, component)
+        for fmt in formats:
+            name = component + EXTENSIONS[fmt]
+            print(f"Exporting {component} to {fmt}...")
+            export_component(modules[component], inputs, os.path.join(out_dir, name), fmt, SPECS[component], opset)
+            manifest["files"][fmt][component] = name
+
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_runner(path, fmt, device=torch.device("cpu"), threads=None):
+    """
+    Load an exported graph as a callable taking and returning tensors.
+
+    Args:
+        threads (int): ONNX Runtime intra-op threads; default lets it decide.
+    """
+    if fmt == "torchscript":
+        module = torch.jit.load(path, map_location=device)
+        module.eval()
+        return module
+    if fmt != "onnx":
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    import onnxruntime as ort
+    options = ort.SessionOptions()
+    if threads:
+        options.intra_op_num_threads = threads
+    session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+    names = [node.name for node in session.get_inputs()]
+
+    def run(*tensors):
+        feeds = {name: tensor.detach().cpu().numpy() for name, tensor in zip(names, tensors)}
+        return torch.from_numpy(session.run(None, feeds)[0]).to(device)
+
+    return run
+
+
+class ExportedGraph(nn.Module):
+    """Module wrapper around an exported graph, so it can replace a submodule."""
+
+    def __init__(self, runner):
+        super().__init__()
+        self.runner = runner
+
+    def forward(self, *inputs):
+        # The graphs are fp32; keep autocast from touching a TorchScript graph
+        with torch.autocast(device_type=inputs[0].device.type, enabled=False):
+            return self.runner(*(tensor.float() for tensor in inputs))
+
+
+class ExportedEstimator(ExportedGraph):
+    """
+    Stand-in for the DiT estimator. ``BASECFM.velocity`` passes a single
+    ``x_lens`` and timestep for the whole CFG batch; the graph wants one per item.
+    """
+
+    def __init__(self, runner, in_channels):
+        super().__init__(runner)
+        self.in_channels = in_channels
+
+    def forward(self, x, prompt_x, x_lens, t, style, cond, *unused):
+        batch = x.size(0)
+        x_lens = x_lens.reshape(-1).expand(batch) if x_lens.numel() != batch else x_lens
+        t = t.reshape(-1).expand(batch) if t.numel() != batch else t.reshape(-1)
+        with torch.autocast(device_type=x.device.type, enabled=False):
+            return self.runner(x.float(), prompt_x.float(), x_lens.long(), t.float(), style.float(), cond.float())
+
+
+def load_exported(converter, backend, export_dir, threads=None):
+    """
+    Swap the converter's estimator, CAMPPlus and vocoder for exported graphs.
+
+    Raises:
+        ValueError: if the graphs were exported from a different checkpoint
+            or by an older version of this module
+    """
+    with open(os.path.join(export_dir, MANIFEST_NAME), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != EXPORT_VERSION:
+        raise ValueError(f"Exported models in {export_dir} are from an older format; re-run python -m vc.export")
+    if manifest["feature_tag"] != converter.feature_tag:
+        raise ValueError(f"Exported models in {export_dir} were built from a different VC checkpoint")
+    files = manifest["files"].get(backend, {})
+    missing = [component for component in COMPONENTS if component not in files]
+    if missing:
+        raise ValueError(f"No {backend} export of {', '.join(missing)} in {export_dir}")
+
+    def runner(component):
+        return load_runner(os.path.join(export_dir, files[component]), backend, converter.device, threads)
+
+    estimator = converter.model.cfm.estimator
+    converter.model.cfm.estimator = ExportedEstimator(runner("estimator"), estimator.in_channels)
+    converter.campplus_model = ExportedGraph(runner("campplus"))
+    converter.vocoder_fn = ExportedGraph(runner("vocoder"))
+    print(f"Loaded {backend} VC graphs from {export_dir}")
+
+
+def main(argv=None):
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from vc.voice_converter import VoiceConverter
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checkpoint", default="vc/checkpoints/Indic-seed-uvit-whisper-small-wavenet.pth")
+    parser.add_argument("--config", default="vc/checkpoints/config_dit_mel_seed_uvit_whisper_small_wavenet.yml")
+    parser.add_argument("--out-dir", default="vc/exported")
+    parser.add_argument("--format", nargs="+", default=list(FORMATS), choices=FORMATS)
+    parser.add_argument("--components", nargs="+", default=list(COMPONENTS), choices=COMPONENTS)
+    parser.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args(argv)
+
+    converter = VoiceConverter(args.checkpoint, args.config, device=torch.device("cpu"), fp16=False)
+    export_models(converter, args.out_dir, args.format, args.components, args.opset)
+    print(f"Wrote {args.out_dir}/{MANIFEST_NAME}")
+
+
+if __name__ == "__main__":
+    main()
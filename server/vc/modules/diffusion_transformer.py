@@ -7,6 +7,7 @@ from modules.wavenet import WN
 from modules.commons import sequence_mask
 
 from torch.nn.utils import weight_norm
+from functools import lru_cache
 
 # Copyright (c) Meta Platforms, Inc. and affiliates.
 # All rights reserved.
@@ -404,6 +405,22 @@ class FinalLayer(nn.Module):
         x = self.linear(x)
         return x
 
+@lru_cache(maxsize=64)
+def mask_positions(length, device):
+    """Frame indices ``0..length-1``, built once per (bucketed) length and device."""
+    return torch.arange(length, device=device)
+
+
+def length_mask(lengths, max_length):
+    """
+    (B, max_length) mask of valid frames. Inputs padded to a length bucket
+    reuse the cached positions; traced graphs keep the length dynamic.
+    """
+    if torch.jit.is_tracing() or torch.onnx.is_in_onnx_export():
+        return sequence_mask(lengths, max_length)
+    return mask_positions(max_length, lengths.device)[None, :] < lengths[:, None]
+
+
 class DiT(torch.nn.Module):
     def __init__(
         self,
@@ -515,17 +532,25 @@ class DiT(torch.nn.Module):
             x_in = torch.cat([style.unsqueeze(1), x_in], dim=1)
         if self.time_as_token:
             x_in = torch.cat([t1.unsqueeze(1), x_in], dim=1)
-        x_mask = sequence_mask(x_lens + self.style_as_token + self.time_as_token).to(x.device).unsqueeze(1)
+        # Masked against the full (possibly padded) width rather than max(x_lens); int() keeps
+        # traced graphs from adding a Python bool to a tensor
+        x_mask = length_mask(x_lens + int(self.style_as_token) + int(self.time_as_token), x_in.size(1)).to(x.device).unsqueeze(1)
         input_pos = self.input_pos[:x_in.size(1)]  # (T,)
-        x_mask_expanded = x_mask[:, None, :].repeat(1, 1, x_in.size(1), 1) if not self.is_causal else None
+        # Broadcast view: no (B, 1, T, T) mask is materialized per estimator call
+        x_mask_expanded = x_mask[:, None, :].expand(-1, -1, x_in.size(1), -1) if not self.is_causal else None
         x_res = self.transformer(x_in, t1.unsqueeze(1), input_pos, x_mask_expanded)
         x_res = x_res[:, 1:] if self.time_as_token else x_res
         x_res = x_res[:, 1:] if self.style_as_token else x_res
+        return self.output(x, x_res, x_mask, t, t1)
+
+    def output(self, x, x_res, x_mask, t, t1):
+        """Long skip connection and final layers, from the transformer output to the velocity."""
         if self.long_skip_connection:
             x_res = self.skip_linear(torch.cat([x_res, x], dim=-1))
         if self.final_layer_type == 'wavenet':
             x = self.conv1(x_res)
-            x = x.transpose(1, 2)
+            # Zero padded frames so the WaveNet convolutions see the same edges as unpadded input
+            x = x.transpose(1, 2) * x_mask
             t2 = self.t_embedder2(t)
             x = self.wavenet(x, x_mask, g=t2.unsqueeze(2)).transpose(1, 2) + self.res_projection(
                 x_res)  # long residual connection
@@ -534,4 +559,69 @@ class DiT(torch.nn.Module):
         else:
             x = self.final_mlp(x_res)
             x = x.transpose(1, 2)
-        return x
\ No newline at end of file
+        return x
+
+    def session(self, prompt_x, x_lens, style, cond):
+        """
+        Precompute the condition-only work of ``forward`` for a whole solve.
+
+        Returns:
+            DiTSession: ``session(x, t)`` equals ``self(x, prompt_x, x_lens, t, style, cond)``
+        """
+        return DiTSession(self, prompt_x, x_lens, style, cond)
+
+
+class DiTSession:
+    """
+    A DiT bound to fixed conditions, as in one CFM solve where only ``x`` and
+    ``t`` change between estimator calls.
+
+    The content projection, the style broadcast, the masks and the condition
+    half of ``cond_x_merge_linear`` (a Linear over the concatenation
+    ``[x, prompt_x, cond, style]``, so it splits into an ``x`` term and a
+    constant) are computed once; each call is then one small matmul on ``x``
+    plus the transformer and output layers. Quantized merge layers and
+    style/time tokens keep the concatenation but still reuse the rest.
+    """
+
+    def __init__(self, dit, prompt_x, x_lens, style, cond):
+        self.dit = dit
+        B, _, T = prompt_x.size()
+        if dit.style_as_token or dit.time_as_token:
+            self.inputs = (prompt_x, x_lens, style, cond)
+            return
+        self.inputs = None
+
+        parts = [prompt_x.transpose(1, 2), dit.cond_projection(cond)]
+        if dit.transformer_style_condition:
+            parts.append(style[:, None, :].expand(-1, T, -1))
+        conditions = torch.cat(parts, dim=-1)
+
+        merge = dit.cond_x_merge_linear
+        if isinstance(merge, nn.Linear):
+            self.x_weight = merge.weight[:, :dit.in_channels].contiguous()
+            self.merged_conditions = F.linear(conditions, merge.weight[:, dit.in_channels:], merge.bias)
+            self.conditions = None
+        else:
+            self.conditions = conditions
+
+        if x_lens is None:
+            x_lens = torch.full((B,), T, dtype=torch.long, device=prompt_x.device)
+        self.x_mask = length_mask(x_lens, T).to(prompt_x.device).unsqueeze(1)
+        self.attention_mask = self.x_mask[:, None, :].expand(-1, -1, T, -1) if not dit.is_causal else None
+        self.input_pos = dit.input_pos[:T]
+
+    def __call__(self, x, t):
+        dit = self.dit
+        if self.inputs is not None:
+            prompt_x, x_lens, style, cond = self.inputs
+            return dit(x, prompt_x, x_lens, t, style, cond)
+
+        t1 = dit.t_embedder(t)
+        x = x.transpose(1, 2)
+        if self.conditions is None:
+            x_in = F.linear(x, self.x_weight) + self.merged_conditions
+        else:
+            x_in = dit.cond_x_merge_linear(torch.cat([x, self.conditions], dim=-1))
+        x_res = dit.transformer(x_in, t1.unsqueeze(1), self.input_pos, self.attention_mask)
+        return dit.output(x, x_res, self.x_mask, t, t1)
\ No newline at end of file
@@ -1,11 +1,55 @@
+import bisect
+import math
 from abc import ABC
 
 import torch
+import torch.nn.functional as F
 
 from modules.diffusion_transformer import DiT
 
 from tqdm import tqdm
 
+SOLVERS = ("euler", "midpoint", "heun", "rk4", "dpm_multistep")
+T_SCHEDULES = ("uniform", "cosine")
+
+
+def make_t_span(n_timesteps, schedule="uniform", device=None):
+    """
+    Time grid from noise (t=0) to data (t=1).
+
+    "cosine" warps the uniform grid with t -> 1 - cos(pi/2 * t), which puts
+    more of the steps near the noise end where the flow curves most.
+    """
+    t_span = torch.linspace(0, 1, n_timesteps + 1, device=device)
+    if schedule == "cosine":
+        t_span = 1 - torch.cos(torch.pi / 2 * t_span)
+    elif schedule != "uniform":
+        raise ValueError(f"Unknown timestep schedule '{schedule}', expected one of {T_SCHEDULES}")
+    return t_span
+
+
+def make_length_buckets(max_length, smallest=64, ratio=1.25, multiple=16):
+    """
+    Geometric ladder of padded sequence lengths up to ``max_length``.
+
+    Consecutive buckets differ by about ``ratio``, so padding costs at most
+    ~25% extra frames while the estimator only ever sees a few dozen shapes.
+    """
+    buckets = []
+    length = smallest
+    while length < max_length:
+        buckets.append(length)
+        length = max(length + multiple, math.ceil(length * ratio / multiple) * multiple)
+    buckets.append(max_length)
+    return tuple(buckets)
+
+
+def bucket_length(length, buckets):
+    """Smallest bucket holding ``length``; longer inputs keep their own length."""
+    index = bisect.bisect_left(buckets, length)
+    return buckets[index] if index < len(buckets) else length
+
+
 class BASECFM(torch.nn.Module, ABC):
     def __init__(
         self,
@@ -15,6 +59,12 @@ class BASECFM(torch.nn.Module, ABC):
         self.sigma_min = 1e-6
 
         self.estimator = None
+        # Estimator evaluations since construction (a CFG-stacked call counts once)
+        self.nfe = 0
+        # Sorted padded lengths (see make_length_buckets); None runs every input at its own length
+        self.length_buckets = None
+        # Precompute condition-only estimator work once per solve (see velocity_session)
+        self.use_estimator_session = True
 
         self.in_channels = args.DiT.in_channels
 
@@ -26,7 +76,8 @@ class BASECFM(torch.nn.Module, ABC):
             self.zero_prompt_speech_token = False
 
     @torch.inference_mode()
-    def inference(self, mu, x_lens, prompt, style, f0, n_timesteps, temperature=1.0, inference_cfg_rate=0.5):
+    def inference(self, mu, x_lens, prompt, style, f0, n_timesteps, temperature=1.0, inference_cfg_rate=0.5,
+                  solver="euler", t_schedule="uniform", prompt_lens=None):
         """Forward diffusion
 
         Args:
@@ -39,6 +90,15 @@ class BASECFM(torch.nn.Module, ABC):
             spks (torch.Tensor, optional): speaker ids. Defaults to None.
                 shape: (batch_size, spk_emb_dim)
             cond: Not used but kept for future purposes
+            solver (str): ODE solver, one of SOLVERS. Estimator evaluations per
+                step: euler 1, midpoint 2, heun 2, rk4 4, dpm_multistep 1.
+            t_schedule (str): timestep schedule, one of T_SCHEDULES.
+            prompt_lens (torch.Tensor, optional): per-item prompt lengths when
+                several requests with different prompts are padded into one
+                batch. Defaults to the full width of ``prompt`` for every item.
+
+        With ``length_buckets`` set, ``mu`` and the noise are zero-padded to
+        the next bucket for the solve and the result is cut back to T.
 
         Returns:
             sample: generated mel-spectrogram
@@ -46,11 +106,135 @@ class BASECFM(torch.nn.Module, ABC):
         """
         B, T = mu.size(0), mu.size(1)
         z = torch.randn([B, self.in_channels, T], device=mu.device) * temperature
-        t_span = torch.linspace(0, 1, n_timesteps + 1, device=mu.device)
-        # t_span = t_span + (-1) * (torch.cos(torch.pi / 2 * t_span) - 1 + t_span)
-        return self.solve_euler(z, x_lens, prompt, mu, style, f0, t_span, inference_cfg_rate)
+        t_span = make_t_span(n_timesteps, t_schedule, device=mu.device)
+
+        # Pad to the length bucket; x_lens masks the padding, so the first T
+        # frames come out as they would unpadded (the noise is drawn first)
+        padded = bucket_length(T, self.length_buckets) if self.length_buckets else T
+        if padded > T:
+            if x_lens is None:
+                x_lens = torch.full((B,), T, dtype=torch.long, device=mu.device)
+            z = F.pad(z, (0, padded - T))
+            mu = F.pad(mu, (0, 0, 0, padded - T))
+
+        if solver == "euler":
+            x = self.solve_euler(z, x_lens, prompt, mu, style, f0, t_span, inference_cfg_rate, prompt_lens)
+        else:
+            x = self.solve_ode(z, x_lens, prompt, mu, style, f0, t_span, inference_cfg_rate, solver, prompt_lens)
+        return x[..., :T]
+
+    def apply_prompt(self, x, prompt, mu, prompt_lens=None):
+        """
+        Build the prompt input and zero the prompt region of ``x`` (and of
+        ``mu`` if configured).
+
+        Returns:
+            prompt_x: prompt mel placed at the start of each item
+            prompt_mask: (batch_size, 1, mel_timesteps) True inside the prompt
+        """
+        prompt_len = prompt.size(-1)
+        prompt_x = torch.zeros_like(x)
+        prompt_x[..., :prompt_len] = prompt[..., :prompt_len]
+        if prompt_lens is None:
+            prompt_mask = torch.zeros_like(x[:, :1], dtype=torch.bool)
+            prompt_mask[..., :prompt_len] = True
+            if self.zero_prompt_speech_token:
+                mu[..., :prompt_len] = 0
+        else:
+            positions = torch.arange(x.size(-1), device=x.device)
+            prompt_mask = (positions[None, :] < prompt_lens.to(x.device)[:, None]).unsqueeze(1)
+            prompt_x = prompt_x.masked_fill(~prompt_mask, 0)
+            if self.zero_prompt_speech_token:
+                for i, length in enumerate(prompt_lens.tolist()):
+                    mu[i, ..., :length] = 0
+        x.masked_fill_(prompt_mask, 0)
+        return prompt_x, prompt_mask
+
+    def velocity_session(self, prompt_x, x_lens, style, mu, inference_cfg_rate=0.5):
+        """
+        Velocity function ``(x, t) -> dphi/dt`` for one solve, applying
+        classifier-free guidance.
+
+        The CFG-stacked prompt, style and content inputs are built once here
+        rather than at every estimator call, and a DiT estimator additionally
+        precomputes its condition-only work (see ``DiT.session``).
+        """
+        cfg = inference_cfg_rate > 0
+        if cfg:
+            # Original and CFG (null) inputs are processed as one batch
+            prompt_x = torch.cat([prompt_x, torch.zeros_like(prompt_x)], dim=0)
+            x_lens = torch.cat([x_lens, x_lens], dim=0) if x_lens is not None and x_lens.size(0) > 1 else x_lens
+            style = torch.cat([style, torch.zeros_like(style)], dim=0)
+            mu = torch.cat([mu, torch.zeros_like(mu)], dim=0)
+
+        if self.use_estimator_session and isinstance(self.estimator, DiT):
+            estimate = self.estimator.session(prompt_x, x_lens, style, mu)
+        else:
+            def estimate(x, t):
+                return self.estimator(x, prompt_x, x_lens, t, style, mu)
+
+        def velocity(x, t):
+            self.nfe += 1
+            if not cfg:
+                return estimate(x, t.unsqueeze(0))
+            stacked_dphi_dt = estimate(torch.cat([x, x], dim=0), torch.cat([t.unsqueeze(0), t.unsqueeze(0)], dim=0))
+            dphi_dt, cfg_dphi_dt = stacked_dphi_dt.chunk(2, dim=0)
+            return (1.0 + inference_cfg_rate) * dphi_dt - inference_cfg_rate * cfg_dphi_dt
+
+        return velocity
+
+    def solve_ode(self, x, x_lens, prompt, mu, style, f0, t_span, inference_cfg_rate=0.5, solver="midpoint",
+                  prompt_lens=None):
+        """
+        Higher-order solvers for the same ODE as solve_euler.
 
-    def solve_euler(self, x, x_lens, prompt, mu, style, f0, t_span, inference_cfg_rate=0.5):
+        midpoint/heun/rk4 are the classic explicit Runge-Kutta methods.
+        dpm_multistep is a second-order multistep update in the spirit of
+        DPM-Solver++(2M): it extrapolates with the previous step's velocity,
+        so it costs one estimator call per step like Euler. Every
+        intermediate state has its prompt region zeroed, as in solve_euler.
+        """
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver '{solver}', expected one of {SOLVERS}")
+
+        prompt_x, prompt_mask = self.apply_prompt(x, prompt, mu, prompt_lens)
+        velocity = self.velocity_session(prompt_x, x_lens, style, mu, inference_cfg_rate)
+
+        def f(x_t, t):
+            x_t = x_t.masked_fill(prompt_mask, 0)
+            return velocity(x_t, t)
+
+        previous = None  # (velocity, dt) of the last step, for dpm_multistep
+        for step in range(1, len(t_span)):
+            t = t_span[step - 1]
+            dt = t_span[step] - t
+            if solver == "midpoint":
+                k1 = f(x, t)
+                x = x + dt * f(x + 0.5 * dt * k1, t + 0.5 * dt)
+            elif solver == "heun":
+                k1 = f(x, t)
+                k2 = f(x + dt * k1, t + dt)
+                x = x + 0.5 * dt * (k1 + k2)
+            elif solver == "rk4":
+                k1 = f(x, t)
+                k2 = f(x + 0.5 * dt * k1, t + 0.5 * dt)
+                k3 = f(x + 0.5 * dt * k2, t + 0.5 * dt)
+                k4 = f(x + dt * k3, t + dt)
+                x = x + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            else:
+                v = f(x, t)
+                if previous is None:
+                    x = x + dt * v
+                else:
+                    # Variable-step second-order extrapolation of the velocity
+                    v_prev, dt_prev = previous
+                    x = x + dt * (v + dt / (2 * dt_prev) * (v - v_prev))
+                previous = (v, dt)
+            x = x.masked_fill(prompt_mask, 0)
+
+        return x
+
+    def solve_euler(self, x, x_lens, prompt, mu, style, f0, t_span, inference_cfg_rate=0.5, prompt_lens=None):
         """
         Fixed euler solver for ODEs.
         Args:
@@ -71,41 +255,18 @@ class BASECFM(torch.nn.Module, ABC):
         # Or in future might add like a return_all_steps flag
         sol = []
         # apply prompt
-        prompt_len = prompt.size(-1)
-        prompt_x = torch.zeros_like(x)
-        prompt_x[..., :prompt_len] = prompt[..., :prompt_len]
-        x[..., :prompt_len] = 0
-        if self.zero_prompt_speech_token:
-            mu[..., :prompt_len] = 0
+        prompt_x, prompt_mask = self.apply_prompt(x, prompt, mu, prompt_lens)
+        velocity = self.velocity_session(prompt_x, x_lens, style, mu, inference_cfg_rate)
         for step in tqdm(range(1, len(t_span))):
             dt = t_span[step] - t_span[step - 1]
-            if inference_cfg_rate > 0:
-                # Stack original and CFG (null) inputs for batched processing
-                stacked_prompt_x = torch.cat([prompt_x, torch.zeros_like(prompt_x)], dim=0)
-                stacked_style = torch.cat([style, torch.zeros_like(style)], dim=0)
-                stacked_mu = torch.cat([mu, torch.zeros_like(mu)], dim=0)
-                stacked_x = torch.cat([x, x], dim=0)
-                stacked_t = torch.cat([t.unsqueeze(0), t.unsqueeze(0)], dim=0)
-
-                # Perform a single forward pass for both original and CFG inputs
-                stacked_dphi_dt = self.estimator(
-                    stacked_x, stacked_prompt_x, x_lens, stacked_t, stacked_style, stacked_mu,
-                )
-
-                # Split the output back into the original and CFG components
-                dphi_dt, cfg_dphi_dt = stacked_dphi_dt.chunk(2, dim=0)
-
-                # Apply CFG formula
-                dphi_dt = (1.0 + inference_cfg_rate) * dphi_dt - inference_cfg_rate * cfg_dphi_dt
-            else:
-                dphi_dt = self.estimator(x, prompt_x, x_lens, t.unsqueeze(0), style, mu)
+            dphi_dt = velocity(x, t)
 
             x = x + dt * dphi_dt
             t = t + dt
             sol.append(x)
             if step < len(t_span) - 1:
                 dt = t_span[step + 1] - t
-            x[:, :, :prompt_len] = 0
+            x.masked_fill_(prompt_mask, 0)
 
         return sol[-1]
     def forward(self, x1, x_lens, prompt_lens, mu, style):
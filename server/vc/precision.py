@@ -0,0 +1,106 @@
+"""
+Precision modes for the voice conversion models.
+
+``fp16`` autocasts the estimator on GPU, which is what it was built for. On
+CPU nodes float16 brings nothing, so there the choice is between ``fp32``,
+``bf16`` (autocast to bfloat16, useful on CPUs with AVX512-BF16/AMX) and
+``int8-dynamic``: the Linear layers of the DiT estimator and the Whisper
+encoder, plus CAMPPlus' pointwise convolutions, get int8 weights with
+activations quantized on the fly.
+"""
+
+import io
+
+import torch
+from torch import nn
+
+PRECISIONS = ("fp32", "fp16", "bf16", "int8-dynamic")
+AUTOCAST_DTYPES = {"fp16": torch.float16, "bf16": torch.bfloat16}
+# DiT Linear layers quantized in int8-dynamic mode: attention projections,
+# the SwiGLU feed-forward and the input merge
+DIT_QUANTIZED_LAYERS = ("wqkv", "wo", "w1", "w2", "w3", "cond_x_merge_linear")
+
+
+def resolve_precision(precision, fp16, device):
+    """
+    Pick the precision mode; ``None`` keeps the old ``fp16`` flag's meaning
+    on GPU and falls back to fp32 on CPU.
+    """
+    if precision is None:
+        return "fp16" if fp16 and device.type != "cpu" else "fp32"
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision!r}; expected one of {', '.join(PRECISIONS)}")
+    if precision == "int8-dynamic" and device.type != "cpu":
+        raise ValueError("int8-dynamic quantization is only supported on CPU")
+    return precision
+
+
+def autocast_dtype(precision):
+    return AUTOCAST_DTYPES.get(precision)
+
+
+def weight_dtype(precision):
+    """Dtype to load the Whisper encoder in."""
+    return autocast_dtype(precision) or torch.float32
+
+
+class PointwiseLinear(nn.Module):
+    """A kernel-size-1 Conv1d expressed as a Linear over channels, so it can be quantized."""
+
+    def __init__(self, conv):
+        super().__init__()
+        self.linear = nn.Linear(conv.in_channels, conv.out_channels, bias=conv.bias is not None)
+        with torch.no_grad():
+            self.linear.weight.copy_(conv.weight[:, :, 0])
+            if conv.bias is not None:
+                self.linear.bias.copy_(conv.bias)
+
+    def forward(self, x):
+        return self.linear(x.transpose(1, 2)).transpose(1, 2)
+
+
+def _is_pointwise(module):
+    return (
+        isinstance(module, nn.Conv1d)
+        and module.kernel_size == (1,)
+        and module.stride == (1,)
+        and module.groups == 1
+        and module.padding in ((0,), "valid")
+    )
+
+
+def pointwise_to_linear(module):
+    """Replace every pointwise Conv1d below ``module`` with an equivalent PointwiseLinear."""
+    for name, child in list(module.named_children()):
+        if _is_pointwise(child):
+            setattr(module, name, PointwiseLinear(child))
+        else:
+            pointwise_to_linear(child)
+    return module
+
+
+def quantize_linear(module, names=None):
+    """
+    Dynamically quantize ``module``'s Linear layers to int8, in place.
+
+    Args:
+        names (tuple): Only quantize Linear layers whose attribute name is listed.
+    """
+    from torch.ao.quantization import default_dynamic_qconfig, quantize_dynamic
+
+    if names is None:
+        spec = {nn.Linear}
+    else:
+        spec = {
+            name: default_dynamic_qconfig
+            for name, child in module.named_modules()
+            if isinstance(child, nn.Linear) and name.rsplit(".", 1)[-1] in names
+        }
+    return quantize_dynamic(module, spec, dtype=torch.qint8, inplace=True)
+
+
+def module_size_mb(module):
+    """Serialized size of ``module``'s state dict, which also counts packed int8 weights."""
+    buffer = io.BytesIO()
+    torch.save(module.state_dict(), buffer)
+    return buffer.tell() / (1024 * 1024)
@@ -0,0 +1,69 @@
+"""
+Resampling with cached polyphase kernels.
+
+``torchaudio.functional.resample`` designs a windowed-sinc kernel on every
+call. ``torchaudio.transforms.Resample`` builds the same kernel once in its
+constructor, so one instance per (orig_sr, new_sr, device, dtype) is kept
+here and reused by every request.
+"""
+
+import threading
+
+import numpy as np
+import soundfile as sf
+import torch
+import torchaudio
+
+_resamplers = {}
+_resamplers_lock = threading.Lock()
+
+
+def get_resampler(orig_sr, new_sr, device="cpu", dtype=torch.float32):
+    """Return a device-resident Resample module for this rate pair, building it once."""
+    device = torch.device(device)
+    key = (int(orig_sr), int(new_sr), str(device), dtype)
+    resampler = _resamplers.get(key)
+    if resampler is None:
+        with _resamplers_lock:
+            resampler = _resamplers.get(key)
+            if resampler is None:
+                resampler = torchaudio.transforms.Resample(int(orig_sr), int(new_sr), dtype=dtype).to(device)
+                resampler.eval()
+                _resamplers[key] = resampler
+    return resampler
+
+
+@torch.no_grad()
+def resample(waveform, orig_sr, new_sr):
+    """
+    Resample a tensor along its last dimension with a cached kernel.
+
+    Matches ``torchaudio.functional.resample(waveform, orig_sr, new_sr)``.
+    """
+    if int(orig_sr) == int(new_sr):
+        return waveform
+    return get_resampler(orig_sr, new_sr, waveform.device, waveform.dtype)(waveform)
+
+
+def load_audio(path, sr):
+    """
+    Load a file as mono float32 at ``sr``, like ``librosa.load(path, sr=sr)[0]``.
+
+    Decoding goes through soundfile and resampling through the cached kernels;
+    formats soundfile can't read fall back to librosa.
+    """
+    try:
+        audio, file_sr = sf.read(path, dtype="float32", always_2d=True)
+    except RuntimeError:
+        import librosa
+        return librosa.load(path, sr=sr)[0]
+
+    audio = audio.mean(axis=1)
+    if file_sr == sr:
+        return audio
+    return resample(torch.from_numpy(np.ascontiguousarray(audio)), file_sr, sr).numpy()
+
+
+def clear_cache():
+    with _resamplers_lock:
+        _resamplers.clear()
@@ -6,22 +6,143 @@ This module provides a simplified interface for voice conversion using Seed-VC m
 import os
 os.environ['HF_HUB_CACHE'] = 'vc/checkpoints/hf_cache'
 
+import hashlib
+import inspect
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 import torch
 import torchaudio
-import librosa
 import yaml
 import numpy as np
 from vc.modules.commons import build_model, load_checkpoint, recursive_munch
 from vc.hf_utils import load_custom_model_from_hf
+from vc.resample import load_audio, resample
+from vc.precision import (DIT_QUANTIZED_LAYERS, autocast_dtype, module_size_mb, pointwise_to_linear,
+                          quantize_linear, resolve_precision, weight_dtype)
 import soundfile as sf
 
+# Log-mel value of silence: modules.audio clamps magnitudes to 1e-5 before the log
+MEL_FLOOR = math.log(1e-5)
+
+
+class ReferenceFeatureCache:
+    """
+    LRU cache of reference-voice conditioning tensors.
+
+    Entries are keyed by a content hash of the reference audio, so the same
+    voice is only run through Whisper, CAMPPlus and the length regulator once.
+    When ``cache_dir`` is set, entries are also persisted with ``torch.save``
+    and survive restarts.
+    """
+
+    def __init__(self, max_items=16, cache_dir=None):
+        self.max_items = max_items
+        self.cache_dir = cache_dir
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pt")
+
+    def get(self, key, device):
+        """Return cached features for ``key`` on ``device``, or None."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+
+        if not self.cache_dir or not os.path.exists(self._disk_path(key)):
+            return None
+        try:
+            features = torch.load(self._disk_path(key), map_location=device)
+        except Exception as e:
+            print(f"Warning: Failed to read cached reference features {key}: {e}")
+            return None
+        self._remember(key, features)
+        return features
+
+    def put(self, key, features):
+        """Store features in memory and, if enabled, on disk."""
+        self._remember(key, features)
+        if self.cache_dir:
+            tmp_path = self._disk_path(key) + ".tmp"
+            torch.save({name: value.cpu() for name, value in features.items()}, tmp_path)
+            os.replace(tmp_path, self._disk_path(key))
+
+    def _remember(self, key, features):
+        with self._lock:
+            self._items[key] = features
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def contains(self, key):
+        """Whether ``key`` is cached in memory or on disk, without loading it."""
+        with self._lock:
+            if key in self._items:
+                return True
+        return bool(self.cache_dir) and os.path.exists(self._disk_path(key))
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+def _flatten_net(state):
+    """Seed-VC checkpoint (``{"net": {module: state_dict}}``) as flat ``module.param`` tensors."""
+    tensors = {}
+    for key, params in state["net"].items():
+        for name, tensor in params.items():
+            if name.startswith("module."):
+                name = name[len("module."):]
+            tensors[f"{key}.{name}"] = tensor
+    return tensors, {}
+
+
+def _load_module_dict(model, tensors):
+    """Load flat ``module.param`` tensors into each module, skipping shape mismatches like load_checkpoint."""
+    for key in model:
+        prefix = f"{key}."
+        state_dict = model[key].state_dict()
+        params = {name[len(prefix):]: tensor for name, tensor in tensors.items() if name.startswith(prefix)}
+        filtered = {name: tensor for name, tensor in params.items()
+                    if name in state_dict and tensor.shape == state_dict[name].shape}
+        skipped = set(params) - set(filtered)
+        if skipped:
+            print(f"Warning: Skipped loading some keys due to shape mismatch: {skipped}")
+        model[key].load_state_dict(filtered, strict=False)
+
+
+@lru_cache(maxsize=16)
+def fade_windows(overlap, device, dtype):
+    """
+    Equal-power crossfade curves for ``overlap`` samples, built once per
+    (overlap, device, dtype).
+
+    Returns:
+        tuple: (fade_in, fade_out) 1-D tensors
+    """
+    angles = torch.linspace(0, math.pi / 2, overlap, dtype=torch.float64)
+    fade_out = torch.cos(angles) ** 2
+    fade_in = torch.flip(fade_out, dims=[0])
+    return fade_in.to(device=device, dtype=dtype), fade_out.to(device=device, dtype=dtype)
+
 
 class VoiceConverter:
     """
     A class to handle voice conversion using the Seed-VC model.
     """
     
-    def __init__(self, checkpoint_path=None, config_path=None, device=None, fp16=True):
+    def __init__(self, checkpoint_path=None, config_path=None, device=None, fp16=True,
+                 ref_cache_size=16, ref_cache_dir=None, backend="eager", export_dir="vc/exported",
+                 backend_threads=None, precision=None, weight_store=None, length_buckets=None):
         """
         Initialize the Voice Converter.
         
@@ -29,9 +150,24 @@ class VoiceConverter:
             checkpoint_path (str): Path to model checkpoint. If None, downloads from HuggingFace.
             config_path (str): Path to config file. If None, downloads from HuggingFace.
             device (torch.device): Device to run the model on.
-            fp16 (bool): Whether to use fp16 precision.
+            fp16 (bool): Whether to use fp16 precision on GPU; see ``precision``.
+            ref_cache_size (int): Number of reference voices whose features are kept in memory.
+            ref_cache_dir (str): Optional directory to persist reference features in.
+            backend (str): "eager", or "torchscript" / "onnx" to run the DiT
+                estimator, CAMPPlus and the vocoder from graphs written by
+                ``python -m vc.export`` into ``export_dir``.
+            backend_threads (int): ONNX Runtime intra-op threads.
+            precision (str): "fp32", "fp16", "bf16" or "int8-dynamic" (CPU
+                only, see vc/precision.py). Defaults to fp16 on GPU when
+                ``fp16`` is set and fp32 otherwise.
+            weight_store (model_loader.WeightStore): Reads the DiT and
+                CAMPPlus checkpoints from memory-mapped converted copies.
+            length_buckets: Sequence lengths to pad estimator inputs to, or
+                "auto" for a ladder up to the context window, so the
+                estimator sees a fixed set of shapes. None disables padding.
         """
-        self.fp16 = fp16
+        self.weight_store = weight_store
+        self.ref_cache = ReferenceFeatureCache(ref_cache_size, ref_cache_dir)
         
         # Set device
         if device is None:
@@ -43,12 +179,27 @@ class VoiceConverter:
                 self.device = torch.device("cpu")
         else:
             self.device = device
+
+        self.precision = resolve_precision(precision, fp16, self.device)
+        self.fp16 = self.precision == "fp16"
             
         print(f"Using device: {self.device}")
-        print(f"Using fp16: {self.fp16}")
+        print(f"Using precision: {self.precision}")
         
         # Load model and configuration
         self._load_models(checkpoint_path, config_path)
+        if self.precision == "int8-dynamic":
+            self._quantize_models()
+
+        self.backend = backend
+        if backend != "eager":
+            from vc.export import load_exported
+            load_exported(self, backend, export_dir, backend_threads)
+
+        if length_buckets == "auto":
+            from modules.flow_matching import make_length_buckets
+            length_buckets = make_length_buckets(self.max_context_window)
+        self.model.cfm.length_buckets = tuple(sorted(length_buckets)) if length_buckets else None
         
     def _load_models(self, checkpoint_path, config_path):
         """Load all required models and configurations."""
@@ -69,36 +220,21 @@ class VoiceConverter:
         model_params = recursive_munch(config["model_params"])
         model_params.dit_type = 'DiT'
         
-        # Build model
-        model = build_model(model_params, stage="DiT")
         self.hop_length = config["preprocess_params"]["spect_params"]["hop_length"]
         self.sr = config["preprocess_params"]["sr"]
-        
-        # Load checkpoints
-        model, _, _, _ = load_checkpoint(
-            model,
-            None,
-            dit_checkpoint_path,
-            load_only_params=True,
-            ignore_modules=[],
-            is_distributed=False,
-        )
-        
-        for key in model:
-            model[key].eval()
-            model[key].to(self.device)
-        model.cfm.estimator.setup_caches(max_batch_size=1, max_seq_length=8192)
-        
-        self.model = model
-        
-        # Load CAMPlus speaker encoder
-        self._load_campplus()
-        
-        # Load vocoder
-        self._load_vocoder(model_params, config)
-        
-        # Load speech tokenizer
-        self._load_speech_tokenizer(model_params, config)
+
+        # The four models are independent; load them side by side
+        loads = {
+            "dit": (self._load_dit, model_params, dit_checkpoint_path),
+            "campplus": (self._load_campplus,),
+            "vocoder": (self._load_vocoder, model_params, config),
+            "speech_tokenizer": (self._load_speech_tokenizer, model_params, config),
+        }
+        self.load_times = {}
+        with ThreadPoolExecutor(max_workers=len(loads), thread_name_prefix="vc-load") as pool:
+            futures = [pool.submit(self._timed_load, name, fn, *args) for name, (fn, *args) in loads.items()]
+            for future in futures:
+                future.result()
         
         # Setup mel spectrogram function
         self._setup_mel_fn(config)
@@ -107,7 +243,44 @@ class VoiceConverter:
         self.max_context_window = self.sr // self.hop_length * 30
         self.overlap_frame_len = 16
         self.overlap_wave_len = self.overlap_frame_len * self.hop_length
+
+        # Reference features depend on the checkpoint as well as on the audio
+        self.feature_tag = hashlib.sha1(
+            f"{os.path.basename(dit_checkpoint_path)}:{self.sr}:{self.hop_length}".encode()
+        ).hexdigest()[:12]
+        
+    def _timed_load(self, name, fn, *args):
+        start = time.perf_counter()
+        fn(*args)
+        self.load_times[name] = time.perf_counter() - start
+
+    def _load_dit(self, model_params, dit_checkpoint_path):
+        """Build the DiT model and load its checkpoint."""
+        model = build_model(model_params, stage="DiT")
+        
+        if self.weight_store is not None:
+            # Copy the memory-mapped weights straight into the on-device modules
+            for key in model:
+                model[key].to(self.device)
+            tensors, _ = self.weight_store.load_state(dit_checkpoint_path, extract=_flatten_net)
+            _load_module_dict(model, tensors)
+        else:
+            model, _, _, _ = load_checkpoint(
+                model,
+                None,
+                dit_checkpoint_path,
+                load_only_params=True,
+                ignore_modules=[],
+                is_distributed=False,
+            )
         
+        for key in model:
+            model[key].eval()
+            model[key].to(self.device)
+        model.cfm.estimator.setup_caches(max_batch_size=1, max_seq_length=8192)
+        
+        self.model = model
+
     def _load_campplus(self):
         """Load CAMPlus speaker encoder."""
         from DTDNN import CAMPPlus
@@ -116,7 +289,11 @@ class VoiceConverter:
             "funasr/campplus", "campplus_cn_common.bin", config_filename=None
         )
         campplus_model = CAMPPlus(feat_dim=80, embedding_size=192)
-        campplus_model.load_state_dict(torch.load(campplus_ckpt_path, map_location="cpu"))
+        if self.weight_store is not None:
+            campplus_model.to(self.device)
+            campplus_model.load_state_dict(self.weight_store.load_state(campplus_ckpt_path)[0])
+        else:
+            campplus_model.load_state_dict(torch.load(campplus_ckpt_path, map_location="cpu"))
         campplus_model.eval()
         campplus_model.to(self.device)
         
@@ -164,8 +341,11 @@ class VoiceConverter:
         if speech_tokenizer_type == 'whisper':
             from transformers import AutoFeatureExtractor, WhisperModel
             whisper_name = model_params.speech_tokenizer.name
-            whisper_model = WhisperModel.from_pretrained(whisper_name, torch_dtype=torch.float16).to(self.device)
+            whisper_model = WhisperModel.from_pretrained(
+                whisper_name, torch_dtype=weight_dtype(self.precision)
+            ).to(self.device)
             del whisper_model.decoder
+            self.semantic_model = whisper_model
             whisper_feature_extractor = AutoFeatureExtractor.from_pretrained(whisper_name)
             
             def semantic_fn(waves_16k):
@@ -265,42 +445,138 @@ class VoiceConverter:
         
         self.to_mel = lambda x: mel_spectrogram(x, **mel_fn_args)
         
-    @staticmethod
-    def _crossfade(chunk1, chunk2, overlap):
-        """Apply crossfade between two audio chunks."""
-        fade_out = np.cos(np.linspace(0, np.pi / 2, overlap)) ** 2
-        fade_in = np.cos(np.linspace(np.pi / 2, 0, overlap)) ** 2
-        chunk2[:overlap] = chunk2[:overlap] * fade_in + chunk1[-overlap:] * fade_out
-        return chunk2
-        
+    _file_digests = {}
+
+    @classmethod
+    def hash_audio_file(cls, path):
+        """
+        Return the sha256 hex digest of an audio file's content.
+
+        Digests are remembered per (path, size, mtime), so a reference that is
+        used repeatedly is only read once.
+        """
+        stat = os.stat(path)
+        memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        digest = cls._file_digests.get(memo_key)
+        if digest is not None:
+            return digest
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha.update(block)
+        digest = sha.hexdigest()
+        if len(cls._file_digests) >= 1024:
+            cls._file_digests.clear()
+        cls._file_digests[memo_key] = digest
+        return digest
+
+    def reference_key(self, target_audio_path):
+        return f"{self.hash_audio_file(target_audio_path)}_{self.feature_tag}"
+
+    def has_reference_features(self, target_audio_path):
+        """Whether the features for this reference are already cached."""
+        return self.ref_cache.contains(self.reference_key(target_audio_path))
+
     @torch.no_grad()
     @torch.inference_mode()
-    def convert_voice(self, source_audio_path, target_audio_path, diffusion_steps=10, 
-                     length_adjust=1.0, inference_cfg_rate=0.7):
+    def get_reference_features(self, target_audio_path):
         """
-        Convert source audio to match target voice.
-        
-        Args:
-            source_audio_path (str): Path to source audio file
-            target_audio_path (str): Path to target/reference audio file
-            diffusion_steps (int): Number of diffusion steps (default: 10, 50-100 for best quality)
-            length_adjust (float): Length adjustment factor (<1.0 speeds up, >1.0 slows down)
-            inference_cfg_rate (float): Inference CFG rate (default: 0.7)
-            
+        Return the conditioning tensors for a reference voice.
+
+        None of these depend on the source audio, so they are cached per
+        reference (see ReferenceFeatureCache).
+
         Returns:
-            tuple: (sample_rate, audio_array) - Generated audio as numpy array
+            dict: ``S_ori``, ``mel2``, ``style2`` and ``prompt_condition`` tensors
         """
-        # Load audio files
-        source_audio = librosa.load(source_audio_path, sr=self.sr)[0]
-        ref_audio = librosa.load(target_audio_path, sr=self.sr)[0]
-        
-        # Process audio
-        source_audio = torch.tensor(source_audio).unsqueeze(0).float().to(self.device)
+        key = self.reference_key(target_audio_path)
+        features = self.ref_cache.get(key, self.device)
+        if features is not None:
+            return features
+
+        ref_audio = load_audio(target_audio_path, self.sr)
         ref_audio = torch.tensor(ref_audio[:self.sr * 25]).unsqueeze(0).float().to(self.device)
-        
+        ref_waves_16k = resample(ref_audio, self.sr, 16000)
+
+        # Extract semantic features from reference audio
+        S_ori = self.semantic_fn(ref_waves_16k)
+        mel2 = self.to_mel(ref_audio.to(self.device).float())
+        target2_lengths = torch.LongTensor([mel2.size(2)]).to(mel2.device)
+
+        # Extract speaker embedding from reference
+        feat2 = torchaudio.compliance.kaldi.fbank(ref_waves_16k,
+                                                  num_mel_bins=80,
+                                                  dither=0,
+                                                  sample_frequency=16000)
+        feat2 = feat2 - feat2.mean(dim=0, keepdim=True)
+        style2 = self.campplus_model(feat2.unsqueeze(0))
+
+        prompt_condition, _, codes, commitment_loss, codebook_loss = self.model.length_regulator(
+            S_ori, ylens=target2_lengths, n_quantizers=3, f0=None)
+
+        features = {
+            "S_ori": S_ori,
+            "mel2": mel2,
+            "style2": style2,
+            "prompt_condition": prompt_condition,
+        }
+        self.ref_cache.put(key, features)
+        return features
+
+    def _quantize_models(self):
+        """Give the DiT, Whisper encoder and CAMPPlus Linear layers int8 weights."""
+        quantize_linear(self.model.cfm.estimator, DIT_QUANTIZED_LAYERS)
+        semantic_model = getattr(self, "semantic_model", None)
+        if semantic_model is not None:
+            quantize_linear(semantic_model.encoder)
+        # CAMPPlus is convolutional; its pointwise convolutions become Linear layers first
+        quantize_linear(pointwise_to_linear(self.campplus_model))
+
+    def autocast(self):
+        """Autocast context for the estimator, following ``self.precision``."""
+        dtype = autocast_dtype(self.precision)
+        return torch.autocast(device_type=self.device.type, dtype=dtype or torch.float32, enabled=dtype is not None)
+
+    def footprint_mb(self):
+        """
+        Serialized weight size of each model, in MB.
+
+        Returns:
+            dict: sizes for "dit", "whisper", "campplus" and "vocoder" (when loaded)
+        """
+        # Instrumented models sit behind wrappers (see tracing.instrument)
+        models = {
+            "dit": self.model.cfm,
+            "whisper": getattr(self, "semantic_model", None),
+            "campplus": inspect.unwrap(self.campplus_model),
+            "vocoder": inspect.unwrap(self.vocoder_fn),
+        }
+        return {name: module_size_mb(model) for name, model in models.items() if isinstance(model, torch.nn.Module)}
+
+    @staticmethod
+    def _crossfade(previous, chunk):
+        """Crossfade the tail ``previous`` of one chunk into the head of ``chunk``, in place."""
+        overlap = previous.size(0)
+        fade_in, fade_out = fade_windows(overlap, chunk.device, chunk.dtype)
+        chunk[:overlap].mul_(fade_in).addcmul_(previous, fade_out)
+        return chunk
+        
+    def get_source_condition(self, source_wave, source_sr, length_adjust=1.0):
+        """
+        Compute the length-regulated content condition for a source waveform.
+
+        Returns:
+            torch.Tensor: (1, frames, channels) condition for the estimator
+        """
+        if not isinstance(source_wave, torch.Tensor):
+            source_wave = torch.from_numpy(np.asarray(source_wave, dtype=np.float32))
+        source_audio = source_wave.float().reshape(1, -1).to(self.device)
+        if source_sr != self.sr:
+            source_audio = resample(source_audio, source_sr, self.sr)
+
         # Resample to 16kHz for feature extraction
-        ref_waves_16k = torchaudio.functional.resample(ref_audio, self.sr, 16000)
-        converted_waves_16k = torchaudio.functional.resample(source_audio, self.sr, 16000)
+        converted_waves_16k = resample(source_audio, self.sr, 16000)
         
         # Extract semantic features from source audio
         if converted_waves_16k.size(-1) <= 16000 * 30:
@@ -325,78 +601,226 @@ class VoiceConverter:
                 traversed_time += 30 * 16000 if traversed_time == 0 else chunk.size(-1) - 16000 * overlapping_time
             S_alt = torch.cat(S_alt_list, dim=1)
         
-        # Extract semantic features from reference audio
-        S_ori = self.semantic_fn(ref_waves_16k)
-        
-        # Generate mel spectrograms
+        # Generate mel spectrogram
         mel = self.to_mel(source_audio.to(self.device).float())
-        mel2 = self.to_mel(ref_audio.to(self.device).float())
         
         # Calculate target lengths
         target_lengths = torch.LongTensor([int(mel.size(2) * length_adjust)]).to(mel.device)
-        target2_lengths = torch.LongTensor([mel2.size(2)]).to(mel2.device)
-        
-        # Extract speaker embedding from reference
-        feat2 = torchaudio.compliance.kaldi.fbank(ref_waves_16k,
-                                                  num_mel_bins=80,
-                                                  dither=0,
-                                                  sample_frequency=16000)
-        feat2 = feat2 - feat2.mean(dim=0, keepdim=True)
-        style2 = self.campplus_model(feat2.unsqueeze(0))
         
         # Length regulation
         cond, _, codes, commitment_loss, codebook_loss = self.model.length_regulator(
             S_alt, ylens=target_lengths, n_quantizers=3, f0=None)
-        prompt_condition, _, codes, commitment_loss, codebook_loss = self.model.length_regulator(
-            S_ori, ylens=target2_lengths, n_quantizers=3, f0=None)
+        return cond
+
+    def convert_voice(self, source_audio_path, target_audio_path, diffusion_steps=10, 
+                     length_adjust=1.0, inference_cfg_rate=0.7, solver="euler", t_schedule="uniform"):
+        """
+        Convert source audio to match target voice.
+        
+        Args:
+            source_audio_path (str): Path to source audio file
+            target_audio_path (str): Path to target/reference audio file
+            diffusion_steps (int): Number of diffusion steps (default: 10, 50-100 for best quality)
+            length_adjust (float): Length adjustment factor (<1.0 speeds up, >1.0 slows down)
+            inference_cfg_rate (float): Inference CFG rate (default: 0.7)
+            solver (str): ODE solver - euler, midpoint, heun, rk4 or dpm_multistep
+            t_schedule (str): Diffusion timestep schedule - uniform or cosine
+            
+        Returns:
+            tuple: (sample_rate, audio_array) - Generated audio as numpy array
+        """
+        source_audio = load_audio(source_audio_path, self.sr)
+        return self.convert_waveform(source_audio, self.sr, target_audio_path, diffusion_steps,
+                                     length_adjust, inference_cfg_rate, solver, t_schedule)
+
+    @torch.no_grad()
+    @torch.inference_mode()
+    def convert_waveform(self, source_wave, source_sr, target_audio_path, diffusion_steps=10,
+                         length_adjust=1.0, inference_cfg_rate=0.7, solver="euler", t_schedule="uniform"):
+        """
+        Convert an in-memory waveform to match target voice.
+        
+        Args:
+            source_wave (torch.Tensor | np.ndarray | list): Mono source waveform
+            source_sr (int): Sample rate of ``source_wave``
+            target_audio_path (str): Path to target/reference audio file
+            diffusion_steps (int): Number of diffusion steps
+            length_adjust (float): Length adjustment factor
+            inference_cfg_rate (float): Inference CFG rate
+            solver (str): ODE solver (see convert_voice)
+            t_schedule (str): Diffusion timestep schedule (see convert_voice)
+            
+        Returns:
+            tuple: (sample_rate, audio_array) - Generated audio as numpy array
+        """
+        cond = self.get_source_condition(source_wave, source_sr, length_adjust)
+        reference = self.get_reference_features(target_audio_path)
+        return self._convert_condition(cond, reference, diffusion_steps, inference_cfg_rate, solver, t_schedule)
+
+    def _convert_condition(self, cond, reference, diffusion_steps, inference_cfg_rate, solver, t_schedule):
+        """
+        Convert an already computed source condition into one waveform.
+
+        Returns:
+            tuple: (sample_rate, audio_array) as for ``convert_waveform``
+        """
+        chunks = self._convert_chunks(cond, reference, diffusion_steps, inference_cfg_rate,
+                                      solver, t_schedule)
+
+        # Chunks are written into one buffer on the device and copied to host once
+        output = None
+        offset = 0
+        for chunk in chunks:
+            if output is None:
+                output = chunk.new_empty(cond.size(1) * self.hop_length)
+            if offset + chunk.size(0) > output.size(0):
+                output = torch.cat([output[:offset], chunk.new_empty(chunk.size(0))])
+            output[offset:offset + chunk.size(0)] = chunk
+            offset += chunk.size(0)
+        return self.sr, output[:offset].cpu().numpy()
+
+    @torch.no_grad()
+    @torch.inference_mode()
+    def convert_voice_stream(self, source_wave, source_sr, target_audio_path, diffusion_steps=10,
+                             length_adjust=1.0, inference_cfg_rate=0.7, solver="euler", t_schedule="uniform",
+                             chunk_frames=None):
+        """
+        Convert an in-memory waveform, yielding audio as each chunk is vocoded.
+
+        The source condition is split into chunks of ``chunk_frames`` mel
+        frames (by default the largest that fits the context window next to
+        the reference prompt). Neighbouring chunks overlap by
+        ``overlap_frame_len`` frames and are crossfaded, so the concatenated
+        output equals ``convert_waveform``'s for the same chunk size. Smaller
+        chunks give earlier first audio at some cost in context.
+
+        Args:
+            chunk_frames (int): Source frames per chunk, at least twice
+                ``overlap_frame_len``; other arguments as in convert_waveform.
+
+        Yields:
+            np.ndarray: consecutive pieces of the converted waveform at ``self.sr``
+        """
+        cond = self.get_source_condition(source_wave, source_sr, length_adjust)
+        reference = self.get_reference_features(target_audio_path)
+        for chunk in self._convert_chunks(cond, reference, diffusion_steps, inference_cfg_rate,
+                                          solver, t_schedule, chunk_frames):
+            yield chunk.cpu().numpy()
+
+    def _convert_chunks(self, cond, reference, diffusion_steps, inference_cfg_rate, solver, t_schedule,
+                        chunk_frames=None):
+        """
+        Run the estimator and vocoder over ``cond`` chunk by chunk.
+
+        Yields:
+            torch.Tensor: consecutive crossfaded pieces of the waveform, still on the device
+        """
+        mel2 = reference["mel2"]
+        style2 = reference["style2"]
+        prompt_condition = reference["prompt_condition"]
         
         # Process in chunks
         max_source_window = self.max_context_window - mel2.size(2)
+        if chunk_frames:
+            max_source_window = max(2 * self.overlap_frame_len, min(int(chunk_frames), max_source_window))
         processed_frames = 0
-        generated_wave_chunks = []
+        previous_chunk = None
         
         while processed_frames < cond.size(1):
             chunk_cond = cond[:, processed_frames:processed_frames + max_source_window]
             is_last_chunk = processed_frames + max_source_window >= cond.size(1)
             cat_condition = torch.cat([prompt_condition, chunk_cond], dim=1)
             
-            with torch.autocast(device_type=self.device.type, dtype=torch.float16 if self.fp16 else torch.float32):
+            with self.autocast():
                 # Voice Conversion
                 vc_target = self.model.cfm.inference(cat_condition,
                                                      torch.LongTensor([cat_condition.size(1)]).to(mel2.device),
                                                      mel2, style2, None, diffusion_steps,
-                                                     inference_cfg_rate=inference_cfg_rate)
+                                                     inference_cfg_rate=inference_cfg_rate,
+                                                     solver=solver, t_schedule=t_schedule)
                 vc_target = vc_target[:, :, mel2.size(-1):]
                 
             vc_wave = self.vocoder_fn(vc_target.float())[0]
-            if vc_wave.ndim == 1:
-                vc_wave = vc_wave.unsqueeze(0)
-                
-            if processed_frames == 0:
-                if is_last_chunk:
-                    output_wave = vc_wave[0].cpu().numpy()
-                    generated_wave_chunks.append(output_wave)
-                    break
-                output_wave = vc_wave[0, :-self.overlap_wave_len].cpu().numpy()
-                generated_wave_chunks.append(output_wave)
-                previous_chunk = vc_wave[0, -self.overlap_wave_len:]
-                processed_frames += chunk_cond.size(1) - self.overlap_frame_len
-            elif is_last_chunk:
-                output_wave = self._crossfade(previous_chunk.cpu().numpy(), vc_wave[0].cpu().numpy(), self.overlap_wave_len)
-                generated_wave_chunks.append(output_wave)
-                processed_frames += chunk_cond.size(1) - self.overlap_frame_len
+            if vc_wave.ndim == 2:
+                vc_wave = vc_wave[0]
+
+            chunk = vc_wave if is_last_chunk else vc_wave[:-self.overlap_wave_len]
+            if previous_chunk is not None:
+                self._crossfade(previous_chunk, chunk)
+            yield chunk
+            if is_last_chunk:
                 break
-            else:
-                output_wave = self._crossfade(previous_chunk.cpu().numpy(), vc_wave[0, :-self.overlap_wave_len].cpu().numpy(), self.overlap_wave_len)
-                generated_wave_chunks.append(output_wave)
-                previous_chunk = vc_wave[0, -self.overlap_wave_len:]
-                processed_frames += chunk_cond.size(1) - self.overlap_frame_len
-        
-        # Concatenate all chunks
-        final_wave = np.concatenate(generated_wave_chunks)
+            previous_chunk = vc_wave[-self.overlap_wave_len:]
+            processed_frames += chunk_cond.size(1) - self.overlap_frame_len
+
+    @torch.no_grad()
+    @torch.inference_mode()
+    def convert_voice_batch(self, requests, diffusion_steps=10, length_adjust=1.0,
+                            inference_cfg_rate=0.7, solver="euler", t_schedule="uniform"):
+        """
+        Convert several waveforms, sharing estimator and vocoder passes.
+
+        Each request's ``[prompt_condition, source_condition]`` sequence is
+        padded to the longest one and masked through ``x_lens``; prompts of
+        different lengths are handled with per-item ``prompt_lens``. Requests
+        too long for a single context window are converted chunk by chunk on
+        their own, as in ``convert_waveform``.
         
-        return self.sr, final_wave
+        Args:
+            requests (list): ``(source_wave, source_sr, target_audio_path)`` tuples
+            diffusion_steps, length_adjust, inference_cfg_rate, solver, t_schedule:
+                as for ``convert_waveform``
+            
+        Returns:
+            list: one ``(sample_rate, audio_array)`` tuple per request
+        """
+        results = [None] * len(requests)
+        batch = []
+        for index, (source_wave, source_sr, target_audio_path) in enumerate(requests):
+            cond = self.get_source_condition(source_wave, source_sr, length_adjust)
+            reference = self.get_reference_features(target_audio_path)
+            if cond.size(1) + reference["mel2"].size(2) > self.max_context_window:
+                results[index] = self._convert_condition(cond, reference, diffusion_steps, inference_cfg_rate,
+                                                         solver, t_schedule)
+            else:
+                batch.append((index, cond, reference))
+        if not batch:
+            return results
+
+        prompt_lens = [reference["mel2"].size(2) for _, _, reference in batch]
+        total_lens = [prompt_len + cond.size(1) for prompt_len, (_, cond, _) in zip(prompt_lens, batch)]
+        max_len = max(total_lens)
+        channels = batch[0][1].size(2)
+
+        # Pad conditions and prompts into batch tensors
+        cat_condition = torch.zeros(len(batch), max_len, channels, device=self.device)
+        n_mels = batch[0][2]["mel2"].size(1)
+        prompt = torch.zeros(len(batch), n_mels, max(prompt_lens), device=self.device)
+        for i, (_, cond, reference) in enumerate(batch):
+            cat_condition[i, :total_lens[i]] = torch.cat([reference["prompt_condition"], cond], dim=1)[0]
+            prompt[i, :, :prompt_lens[i]] = reference["mel2"][0]
+        style = torch.cat([reference["style2"] for _, _, reference in batch], dim=0)
+        x_lens = torch.LongTensor(total_lens).to(self.device)
+
+        with self.autocast():
+            vc_target = self.model.cfm.inference(cat_condition, x_lens, prompt, style, None, diffusion_steps,
+                                                 inference_cfg_rate=inference_cfg_rate,
+                                                 solver=solver, t_schedule=t_schedule,
+                                                 prompt_lens=torch.LongTensor(prompt_lens))
+
+        # Move each item's generated frames to the front and vocode together, padding with silence
+        frames = [total - prompt_len for total, prompt_len in zip(total_lens, prompt_lens)]
+        mels = torch.full((len(batch), vc_target.size(1), max(frames)), MEL_FLOOR, device=self.device)
+        for i, (prompt_len, total) in enumerate(zip(prompt_lens, total_lens)):
+            mels[i, :, :frames[i]] = vc_target[i, :, prompt_len:total].float()
+        vc_waves = self.vocoder_fn(mels)
+        if vc_waves.ndim == 3:
+            vc_waves = vc_waves[:, 0]
+        vc_waves = vc_waves.cpu().numpy()
 
+        for i, (index, _, _) in enumerate(batch):
+            results[index] = (self.sr, vc_waves[i, :frames[i] * self.hop_length])
+        return results
 
 def generate_voice_conversion(source_audio_path, target_audio_path, 
                               checkpoint_path=None, config_path=None,
@@ -0,0 +1,77 @@
+"""
+Status tracking for background custom-voice feature extraction.
+
+When a user uploads a voice, its conditioning features (Whisper semantic
+tokens, mel prompt, CAMPPlus style and prompt condition) are extracted right
+away instead of on the first synthesis. ``FeatureJobs`` records each job's
+state so the UI can tell when the voice is ready.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+QUEUED = "queued"
+RUNNING = "running"
+READY = "ready"
+FAILED = "failed"
+
+
+class FeatureJobs:
+    """
+    In-memory registry of feature extraction jobs, keyed by voice ID.
+
+    Args:
+        max_items (int): Jobs remembered; the oldest are forgotten first.
+    """
+
+    def __init__(self, max_items=1024):
+        self.max_items = max_items
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _set(self, voice_id, status, create=True, **fields):
+        """Update the job for ``voice_id``; with ``create=False`` only if it is still tracked."""
+        with self._lock:
+            job = self._jobs.get(voice_id)
+            if job is None:
+                if not create:
+                    return
+                job = {"voice_id": voice_id, "queued_at": time.time()}
+            job.update(fields, status=status, updated_at=time.time())
+            self._jobs[voice_id] = job
+            self._jobs.move_to_end(voice_id)
+            while len(self._jobs) > self.max_items:
+                self._jobs.popitem(last=False)
+
+    def start(self, voice_id, submit):
+        """
+        Mark ``voice_id`` queued and run ``submit()``, which must return a
+        concurrent.futures.Future for the extraction.
+        """
+        self._set(voice_id, QUEUED, error=None)
+        future = submit()
+        future.add_done_callback(lambda done: self._finish(voice_id, done))
+        return future
+
+    def mark_running(self, voice_id):
+        self._set(voice_id, RUNNING, create=False)
+
+    def _finish(self, voice_id, future):
+        # A voice deleted (forgotten) while its job ran stays forgotten
+        error = future.exception()
+        if error is None:
+            self._set(voice_id, READY, create=False)
+        else:
+            print(f"Feature extraction failed for voice {voice_id}: {error}")
+            self._set(voice_id, FAILED, create=False, error=str(error))
+
+    def status(self, voice_id):
+        """Return a copy of the job record for ``voice_id`` or None."""
+        with self._lock:
+            job = self._jobs.get(voice_id)
+            return dict(job) if job else None
+
+    def forget(self, voice_id):
+        with self._lock:
+            self._jobs.pop(voice_id, None)
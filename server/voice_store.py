@@ -0,0 +1,301 @@
+"""
+Local store for custom voice reference audio.
+
+Reference files are downloaded once with a pooled async HTTP client and kept
+on disk under the sha256 of their content, in a size-bounded LRU. A small
+JSON index maps each voice URL to its content hash, so after the first
+request (and across restarts) a custom voice is served from disk without
+touching the network. Files in use by a running conversion are pinned and
+never evicted.
+
+``TTLCache`` holds the ``user_voices`` rows looked up per request.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+
+class TTLCache:
+    """
+    Small dict cache whose entries expire after ``ttl`` seconds.
+
+    Args:
+        ttl (float): Lifetime of an entry in seconds.
+        max_items (int): Entries kept; the oldest are dropped first.
+        clock: Time source, replaceable in tests.
+    """
+
+    def __init__(self, ttl=300.0, max_items=1024, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_items = max_items
+        self.clock = clock
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None or entry[0] <= self.clock():
+                self._items.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = (self.clock() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def invalidate(self, predicate):
+        """Drop every entry whose key matches ``predicate(key)``."""
+        with self._lock:
+            for key in [key for key in self._items if predicate(key)]:
+                del self._items[key]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"items": len(self._items), "hits": self.hits, "misses": self.misses, "ttl_s": self.ttl}
+
+
+class VoiceStore:
+    """
+    Content-addressed, size-bounded disk LRU of voice reference files.
+
+    Args:
+        cache_dir (str): Directory holding the files and ``index.json``.
+        max_bytes (int): Size bound of the stored files.
+        timeout (float): HTTP timeout for downloads in seconds.
+        client: Object with an async ``get(url)``; an ``httpx.AsyncClient``
+            is created on first use when omitted.
+    """
+
+    INDEX_NAME = "index.json"
+
+    def __init__(self, cache_dir="cache/voices", max_bytes=256 * 1024 * 1024, timeout=30.0, client=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._client = client
+        self._urls = {}  # url -> file name
+        self._files = OrderedDict()  # file name -> size, least recently used first
+        self._bytes = 0
+        self._pins = {}  # file name -> active users
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.downloads = 0
+        self.evictions = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _path(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def _load_index(self):
+        try:
+            with open(self._path(self.INDEX_NAME), encoding="utf-8") as f:
+                urls = json.load(f)
+        except (OSError, ValueError):
+            urls = {}
+
+        entries = []
+        for url, name in urls.items():
+            try:
+                stat = os.stat(self._path(name))
+            except OSError:
+                continue
+            self._urls[url] = name
+            entries.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(set(entries)):
+            self._files[name] = size
+            self._bytes += size
+
+    def _save_index(self):
+        # Called with the lock held
+        tmp_path = self._path(f"{self.INDEX_NAME}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._urls, f)
+        os.replace(tmp_path, self._path(self.INDEX_NAME))
+
+    def _client_or_default(self):
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8)
+            )
+        return self._client
+
+    def _lookup(self, url, count_hit=True):
+        """Return the pinned local path for ``url`` or None."""
+        with self._lock:
+            name = self._urls.get(url)
+            if name is None or name not in self._files:
+                return None
+            self._files.move_to_end(name)
+            self._pins[name] = self._pins.get(name, 0) + 1
+            if count_hit:
+                self.hits += 1
+            return self._path(name)
+
+    async def acquire(self, url):
+        """
+        Return a local path for the file at ``url``, downloading it on a miss.
+
+        The file stays pinned until ``release(path)`` is called. Concurrent
+        misses for one URL share a single download.
+        """
+        path = self._lookup(url)
+        if path is not None:
+            # Keeps the LRU order across restarts
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return path
+
+        with self._lock:
+            task = self._in_flight.get(url)
+            if task is None:
+                task = self._in_flight[url] = asyncio.ensure_future(self._download(url))
+                task.add_done_callback(lambda _: self._in_flight.pop(url, None))
+        await asyncio.shield(task)
+
+        path = self._lookup(url, count_hit=False)
+        if path is None:
+            raise RuntimeError(f"Voice reference for {url} was evicted before use")
+        # Make room only now that the new file is pinned
+        await asyncio.to_thread(self._evict)
+        return path
+
+    def release(self, path):
+        name = os.path.basename(path)
+        with self._lock:
+            count = self._pins.get(name, 0) - 1
+            if count > 0:
+                self._pins[name] = count
+            else:
+                self._pins.pop(name, None)
+        self._evict()
+
+    @asynccontextmanager
+    async def reference(self, url):
+        """``async with store.reference(url) as path`` pins the file for the block."""
+        path = await self.acquire(url)
+        try:
+            yield path
+        finally:
+            self.release(path)
+
+    def peek(self, url):
+        """Local path for ``url`` if it is stored, without pinning or downloading."""
+        with self._lock:
+            name = self._urls.get(url)
+            return self._path(name) if name in self._files else None
+
+    def put(self, url, content):
+        """
+        Store ``content`` as the file behind ``url`` (e.g. right after an
+        upload, so the first use needs no download) and return its pinned path.
+        """
+        self._store(url, content)
+        path = self._lookup(url, count_hit=False)
+        self._evict()
+        return path
+
+    async def _download(self, url):
+        response = await self._client_or_default().get(url)
+        response.raise_for_status()
+        with self._lock:
+            self.downloads += 1
+        # Writing the file and the index blocks, so keep it off the event loop
+        await asyncio.to_thread(self._store, url, response.content)
+
+    def _store(self, url, content):
+        extension = os.path.splitext(urlparse(url).path)[1].lower() or ".wav"
+        name = hashlib.sha256(content).hexdigest() + extension
+        if not os.path.exists(self._path(name)):
+            tmp_path = self._path(f"{name}.{uuid.uuid4().hex}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, self._path(name))
+
+        with self._lock:
+            self._urls[url] = name
+            if name not in self._files:
+                self._files[name] = len(content)
+                self._bytes += len(content)
+            self._files.move_to_end(name)
+            self._save_index()
+
+    def _evict(self):
+        removed = []
+        with self._lock:
+            for name in list(self._files):
+                if self._bytes <= self.max_bytes:
+                    break
+                if self._pins.get(name):
+                    continue
+                self._bytes -= self._files.pop(name)
+                removed.append(name)
+            if not removed:
+                return
+            self.evictions += len(removed)
+            self._urls = {url: name for url, name in self._urls.items() if name not in removed}
+            self._save_index()
+        for name in removed:
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+
+    def discard(self, url):
+        """Forget ``url`` (e.g. after the voice was deleted) and drop its file if unused."""
+        with self._lock:
+            name = self._urls.pop(url, None)
+            if name is None:
+                return
+            self._save_index()
+            if name in self._urls.values() or self._pins.get(name):
+                return
+            self._bytes -= self._files.pop(name, 0)
+        try:
+            os.remove(self._path(name))
+        except OSError:
+            pass
+
+    async def close(self):
+        if self._client is not None and hasattr(self._client, "aclose"):
+            await self._client.aclose()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "downloads": self.downloads,
+                "evictions": self.evictions,
+                "pinned": len(self._pins),
+            }
@@ -0,0 +1,115 @@
+"""
+Startup warmup.
+
+The first requests a worker serves are slow: models load lazily, the CUDA
+caching allocator and cuDNN/oneDNN pick kernels per input shape, and the
+DiT builds its attention caches. ``Warmup`` runs representative requests
+through the same code paths on a background thread at startup, and reports
+readiness so the load balancer only routes to warm workers.
+"""
+
+import threading
+import time
+
+# Sinhala texts of different sizes, one length bucket per key; the first text
+# of each bucket is the warmup request, and the benchmarks reuse all of them
+WARMUP_TEXTS = {
+    "short": [
+        "හේලෝ",
+        "ඔබට කොහොමද?",
+        "අද කාලගුණය හොඳයි",
+        "මම පාසලට යනවා",
+        "ස්තූතියි ඔබට"
+    ],
+    "medium": [
+        "මම රු. 1000ක් ගෙවුවා. පෙ.ව. 8.30ට පැමිණෙන්න.",
+        "අද උදේ පෙ.ව. 7.00ට නැගිට්ටා. පාසලට යන්න ලෑස්ති වුණා.",
+        "ගත වූ කාලය 5 මිනිත්තු 30 තත්පර විතරයි. ඉතින් ඉක්මනින් කරලා තිබුණා.",
+        "ප.ව. 2.00ට රැස්වීම තියෙනවා. $ 50ක් වටිනවා.",
+        "කොළඹ නගරයේ ගමනාගමනය අදත් ගැටළුකාරී වෙලා තියෙනවා."
+    ],
+    "long": [
+        "ශ්‍රී ලංකාව දකුණු ආසියාවේ පිහිටි සුන්දර දූපත් රටකි. මෙහි ජනගහනය මිලියන 22ක් පමණ වේ. කොළඹ වාණිජ අගනුවර වන අතර ශ්‍රී ජයවර්ධනපුර කෝට්ටේ නිල අගනුවරයි. රටේ ප්‍රධාන භාෂා වන්නේ සිංහල සහ දෙමළ ය.",
+        "අද පෙ.ව. 9.00ට ආරම්භ වූ රැස්වීමේදී අලුත් ව්‍යාපෘතිය ගැන කතා කළා. ඒකට රු. 10,000,000ක් වියදම් වෙනවා කියලා තීරණය කළා. ව්‍යාපෘතිය අවසන් කරන්න මාස 6ක් විතර ගතවෙයි කියලා අපේක්ෂා කරනවා.",
+        "පරිගණකය සහ ඉන්ටර්නෙට් තාක්ෂණය දියුණු වීමත් සමඟ අපේ ජීවිතය බොහෝ සෙයින් පහසු වී තිබේ. ඔන්ලයින් ගනුදෙනු, ඉගෙනීම, සන්නිවේදනය යන සියල්ලම දැන් ගෙදරින්ම කරගන්න පුළුවන්.",
+        "$ 1,500ක් වටිනා මේ උපකරණය භාවිතා කරලා ප.ව. 3.30ට වැඩ ආරම්භ කරන්න. රාත්‍රී 11.45ට වැඩ නවත්තලා අලුත් දිනයට සූදානම් වෙන්න.",
+        "ගම්බද ප්‍රදේශවල ජනතාවගේ ජීවන තත්ත්වය ඉහළ නැංවීම සඳහා රජය විවිධ වැඩසටහන් ක්‍රියාත්මක කරනවා. අධ්‍යාපනය, සෞඛ්‍ය සේවා, පරිසර සංරක්ෂණය වැනි ක්ෂේත්‍රවල විශේෂ අවධානය යොමු කරලා තිබේ."
+    ]
+}
+
+
+class Warmup:
+    """
+    Ordered warmup steps, run once on a background thread.
+
+    A failing step is logged and skipped; the worker still becomes ready
+    once every step has run, so e.g. a missing VC checkpoint doesn't keep
+    the default voice from being served.
+    """
+
+    def __init__(self):
+        self._steps = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self.state = "pending"  # pending -> running -> ready
+        self.report = []
+        self.started = None
+        self.finished = None
+
+    def add(self, name, fn, *args, **kwargs):
+        """Queue ``fn(*args, **kwargs)`` as the step called ``name``."""
+        self._steps.append((name, fn, args, kwargs))
+
+    @property
+    def ready(self):
+        return self.state == "ready"
+
+    def start(self):
+        """Run the steps on a daemon thread; returns immediately."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def run(self):
+        """Run every step in order (blocking)."""
+        self.state = "running"
+        self.started = time.perf_counter()
+        for name, fn, args, kwargs in self._steps:
+            start = time.perf_counter()
+            entry = {"step": name, "status": "ok", "error": None}
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                print(f"Warning: Warmup step {name} failed: {e}")
+                entry.update(status="failed", error=str(e))
+            entry["seconds"] = round(time.perf_counter() - start, 3)
+            with self._lock:
+                self.report.append(entry)
+        self.finished = time.perf_counter()
+        self.state = "ready"
+        print(f"Warmup finished in {self.finished - self.started:.1f}s ({len(self._steps)} steps)")
+
+    def skip(self):
+        """Mark the worker ready without warming up."""
+        self.state = "ready"
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.ready
+
+    def status(self):
+        with self._lock:
+            steps = list(self.report)
+        if self.started is None:
+            seconds = None
+        else:
+            seconds = round((self.finished or time.perf_counter()) - self.started, 3)
+        return {
+            "state": self.state,
+            "completed": len(steps),
+            "total": len(self._steps),
+            "seconds": seconds,
+            "steps": steps,
+        }
@@ -5,25 +5,30 @@ import numpy as np
 from tqdm import tqdm
 from pathlib import Path
 import matplotlib.pyplot as plt
+from functools import lru_cache
+from math import gcd
+from scipy import signal
+
+@lru_cache(maxsize=None)
+def polyphase_filter(up, down):
+    """
+    Anti-aliasing FIR for an up/down ratio, designed once per ratio
+    (same Kaiser design scipy's resample_poly uses by default)
+    """
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    return signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0))
 
 def resample_audio(audio, orig_sr, target_sr):
     """
-    Simple resampling using numpy interpolation
-    Compatible with numpy 2.x
+    Band-limited polyphase resampling with a cached filter per rate pair
     """
     if orig_sr == target_sr:
         return audio
     
-    # Calculate the new length
-    new_length = int(len(audio) * target_sr / orig_sr)
-    
-    # Create new time indices
-    old_indices = np.linspace(0, len(audio) - 1, len(audio))
-    new_indices = np.linspace(0, len(audio) - 1, new_length)
-    
-    # Interpolate
-    resampled = np.interp(new_indices, old_indices, audio)
-    return resampled
+    divisor = gcd(int(orig_sr), int(target_sr))
+    up, down = int(target_sr) // divisor, int(orig_sr) // divisor
+    return signal.resample_poly(audio, up, down, window=polyphase_filter(up, down))
 
 def apply_preemphasis(audio, coef=0.97):
     """Apply pre-emphasis filter"""